@@ -0,0 +1,259 @@
+"""Contains the ArrayEngine class that the engines keeping their board in a NumPy array are built upon."""
+import numpy as np
+from engine import Engine
+
+class ArrayEngine(Engine):
+    """
+    Base class of the step engines that hold their board as a rows x cols
+    NumPy array of uint8 in 'cells', one byte per cell holding its state.
+    Every way of reading and writing the board is built on that array, so
+    subclasses need only step it and say where the previous generation is.
+    """
+
+    def _previous(self):
+        """Returns the array of the previous generation, or None before the first step."""
+        raise NotImplementedError
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is in any state but dead."""
+        return bool(self.cells[row, col])
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive (state 1) or dead."""
+        self.cells[row, col] = 1 if alive else 0
+
+
+    def set_alive_many(self, positions, alive):
+        """Sets every cell in an iterable of (row, col) positions to be alive or dead."""
+        self.set_state_many(positions, 1 if alive else 0)
+
+
+    def state(self, row, col):
+        """Returns the state of the cell at (row, col), 0 being dead."""
+        return int(self.cells[row, col])
+
+
+    def set_state(self, row, col, state):
+        """Sets the state of the cell at (row, col), 0 being dead."""
+        self.cells[row, col] = state
+
+
+    def set_state_many(self, positions, state):
+        """Sets the state of every cell in an iterable of (row, col) positions."""
+
+        positions = list(positions)
+        if positions:
+            rows, cols = zip(*positions)
+            self.cells[list(rows), list(cols)] = state
+
+
+    def changed_cells(self):
+        """Returns the (row, col) positions of the cells the last step changed."""
+
+        previous = self._previous()
+        if previous is None:
+            return []
+        rows, cols = np.nonzero(previous != self.cells)
+        return zip(rows.tolist(), cols.tolist())
+
+
+    def changed_states(self):
+        """Returns the rows, the cols and the new states of the cells the last step changed, as three lists."""
+
+        previous = self._previous()
+        if previous is None:
+            return ([], [], [])
+        rows, cols = np.nonzero(previous != self.cells)
+        return (rows.tolist(), cols.tolist(), self.cells[rows, cols].tolist())
+
+
+    def changed_mask(self):
+        """Returns a rows x cols NumPy array of booleans, True where the last step changed the cell."""
+
+        previous = self._previous()
+        if previous is None:
+            return np.zeros((self.rows, self.cols), dtype=bool)
+        return previous != self.cells
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+        self.cells.fill(0)
+
+
+    def live_states(self):
+        """Yields the (row, col, state) of every cell that isn't dead."""
+
+        rows, cols = np.nonzero(self.cells)
+        return zip(rows.tolist(), cols.tolist(), self.cells[rows, cols].tolist())
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every cell that isn't dead."""
+
+        rows, cols = np.nonzero(self.cells)
+        return zip(rows.tolist(), cols.tolist())
+
+
+    def _window(self, top, left, height, width):
+        """Returns the part of the board in a window, and where it starts, or None if it is off the board."""
+
+        first_row, first_col = max(top, 0), max(left, 0)
+        last_row, last_col = min(top + height, self.rows), min(left + width, self.cols)
+        if first_row >= last_row or first_col >= last_col:
+            return None
+        return self.cells[first_row:last_row, first_col:last_col], first_row, first_col
+
+
+    def live_states_in(self, top, left, height, width):
+        """
+        Yields the (row, col, state) of every cell that isn't dead in the
+        'height' x 'width' window whose top left cell is (top, left).
+        """
+
+        window = self._window(top, left, height, width)
+        if window is None:
+            return iter(())
+        cells, first_row, first_col = window
+        rows, cols = np.nonzero(cells)
+        return zip((rows + first_row).tolist(), (cols + first_col).tolist(), cells[rows, cols].tolist())
+
+
+    def block_populations(self, top, left, height, width, block):
+        """
+        Yields (row, col, population) for every 'block' x 'block' square of
+        cells overlapping the window of live_states_in that holds cells that
+        aren't dead. Squares are aligned to multiples of 'block', and (row,
+        col) is the top left cell of each.
+        """
+
+        block_sums = self._block_sums(top, left, height, width, block)
+        if block_sums is None:
+            return iter(())
+        sums, first_row, first_col = block_sums
+        rows, cols = np.nonzero(sums)
+        return zip((rows * block + first_row).tolist(), (cols * block + first_col).tolist(), sums[rows, cols].tolist())
+
+
+    def get_block_array(self, top, left, height, width, block):
+        """
+        Returns the populations of block_populations as a NumPy array of
+        uint32 with one entry per square, the first being the square
+        holding the cell at (top, left).
+        """
+
+        first_row, first_col = top // block, left // block
+        populations = np.zeros((-(-(top + height) // block) - first_row, -(-(left + width) // block) - first_col), dtype=np.uint32)
+        block_sums = self._block_sums(top, left, height, width, block)
+        if block_sums is not None:
+            sums, row, col = block_sums
+            row, col = row // block - first_row, col // block - first_col
+            populations[row:row + sums.shape[0], col:col + sums.shape[1]] = sums
+        return populations
+
+
+    def _block_sums(self, top, left, height, width, block):
+        """
+        Returns the population of every square of block_populations on the
+        board, and the cell at the top left of the first, or None if there
+        are none.
+        """
+
+        # widen the window out to whole squares, then sum each square
+        first_row, first_col = max(top, 0) // block * block, max(left, 0) // block * block
+        last_row, last_col = -(-(top + height) // block) * block, -(-(left + width) // block) * block
+        window = self._window(first_row, first_col, last_row - first_row, last_col - first_col)
+        if window is None:
+            return None
+        cells = window[0] != 0
+        padded = np.pad(cells, ((0, -cells.shape[0] % block), (0, -cells.shape[1] % block)))
+        sums = padded.reshape(padded.shape[0] // block, block, padded.shape[1] // block, block).sum(axis=(1, 3), dtype=np.uint32)
+        return sums, first_row, first_col
+
+
+    def get_state_array_in(self, top, left, height, width):
+        """Returns the states of the window of live_states_in as a height x width NumPy array of uint8."""
+
+        states = np.zeros((height, width), dtype=np.uint8)
+        window = self._window(top, left, height, width)
+        if window is not None:
+            cells, first_row, first_col = window
+            states[first_row - top:first_row - top + cells.shape[0], first_col - left:first_col - left + cells.shape[1]] = cells
+        return states
+
+
+    def population(self):
+        """Returns the number of living cells on the board."""
+        return int(np.count_nonzero(self.cells))
+
+
+    def get_cells(self):
+        """Returns the board as a list of rows of booleans."""
+        return (self.cells != 0).tolist()
+
+
+    def get_array(self):
+        """Returns the board as a rows x cols NumPy array of booleans."""
+        return self.cells != 0
+
+
+    def get_state_array(self):
+        """Returns the state of every cell as a rows x cols NumPy array of uint8."""
+        return self.cells
+
+
+    def packed_rows(self):
+        """
+        Yields each row of the board packed into (cols + 7) // 8 bytes, with
+        column c held by bit c % 8 of byte c // 8.
+        """
+
+        # packing the whole board at once is far faster than row by row
+        for row in np.packbits(self.cells, axis=1, bitorder='little'):
+            yield row.tobytes()
+
+
+    def packed_board(self):
+        """Returns every row of packed_rows joined into one bytes object."""
+        return np.packbits(self.cells, axis=1, bitorder='little').tobytes()
+
+
+    def load_packed(self, buffer):
+        """Replaces the board with rows packed as by packed_rows, read from a bytes-like 'buffer'."""
+
+        # reads straight from the buffer, which may be a memory-mapped file
+        row_bytes = (self.cols + 7) // 8
+        packed = np.frombuffer(buffer, dtype=np.uint8, count=self.rows * row_bytes)
+        unpacked = np.unpackbits(packed.reshape(self.rows, row_bytes), axis=1, bitorder='little')
+        self.cells[:] = unpacked[:, :self.cols]
+
+
+    def set_cells(self, cells):
+        """Replaces the board with the given list of rows of booleans (or states)."""
+        self.cells[:] = np.array(cells, dtype=np.uint8)
+
+
+def split_counts(table):
+    """
+    Returns the neighbour counts of a two-state rule's lookup table that
+    leave any cell alive, those that only bring dead cells to life and
+    those that only keep living cells alive, as three sorted lists. They
+    are cheaper to compare against than the table is to gather from.
+    """
+
+    birth = {count for count in range(9) if table[0][count]}
+    survival = {count for count in range(9) if table[1][count]}
+    return sorted(birth & survival), sorted(birth - survival), sorted(survival - birth)
+
+
+def matches(counts, wanted):
+    """Returns where 'counts' holds one of the 'wanted' values."""
+
+    if not wanted:
+        return np.zeros(counts.shape, dtype=bool)
+    matches = counts == wanted[0]
+    for count in wanted[1:]:
+        matches |= counts == count
+    return matches
@@ -0,0 +1,225 @@
+"""
+Benchmarks the engines, renderers, startup and mouse hit-testing of the
+game, writing the results to JSON so runs can be compared across commits.
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+import argparse, json, os, platform, statistics, subprocess, sys, time
+
+# render and startup benchmarks draw to an invisible window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from engines import ENGINES, create_engine
+from game import Game
+from renderers import RENDERERS, create_renderer
+import patterns
+
+# board sizes in cells as (cols, rows)
+BOARD_SIZES = [(120, 80), (400, 400), (1000, 1000)]
+QUICK_BOARD_SIZES = [(120, 80), (300, 300)]
+
+# square sizes of the default 1200x800 screen
+SQUARE_SIZES = [10, 5, 2]
+
+# seed name -> (pattern name or None for a random soup, soup density)
+SEEDS = {
+    'soup-10': (None, 0.10),
+    'soup-30': (None, 0.30),
+    'soup-50': (None, 0.50),
+    'glider-gun': ('gosper_glider_gun', None),
+    'r-pentomino': ('r_pentomino', None),
+}
+
+# the slow engines are only run on boards of at most this many cells
+SLOW_ENGINES = {'reference': 120 * 80}
+
+
+def seed_cells(seed, rows, cols):
+    """Returns the living cells of the named seed on a rows x cols board."""
+
+    pattern, density = SEEDS[seed]
+    if pattern is None:
+        return patterns.random_soup(rows, cols, density, seed=0)
+    return patterns.builtin(pattern)
+
+
+def time_call(function, repeats, setup=None):
+    """
+    Calls 'function' 'repeats' times and returns the seconds each call took.
+    When given, 'setup' is called untimed before each call.
+    """
+
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(group, name, samples, **details):
+    """Returns the result record of a benchmark from its timing samples."""
+
+    return dict(
+        group=group,
+        name=name,
+        repeats=len(samples),
+        best=min(samples),
+        median=statistics.median(samples),
+        mean=statistics.fmean(samples),
+        **details
+    )
+
+
+def bench_engines(engines, sizes, seeds, generations, repeats):
+    """Times stepping every engine on every board size and seed."""
+
+    results = []
+    for engine_name in engines:
+        for cols, rows in sizes:
+            if rows * cols > SLOW_ENGINES.get(engine_name, rows * cols):
+                continue
+            for seed in seeds:
+                engine = create_engine(engine_name, rows, cols)
+                patterns.place_cells(engine, seed_cells(seed, rows, cols), center=SEEDS[seed][0] is not None)
+                start_cells = engine.get_cells()
+
+                # each sample restarts from the seed so samples are alike
+                def run():
+                    engine.advance(generations)
+
+                samples = []
+                for _ in range(repeats):
+                    engine.set_cells(start_cells)
+                    samples.extend(time_call(run, 1))
+                engine.close()
+
+                results.append(summarize(
+                    'step', f'{engine_name} {cols}x{rows} {seed}', samples,
+                    engine=engine_name, size=f'{cols}x{rows}', seed=seed,
+                    generations=generations,
+                    generations_per_second=generations / min(samples),
+                ))
+    return results
+
+
+def bench_game(square_sizes, repeats):
+    """Times startup, rendering and mouse hit-testing of a Game."""
+
+    results = []
+    for square_size in square_sizes:
+        details = {'square_size': square_size}
+
+        # startup, including the engine and the grid of cells
+        samples = time_call(lambda: Game(square_size=square_size), repeats)
+        results.append(summarize('startup', f'Game() square {square_size}', samples, **details))
+
+        game = Game(square_size=square_size)
+        patterns.place_cells(game.engine, seed_cells('soup-30', game.engine.rows, game.engine.cols), center=False)
+
+        for renderer_name in RENDERERS:
+            game.renderer = create_renderer(renderer_name, game)
+            for method in ('draw_cells', 'draw_borders', 'draw_frame'):
+                # whole frames are drawn after a generation, as in the game
+                setup = game.engine.step if method == 'draw_frame' else None
+                samples = time_call(getattr(game.renderer, method), repeats, setup)
+                results.append(summarize(
+                    'render', f'{renderer_name}.{method} square {square_size}', samples,
+                    renderer=renderer_name, **details))
+
+        # the worst case of the hit-test is the bottom right cell
+        corner = (game.settings.screen_width - 1, game.settings.screen_height - 1)
+        samples = time_call(lambda: game._check_mouse_click(corner), repeats)
+        results.append(summarize('mouse', f'_check_mouse_click square {square_size}', samples, **details))
+        game.engine.close()
+
+    return results
+
+
+def git_commit():
+    """Returns the current git commit of the repository, or None."""
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Prints how each result changed against those in a previous run."""
+
+    with open(baseline_path) as file:
+        baseline = {(r['group'], r['name']): r for r in json.load(file)['results']}
+
+    for result in results:
+        before = baseline.get((result['group'], result['name']))
+        if before:
+            ratio = result['best'] / before['best']
+            flag = '  SLOWER' if ratio > 1.1 else ''
+            print(f"{result['group']:8} {result['name']:45} {ratio:6.2f}x{flag}")
+
+
+def parse_args(argv=None):
+    """Parses the command line arguments of the benchmark."""
+
+    parser = argparse.ArgumentParser(description='Benchmark the New Game of Life')
+    parser.add_argument('--output', default='benchmark.json',
+        help='file the JSON results are written to')
+    parser.add_argument('--compare',
+        help='previous JSON results to compare against')
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+        default=[name for name in ENGINES if name != 'parallel'],
+        help='engines to benchmark')
+    parser.add_argument('--seeds', nargs='+', choices=list(SEEDS), default=list(SEEDS),
+        help='seed patterns to benchmark')
+    parser.add_argument('--generations', type=int, default=10,
+        help='generations per step sample')
+    parser.add_argument('--repeats', type=int, default=5,
+        help='samples taken of each benchmark')
+    parser.add_argument('--quick', action='store_true',
+        help='only benchmark the smaller boards')
+    parser.add_argument('--no-game', action='store_true',
+        help='skip the startup, render and mouse benchmarks')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the benchmarks and writes their results."""
+
+    args = parse_args(argv)
+    sizes = QUICK_BOARD_SIZES if args.quick else BOARD_SIZES
+
+    results = bench_engines(args.engines, sizes, args.seeds, args.generations, args.repeats)
+    if not args.no_game:
+        results += bench_game(SQUARE_SIZES, args.repeats)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    for result in results:
+        print(f"{result['group']:8} {result['name']:45} {result['best'] * 1000:10.3f} ms")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""Contains the BitEngine class, a bit-packed step engine."""
+from engine import Engine
+
+class BitEngine(Engine):
+    """
+    Step engine that packs every row of the board into a single integer,
+    one bit per cell with bit c holding column c. A generation is computed
+    for a whole row at once with bitwise adder logic, so each operation
+    works on as many cells as the board is wide. Supports two-state rules,
+    on a clipped or a toroidal board.
+    """
+
+    BOUNDARIES = ('clipped', 'toroidal')
+
+    def __init__(self, rows, cols, rule=None, boundary=None):
+        """Creates an empty board with the given number of rows and columns."""
+
+        super().__init__(rows, cols, rule, boundary)
+        self._require_two_states()
+
+        # one integer per row, and the mask of the bits on the board
+        self.cells = [0] * rows
+        self.previous = None
+        self.mask = (1 << cols) - 1
+
+        # the counts of living cells in a 3x3 block, the centre included,
+        # that leave a living or a dead centre cell alive in the next generation
+        table = self.rule.table
+        self._alive_totals = [count + 1 for count in range(9) if table[1][count]]
+        self._dead_totals = [count for count in range(9) if table[0][count]]
+
+        # a count is 'low + 2k', and these are the values of k to test for
+        self._k_values = sorted({total >> 1 for total in self._alive_totals + self._dead_totals})
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is alive."""
+        return (self.cells[row] >> col) & 1 == 1
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive or dead."""
+
+        if alive:
+            self.cells[row] |= 1 << col
+        else:
+            self.cells[row] &= ~(1 << col)
+
+
+    def _triple(self, bits):
+        """
+        Returns the two bits (low, high) of the number of living cells in each
+        cell's row of three: itself and its left and right neighbours.
+        """
+
+        # shifting left moves bits off the right edge of the board, which the
+        # mask clips, and shifting right drops the bits off the left edge,
+        # unless the board is toroidal and the first and last columns meet
+        left = (bits << 1) & self.mask
+        right = bits >> 1
+        if self.boundary == 'toroidal':
+            left |= bits >> (self.cols - 1)
+            right |= (bits & 1) << (self.cols - 1)
+        low = left ^ right ^ bits
+        high = (left & right) | (bits & (left ^ right))
+        return low, high
+
+
+    def _next_row(self, bits, up, mid, down):
+        """Returns the next generation of a row from the rows of three above, on and below it."""
+
+        (up_low, up_high), (mid_low, mid_high), (down_low, down_high) = up, mid, down
+
+        # add the three 2-bit counts of the 3x3 block into 'low + 2k',
+        # where the cell itself is included in the count
+        low = up_low ^ mid_low ^ down_low
+        carry = (up_low & mid_low) | (down_low & (up_low ^ mid_low))
+
+        # k is the number of set bits among the four weight-2 inputs,
+        # added up two pairs at a time into its three bits
+        sum_a = up_high ^ mid_high
+        sum_b = down_high ^ carry
+        carry_a = up_high & mid_high
+        carry_b = down_high & carry
+        pairs = sum_a & sum_b
+        carries = carry_a ^ carry_b
+        k_bits = (sum_a ^ sum_b, pairs ^ carries, (carry_a & carry_b) | (pairs & carries))
+
+        # the cells where k takes each value the rule cares about
+        k_equals = {}
+        for k in self._k_values:
+            match = -1
+            for bit, plane in enumerate(k_bits):
+                match &= plane if (k >> bit) & 1 else ~plane
+            k_equals[k] = match
+
+        # look each cell's 3x3 count up in the rule
+        not_low = ~low
+        alive = born = 0
+        for total in self._alive_totals:
+            alive |= k_equals[total >> 1] & (low if total & 1 else not_low)
+        for total in self._dead_totals:
+            born |= k_equals[total >> 1] & (low if total & 1 else not_low)
+        return ((bits & alive) | (~bits & born)) & self.mask
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        # only the rows of three around the current row are kept, with dead
+        # rows beyond the edges, or the opposite edge on a toroidal board
+        cells = self.cells
+        empty = (0, 0)
+        first = self._triple(cells[0])
+        up = self._triple(cells[-1]) if self.boundary == 'toroidal' else empty
+        mid = first
+        next_gen = []
+
+        for row, bits in enumerate(cells):
+            if row + 1 < self.rows:
+                down = self._triple(cells[row + 1])
+            else:
+                down = first if self.boundary == 'toroidal' else empty
+            next_gen.append(self._next_row(bits, up, mid, down))
+            up, mid = mid, down
+
+        self.previous = cells
+        self.cells = next_gen
+        self.generation += 1
+
+
+    @staticmethod
+    def _bit_cols(bits):
+        """Yields the column of every set bit of a row."""
+
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+
+    def changed_cells(self):
+        """Returns the (row, col) positions of the cells the last step changed."""
+
+        if self.previous is None:
+            return []
+        return [
+            (row, col)
+            for row, (old, new) in enumerate(zip(self.previous, self.cells))
+            for col in self._bit_cols(old ^ new)
+        ]
+
+
+    def changed_states(self):
+        """Returns the rows, the cols and the new states of the cells the last step changed, as three lists."""
+
+        if self.previous is None:
+            return ([], [], [])
+
+        rows, cols, states = [], [], []
+        for row, (old, new) in enumerate(zip(self.previous, self.cells)):
+            changed = old ^ new
+            if not changed:
+                continue
+            born = list(self._bit_cols(changed & new))
+            died = list(self._bit_cols(changed & old))
+            rows.extend([row] * (len(born) + len(died)))
+            cols.extend(born)
+            cols.extend(died)
+            states.extend([1] * len(born))
+            states.extend([0] * len(died))
+        return (rows, cols, states)
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+        self.cells = [0] * self.rows
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every living cell."""
+
+        for row, bits in enumerate(self.cells):
+            for col in self._bit_cols(bits):
+                yield (row, col)
+
+
+    def live_states_in(self, top, left, height, width):
+        """
+        Yields the (row, col, state) of every cell that isn't dead in the
+        'height' x 'width' window whose top left cell is (top, left).
+        """
+
+        first_row, last_row = max(top, 0), min(top + height, self.rows)
+        first_col, last_col = max(left, 0), min(left + width, self.cols)
+        if first_row >= last_row or first_col >= last_col:
+            return
+
+        # cut the window's columns out of each of its rows
+        col_mask = (1 << (last_col - first_col)) - 1
+        for row in range(first_row, last_row):
+            for col in self._bit_cols((self.cells[row] >> first_col) & col_mask):
+                yield (row, first_col + col, 1)
+
+
+    def population(self):
+        """Returns the number of living cells on the board."""
+        return sum(bits.bit_count() for bits in self.cells)
+
+
+    def packed_rows(self):
+        """
+        Yields each row of the board packed into (cols + 7) // 8 bytes, with
+        column c held by bit c % 8 of byte c // 8.
+        """
+
+        row_bytes = (self.cols + 7) // 8
+        for bits in self.cells:
+            yield bits.to_bytes(row_bytes, 'little')
+
+
+    def load_packed(self, buffer):
+        """Replaces the board with rows packed as by packed_rows, read from a bytes-like 'buffer'."""
+
+        # the packed layout is the same as the engine's, so rows load as-is
+        row_bytes = (self.cols + 7) // 8
+        self.cells = [
+            int.from_bytes(buffer[row * row_bytes:(row + 1) * row_bytes], 'little') & self.mask
+            for row in range(self.rows)
+        ]
+
+
+    def get_cells(self):
+        """Returns the board as a list of rows of booleans."""
+
+        cells = []
+        for bits in self.cells:
+            # the binary string reads from the highest column down
+            text = format(bits, f'0{self.cols}b')[::-1]
+            cells.append([char == '1' for char in text])
+        return cells
+
+
+    def set_cells(self, cells):
+        """Replaces the board with the given list of rows of booleans."""
+
+        self.cells = [
+            int(''.join('1' if alive else '0' for alive in reversed(row)), 2)
+            for row in cells
+        ]
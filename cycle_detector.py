@@ -0,0 +1,157 @@
+"""Contains the CycleDetector class that notices when the board starts repeating."""
+import collections
+
+MASK_32 = (1 << 32) - 1
+MASK_64 = (1 << 64) - 1
+
+
+def zobrist_key(row, col, state=1):
+    """
+    Returns the random-looking 64-bit key of the cell at (row, col) being
+    in 'state'. The hash of a board is the XOR of the keys of its cells
+    that aren't dead, so a cell changing state flips its key in or out of
+    the hash.
+    """
+
+    # splitmix64 of the position and state stands in for a table of random
+    # keys; each coordinate is cut to 32 bits first, so that a negative one
+    # off the board of an unbounded universe doesn't spill into the other
+    position = ((row & MASK_32) << 32) | (col & MASK_32)
+    value = position + state * 0x9E3779B97F4A7C15 & MASK_64
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK_64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK_64
+    return value ^ (value >> 31)
+
+
+def zobrist_keys(rows, cols, states):
+    """
+    Returns the keys of zobrist_key for NumPy arrays of rows, cols and
+    states (or a single state) at once, as an array of uint64.
+    """
+
+    import numpy as np
+
+    # the same splitmix64 as zobrist_key, in uint64 arithmetic that wraps
+    # round on its own
+    mask = np.uint64(MASK_32)
+    position = (rows.astype(np.uint64) & mask) << np.uint64(32) | (cols.astype(np.uint64) & mask)
+    value = position + np.asarray(states, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return value ^ (value >> np.uint64(31))
+
+
+class CycleDetector:
+    """
+    Keeps a Zobrist hash of the board up to date from the cells each
+    generation changes, and remembers the hashes of recent generations.
+    When a hash comes back, the board has settled into a cycle whose period
+    is the number of generations since it was last seen. An unbounded
+    universe is hashed whole every generation, cells off the board included.
+    A board held in a NumPy array is hashed in NumPy, from the key of every
+    cell at once.
+    """
+
+    def __init__(self, history_size=1000):
+        """Creates a CycleDetector remembering the last 'history_size' generations."""
+
+        # instance variables
+        self.history_size = history_size
+        self.history = {}
+        self.order = collections.deque()
+        self.hash = 0
+        self.period = None
+        self.generation = None
+        self._keys = None
+
+
+    def reset(self, engine):
+        """Starts watching the board held by 'engine' afresh, forgetting all history."""
+
+        self.history = {}
+        self.order = collections.deque()
+        self.period = None
+        self.generation = None
+        self.hash = self._full_hash(engine)
+        self._remember(engine.generation)
+
+
+    def _full_hash(self, engine):
+        """Returns the hash of the universe computed from all of its cells that aren't dead."""
+
+        if engine.boundary != 'unbounded' and engine.changed_mask() is not None:
+            import numpy as np
+            states = engine.get_state_array()
+            rows, cols = np.nonzero(states)
+            return int(np.bitwise_xor.reduce(zobrist_keys(rows, cols, states[rows, cols])))
+
+        board_hash = 0
+        for row, col, state in engine.universe_states():
+            board_hash ^= zobrist_key(row, col, state)
+        return board_hash
+
+
+    def _board_keys(self, engine):
+        """Returns the keys of every cell of the board being alive, as a rows x cols array of uint64."""
+
+        import numpy as np
+        if self._keys is None or self._keys.shape != (engine.rows, engine.cols):
+            rows, cols = np.indices((engine.rows, engine.cols))
+            self._keys = zobrist_keys(rows, cols, 1)
+        return self._keys
+
+
+    def _remember(self, generation):
+        """Records the current hash as seen at 'generation'."""
+
+        self.history[self.hash] = generation
+        self.order.append(self.hash)
+        if len(self.order) > self.history_size:
+            del self.history[self.order.popleft()]
+
+
+    def update(self, engine):
+        """
+        Updates the hash after the engine has stepped one generation. Returns
+        True if the board now repeats an earlier generation, in which case
+        'period' and 'generation' say which cycle it is in and since when.
+        """
+
+        # only a two-state board can be hashed from where it changed alone,
+        # since a cell's old state is gone once it has stepped; an unbounded
+        # universe is hashed whole, as the changes only cover the board and
+        # the board repeating says nothing of the cells that left it
+        changes = mask = None
+        if engine.rule.states == 2 and engine.boundary != 'unbounded':
+            mask = engine.changed_mask()
+            if mask is None:
+                changes = engine.changed_cells()
+        if mask is not None:
+            import numpy as np
+            # gathering by flat index is several times faster than by mask
+            self.hash ^= int(np.bitwise_xor.reduce(self._board_keys(engine).ravel()[np.flatnonzero(mask)]))
+        elif changes is None:
+            self.hash = self._full_hash(engine)
+        else:
+            for row, col in changes:
+                self.hash ^= zobrist_key(row, col)
+
+        seen = self.history.get(self.hash)
+        if seen is not None:
+            self.period = engine.generation - seen
+            self.generation = seen
+            return True
+
+        self._remember(engine.generation)
+        return False
+
+
+    def fast_forward(self, engine, target_generation):
+        """
+        Brings a board known to be cycling to 'target_generation', stepping
+        only the generations left over after skipping whole periods.
+        """
+
+        remaining = target_generation - engine.generation
+        engine.advance(remaining % self.period)
+        engine.generation = target_generation
@@ -0,0 +1,78 @@
+"""Contains the DirtyRenderer class that only redraws the cells that changed."""
+import pygame, pygame.display, pygame.draw, pygame.rect
+from renderer import Renderer
+
+class DirtyRenderer(Renderer):
+    """
+    Draws the board by comparing the cells in view that aren't dead, and
+    their states, against those drawn on the previous frame and redrawing
+    only the cells that differ. Only the changed regions are pushed to the
+    display, unless too many cells changed for that to be cheaper, the
+    view itself moved or it is zoomed out to blocks, in which case the
+    whole frame is redrawn and flipped.
+    """
+
+    def __init__(self, game):
+        """Creates a DirtyRenderer drawing the board of a Game instance."""
+
+        super().__init__(game)
+
+        # the (row, col, state) of the cells currently on the screen, and
+        # the view they were drawn in
+        self.drawn = set()
+        self.drawn_view = None
+        self.full_redraw = True
+
+
+    def invalidate(self):
+        """Marks the whole screen as needing to be redrawn on the next frame."""
+        self.full_redraw = True
+
+
+    def draw_frame(self):
+        """Draws the current generation and pushes it to the display."""
+
+        # blocks are cheap to draw in full, and nothing drawn in another
+        # view is where it would be now
+        if self.viewport.block > 1:
+            self.drawn = set()
+            self.full_redraw = True
+            super().draw_frame()
+            return
+        if self.viewport.key() != self.drawn_view:
+            self.full_redraw = True
+            self.drawn_view = self.viewport.key()
+
+        with self.profiler.phase('cells'):
+            live = set(self.game.engine.live_states_in(*self.viewport.visible_region()))
+            changed = live.symmetric_difference(self.drawn)
+            self.drawn = live
+
+        # a changed cell costs a few times what a full redraw pays for each
+        # living cell, so redraw everything unless few enough cells changed
+        if self.full_redraw or len(changed) > self.settings.dirty_rect_limit * len(live):
+            self.full_redraw = False
+            super().draw_frame()
+            return
+
+        # the cells to redraw, and the new state of those still shown
+        positions = {(row, col) for row, col, _ in changed}
+        states = {(row, col): state for row, col, state in live.intersection(changed)}
+
+        dirty_rects = []
+        colors = self.state_colors()
+        borders = self.viewport.show_borders()
+        with self.profiler.phase('cells'):
+            for row, col in positions:
+                rect = self.viewport.square_rect(row, col)
+                x, y, size, _ = rect
+
+                # the grid lines along the cell's top and left are never
+                # drawn over, so only the inside of the cell is redrawn
+                inside = (x + 1, y + 1, size - 1, size - 1) if borders else rect
+                self.screen.fill(colors[states.get((row, col), 0)], inside)
+                dirty_rects.append(rect)
+
+        with self.profiler.phase('flip'):
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
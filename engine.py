@@ -0,0 +1,315 @@
+"""Contains the Engine class that every step engine is built upon."""
+import collections
+from rules import LIFE
+
+
+class Engine:
+    """
+    Base class of the step engines. An engine owns the state of every cell
+    on the board and knows how to advance it by one generation under its
+    rule. Engines that only hold two states (dead and alive) need only
+    implement is_alive and set_alive; the state methods are built on them.
+
+    What lies past the edges of the board depends on the boundary: nothing
+    but dead cells when 'clipped', the opposite edge when 'toroidal', and
+    more of the universe when 'unbounded', in which case the board is only
+    a window onto it and cells outside it can be read and set too.
+    """
+
+    # the boundaries the engine supports, the first being its default
+    BOUNDARIES = ('clipped',)
+
+    def __init__(self, rows, cols, rule=None, boundary=None):
+        """
+        Creates an empty board with the given number of rows and columns,
+        following 'rule' (Conway's Game of Life when None) with the given
+        'boundary' (the engine's default when None).
+        """
+
+        # instance variables
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule or LIFE
+        self.boundary = boundary or self.BOUNDARIES[0]
+        self.generation = 0
+
+        if self.boundary not in self.BOUNDARIES:
+            raise ValueError(f'{type(self).__name__} does not support the {self.boundary!r} boundary, '
+                             f'only {", ".join(map(repr, self.BOUNDARIES))}')
+
+
+    def _require_two_states(self):
+        """Raises ValueError unless the rule has only dead and alive cells."""
+
+        if self.rule.states != 2:
+            raise ValueError(f'{type(self).__name__} only supports two-state rules, not {self.rule}')
+
+
+    def _require_no_b0(self):
+        """Raises ValueError if the rule gives birth to cells with no neighbours."""
+
+        if 0 in self.rule.birth:
+            raise ValueError(f'{type(self).__name__} does not support B0 rules like {self.rule}')
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is in any state but dead."""
+        raise NotImplementedError
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive (state 1) or dead."""
+        raise NotImplementedError
+
+
+    def set_alive_many(self, positions, alive):
+        """Sets every cell in an iterable of (row, col) positions to be alive or dead."""
+
+        for row, col in positions:
+            self.set_alive(row, col, alive)
+
+
+    def state(self, row, col):
+        """Returns the state of the cell at (row, col), 0 being dead."""
+        return 1 if self.is_alive(row, col) else 0
+
+
+    def set_state(self, row, col, state):
+        """Sets the state of the cell at (row, col), 0 being dead."""
+        self.set_alive(row, col, state != 0)
+
+
+    def set_state_many(self, positions, state):
+        """Sets the state of every cell in an iterable of (row, col) positions."""
+
+        if state in (0, 1):
+            self.set_alive_many(positions, state == 1)
+        else:
+            for row, col in positions:
+                self.set_state(row, col, state)
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+        raise NotImplementedError
+
+
+    def changed_cells(self):
+        """
+        Returns the (row, col) positions of the cells the last step changed,
+        or None if the engine can't tell them apart cheaply.
+        """
+        return None
+
+
+    def changed_states(self):
+        """
+        Returns the rows, the cols and the new states of the cells the last
+        step changed as three lists, the nth of each for the same cell, or
+        None if the engine can't tell them apart cheaply.
+        """
+
+        changes = self.changed_cells()
+        if changes is None:
+            return None
+        changes = list(changes)
+        return (
+            [row for row, _ in changes],
+            [col for _, col in changes],
+            [self.state(row, col) for row, col in changes],
+        )
+
+
+    def changed_mask(self):
+        """
+        Returns a rows x cols NumPy array of booleans, True where the last
+        step changed the cell, or None if the engine doesn't hold its board
+        as an array.
+        """
+        return None
+
+
+    def advance(self, generations):
+        """Advances the board by the given number of generations."""
+
+        for _ in range(generations):
+            self.step()
+
+
+    def close(self):
+        """Releases any resources held by the engine."""
+        pass
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+
+        for row, col in list(self.live_cells()):
+            self.set_alive(row, col, False)
+
+
+    def live_states(self):
+        """Yields the (row, col, state) of every cell that isn't dead."""
+
+        for row, col in self.live_cells():
+            yield (row, col, 1)
+
+
+    def universe_states(self):
+        """
+        Yields the (row, col, state) of every cell that isn't dead in the
+        whole universe, which when unbounded reaches past the board.
+        """
+        return self.live_states()
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every cell that isn't dead."""
+
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.is_alive(row, col):
+                    yield (row, col)
+
+
+    def live_states_in(self, top, left, height, width):
+        """
+        Yields the (row, col, state) of every cell that isn't dead in the
+        'height' x 'width' window whose top left cell is (top, left).
+        """
+
+        # only the part of the window on the board can hold living cells
+        first_row, last_row = max(top, 0), min(top + height, self.rows)
+        first_col, last_col = max(left, 0), min(left + width, self.cols)
+        if first_row >= last_row or first_col >= last_col:
+            return
+
+        # look at each cell of a small window, or filter every living cell
+        if (last_row - first_row) * (last_col - first_col) * 4 < self.rows * self.cols:
+            for row in range(first_row, last_row):
+                for col in range(first_col, last_col):
+                    state = self.state(row, col)
+                    if state:
+                        yield (row, col, state)
+        else:
+            for row, col, state in self.live_states():
+                if first_row <= row < last_row and first_col <= col < last_col:
+                    yield (row, col, state)
+
+
+    def block_populations(self, top, left, height, width, block):
+        """
+        Yields (row, col, population) for every 'block' x 'block' square of
+        cells overlapping the window of live_states_in that holds cells that
+        aren't dead. Squares are aligned to multiples of 'block', and (row,
+        col) is the top left cell of each.
+        """
+
+        # widen the window out to whole squares
+        first_row, first_col = top // block * block, left // block * block
+        last_row, last_col = -(-(top + height) // block) * block, -(-(left + width) // block) * block
+
+        counts = collections.Counter(
+            (row // block * block, col // block * block)
+            for row, col, _ in self.live_states_in(first_row, first_col, last_row - first_row, last_col - first_col)
+        )
+        for (row, col), population in counts.items():
+            yield (row, col, population)
+
+
+    def get_block_array(self, top, left, height, width, block):
+        """
+        Returns the populations of block_populations as a NumPy array of
+        uint32 with one entry per square, the first being the square
+        holding the cell at (top, left).
+        """
+
+        import numpy as np
+        first_row, first_col = top // block, left // block
+        populations = np.zeros((-(-(top + height) // block) - first_row, -(-(left + width) // block) - first_col), dtype=np.uint32)
+        for row, col, population in self.block_populations(top, left, height, width, block):
+            populations[row // block - first_row, col // block - first_col] = population
+        return populations
+
+
+    def population(self):
+        """Returns the number of living cells on the board."""
+        return sum(1 for _ in self.live_cells())
+
+
+    def get_cells(self):
+        """Returns the board as a list of rows of booleans."""
+
+        cells = [[False] * self.cols for _ in range(self.rows)]
+        for row, col in self.live_cells():
+            cells[row][col] = True
+        return cells
+
+
+    def get_array(self):
+        """Returns the board as a rows x cols NumPy array of booleans."""
+        return self.get_state_array() != 0
+
+
+    def get_state_array(self):
+        """Returns the state of every cell as a rows x cols NumPy array of uint8."""
+
+        import numpy as np
+        states = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        for row, col, state in self.live_states():
+            states[row, col] = state
+        return states
+
+
+    def get_state_array_in(self, top, left, height, width):
+        """Returns the states of the window of live_states_in as a height x width NumPy array of uint8."""
+
+        import numpy as np
+        states = np.zeros((height, width), dtype=np.uint8)
+        for row, col, state in self.live_states_in(top, left, height, width):
+            states[row - top, col - left] = state
+        return states
+
+
+    def packed_rows(self):
+        """
+        Yields each row of the board packed into (cols + 7) // 8 bytes, with
+        column c held by bit c % 8 of byte c // 8.
+        """
+
+        rows = [0] * self.rows
+        for row, col in self.live_cells():
+            rows[row] |= 1 << col
+
+        row_bytes = (self.cols + 7) // 8
+        for bits in rows:
+            yield bits.to_bytes(row_bytes, 'little')
+
+
+    def packed_board(self):
+        """Returns every row of packed_rows joined into one bytes object."""
+        return b''.join(self.packed_rows())
+
+
+    def load_packed(self, buffer):
+        """Replaces the board with rows packed as by packed_rows, read from a bytes-like 'buffer'."""
+
+        self.clear()
+        row_bytes = (self.cols + 7) // 8
+        for row in range(self.rows):
+            bits = int.from_bytes(buffer[row * row_bytes:(row + 1) * row_bytes], 'little')
+            bits &= (1 << self.cols) - 1
+            while bits:
+                lowest = bits & -bits
+                self.set_alive(row, lowest.bit_length() - 1, True)
+                bits ^= lowest
+
+
+    def set_cells(self, cells):
+        """Replaces the board with the given list of rows of booleans."""
+
+        self.clear()
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if cells[row][col]:
+                    self.set_alive(row, col, True)
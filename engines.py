@@ -0,0 +1,42 @@
+"""Contains the registry of step engines that a Game can be run with."""
+import importlib
+
+# engine name -> (module, class), imported only when the engine is requested
+ENGINES = {
+    'reference': ('reference_engine', 'ReferenceEngine'),
+    'numpy': ('numpy_engine', 'NumpyEngine'),
+    'frontier': ('frontier_engine', 'FrontierEngine'),
+    'hashlife': ('hashlife_engine', 'HashLifeEngine'),
+    'bit': ('bit_engine', 'BitEngine'),
+    'parallel': ('parallel_engine', 'ParallelEngine'),
+    'sparse': ('sparse_engine', 'SparseEngine'),
+    'tile': ('tile_engine', 'TileEngine'),
+}
+
+# engine name -> {keyword argument: Settings attribute} passed on creation
+ENGINE_SETTINGS = {
+    'frontier': {'sweep_fraction': 'frontier_sweep_fraction'},
+    'hashlife': {'cache_size': 'hashlife_cache_size'},
+    'parallel': {'workers': 'workers'},
+    'tile': {'table_dir': 'tile_table_dir'},
+}
+
+
+def create_engine(name, rows, cols, **options):
+    """Creates the engine registered under 'name' for a board of rows x cols."""
+
+    if name not in ENGINES:
+        raise ValueError(f'Unknown engine {name!r}, expected one of {sorted(ENGINES)}')
+
+    module_name, class_name = ENGINES[name]
+    engine_class = getattr(importlib.import_module(module_name), class_name)
+    return engine_class(rows, cols, **options)
+
+
+def engine_options(name, settings):
+    """Returns the keyword arguments the engine 'name' takes from a Settings object."""
+
+    return {
+        option: getattr(settings, attribute)
+        for option, attribute in ENGINE_SETTINGS.get(name, {}).items()
+    }
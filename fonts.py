@@ -0,0 +1,51 @@
+"""Contains functions to load fonts without searching the system fonts on every start."""
+import json
+import pygame, pygame.font
+
+# font files already looked up by this process, by (name, bold)
+_paths = {}
+
+
+def font_path(name, bold, cache_path):
+    """
+    Returns the file of the system font called 'name', or None if there is
+    no such font. Looking a font up scans every font on the system, so the
+    answer is kept in the JSON file at 'cache_path' (if given) for later
+    runs; delete the file to look again.
+    """
+
+    key = f'{name}:{"bold" if bold else "regular"}'
+    if key in _paths:
+        return _paths[key]
+
+    cache = {}
+    if cache_path:
+        try:
+            with open(cache_path) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = {}
+
+    if key not in cache:
+        cache[key] = pygame.font.match_font(name, bold=bold) if name else None
+        if cache_path:
+            try:
+                with open(cache_path, 'w') as file:
+                    json.dump(cache, file, indent=2)
+            except OSError:
+                pass
+
+    _paths[key] = cache[key]
+    return cache[key]
+
+
+def load_font(settings, size, bold=False):
+    """Returns a Font of the given size in settings.font, or pygame's own font if it isn't installed."""
+
+    path = font_path(settings.font, bold, settings.font_cache_path)
+    font = pygame.font.Font(path, size)
+
+    # without a bold file of its own, the font is made bold instead
+    if bold and path == font_path(settings.font, False, settings.font_cache_path):
+        font.set_bold(True)
+    return font
@@ -0,0 +1,180 @@
+"""Contains the FrontierEngine class, an engine that only revisits active cells."""
+from engine import Engine
+
+class FrontierEngine(Engine):
+    """
+    Step engine that remembers which cells changed in the last generation.
+    Only those cells and their neighbours can change in the next one, so
+    only they are recomputed. When too much of the board is active, a full
+    sweep of the board is done instead. Supports two-state rules without B0,
+    under which cells far from any change cannot change either, on a
+    clipped or a toroidal board.
+    """
+
+    BOUNDARIES = ('clipped', 'toroidal')
+
+    def __init__(self, rows, cols, sweep_fraction=0.25, rule=None, boundary=None):
+        """
+        Creates an empty board with the given number of rows and columns.
+        A full sweep is done whenever the frontier holds more than
+        'sweep_fraction' of all cells.
+        """
+
+        super().__init__(rows, cols, rule, boundary)
+        self._require_two_states()
+        self._require_no_b0()
+
+        # the board is stored flat with a ring of dead cells around it, so
+        # the neighbours of any cell on the board are at fixed offsets; on a
+        # toroidal board the ring holds copies of the opposite edges instead
+        self.width = cols + 2
+        self.cells = bytearray((rows + 2) * self.width)
+        self.sweep_fraction = sweep_fraction
+        self._offsets = (
+            -self.width - 1, -self.width, -self.width + 1,
+            -1, 1,
+            self.width - 1, self.width, self.width + 1,
+        )
+
+        # whether a dead or a living cell is alive next, by neighbour count
+        self._born = tuple(self.rule.table[0])
+        self._survives = tuple(self.rule.table[1])
+
+        # padded indices of the cells changed since the last step
+        self._active = set()
+        self._population = 0
+
+
+    def _index(self, row, col):
+        """Returns the padded index of the cell at (row, col)."""
+        return (row + 1) * self.width + col + 1
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is alive."""
+        return self.cells[self._index(row, col)] == 1
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive or dead."""
+
+        index = self._index(row, col)
+        alive = 1 if alive else 0
+        if self.cells[index] != alive:
+            self.cells[index] = alive
+            self._population += 1 if alive else -1
+            self._active.add(index)
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        # gather the frontier: every changed cell and its neighbours, which
+        # on a toroidal board may lie across the edge
+        candidates = set(self._active)
+        for offset in self._offsets:
+            candidates.update(index + offset for index in self._active)
+        if self.boundary == 'toroidal':
+            self._wrap_ring()
+            candidates = {self._wrap_index(index) for index in candidates}
+
+        if len(candidates) > self.sweep_fraction * self.rows * self.cols:
+            candidates = self._all_indices()
+
+        cells = self.cells
+        width = self.width
+        last_col = width - 1
+        nw, n, ne, w, e, sw, s, se = self._offsets
+        born = self._born
+        survives = self._survives
+        births = []
+        deaths = []
+
+        # decide the next state of each candidate before changing any cell
+        for index in candidates:
+
+            # the padding ring is never part of the board
+            col = index % width
+            if col == 0 or col == last_col or index < width or index >= len(cells) - width:
+                continue
+
+            count = (cells[index + nw] + cells[index + n] + cells[index + ne] +
+                     cells[index + w] + cells[index + e] +
+                     cells[index + sw] + cells[index + s] + cells[index + se])
+
+            # look the next state up in the rule
+            if cells[index]:
+                if not survives[count]:
+                    deaths.append(index)
+            elif born[count]:
+                births.append(index)
+
+        for index in births:
+            cells[index] = 1
+        for index in deaths:
+            cells[index] = 0
+
+        self._population += len(births) - len(deaths)
+        self._active = set(births)
+        self._active.update(deaths)
+        self.generation += 1
+
+
+    def _wrap_ring(self):
+        """Copies the edges of a toroidal board into the ring on the opposite side."""
+
+        cells = self.cells
+        width = self.width
+        bottom = self.rows * width
+        cells[1:width - 1] = cells[bottom + 1:bottom + width - 1]
+        cells[bottom + width + 1:bottom + 2 * width - 1] = cells[width + 1:2 * width - 1]
+        cells[0::width] = cells[self.cols::width]
+        cells[width - 1::width] = cells[1::width]
+
+
+    def _wrap_index(self, index):
+        """Returns the padded index of the board cell a ring index of a toroidal board stands for."""
+
+        row, col = divmod(index, self.width)
+        return ((row - 1) % self.rows + 1) * self.width + (col - 1) % self.cols + 1
+
+
+    def changed_cells(self):
+        """Returns the (row, col) positions of the cells the last step changed."""
+
+        # after a step the frontier is exactly the cells it changed
+        changes = []
+        for index in self._active:
+            row, col = divmod(index, self.width)
+            changes.append((row - 1, col - 1))
+        return changes
+
+
+    def _all_indices(self):
+        """Yields the padded index of every cell on the board."""
+
+        for row in range(1, self.rows + 1):
+            start = row * self.width + 1
+            yield from range(start, start + self.cols)
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+
+        self.cells = bytearray(len(self.cells))
+        self._active = set()
+        self._population = 0
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every living cell."""
+
+        for index in self._all_indices():
+            if self.cells[index]:
+                row, col = divmod(index, self.width)
+                yield (row - 1, col - 1)
+
+
+    def population(self):
+        """Returns the number of living cells on the board."""
+        return self._population
@@ -1,32 +1,94 @@
 """Contains the Game class to create instances of the New Game of Life."""
+import os
+
+# keep pygame's greeting off stdout, which may carry recorded frames
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
 import pygame, pygame.display, pygame.event, pygame.rect, pygame.draw, pygame.mouse, pygame.surface
-import sys, time
+import argparse, collections, sys, time
 from settings import Settings
 from menu import Menu
+from engines import ENGINES, create_engine, engine_options
+from rules import parse_rule
+from renderers import create_renderer
+from scheduler import Scheduler
+from profiler import Profiler
+from cycle_detector import CycleDetector
+from viewport import Viewport
+from history import History
+from recorder import FrameRecorder
+from population_tracker import PopulationTracker
+from input_log import InputLog, read_input_log, settings_dict
+import snapshot
+from headless import parse_size, run_headless
 
 class Game:
     """An instance of the Game class."""
 
-    def __init__(self):
-        """Creates an instance of the Game class"""
+    def __init__(self, **overrides):
+        """
+        Creates an instance of the Game class. Any keyword arguments
+        override the matching attributes of its Settings.
+        """
         
         # instance variables
         self.settings = None
         self.menu = None
         self.screen = None
-        self.grid = []
-        self.grid_copy = []
+        self.engine = None
+        self.renderer = None
+        self.scheduler = None
+        self.profiler = None
+        self.cycle_detector = None
+        self.viewport = None
+        self.history = None
+        self.recorder = None
+        self.population_tracker = None
+        self.input_log = None
+        self.replay = None
+        self.replay_next = None
+        self.pending_events = collections.deque()
+        self.frame = 0
+        self.board_edited = True
         self.simulation_running = False
         self.in_menu = False
+        self.paint_alive = None
+        self.paint_cell = None
+        self.paint_buffer = set()
+        self.paint_colour = 1
+        self.panning = False
+        self.redraw_needed = True
 
         # create a Settings object
         self.settings = Settings(self)
+        for name, value in overrides.items():
+            if not hasattr(self.settings, name):
+                raise AttributeError(f'Settings has no attribute {name!r}')
+            setattr(self.settings, name, value)
 
         # check the dimensions & square size
         if not self._check_dimensions():
             print('Invalid dimensions!')
             sys.exit()
 
+        # create the engine that holds and evolves the cells, on a board
+        # that fits the window unless the universe is given a size
+        cols, rows = self.settings.universe_size or (
+            self.settings.screen_width // self.settings.square_size,
+            self.settings.screen_height // self.settings.square_size,
+        )
+        self.engine = create_engine(
+            self.settings.engine,
+            rows,
+            cols,
+            rule=parse_rule(self.settings.rule),
+            boundary=self.settings.boundary,
+            **engine_options(self.settings.engine, self.settings)
+        )
+
+        # create the viewport the universe is seen through
+        self.viewport = Viewport(self.settings)
+
         # initialize Pygame 
         pygame.init()
 
@@ -35,11 +97,28 @@ class Game:
         self.screen.fill(self.settings.bg_color)
         pygame.display.set_caption('New Game of Life')
 
-        # create a Menu object
-        self.menu = Menu(self)
+        # create the profiler timing each phase of a frame
+        self.profiler = Profiler(self.settings)
+
+        # create the renderer that draws the grid
+        self.renderer = create_renderer(self.settings.renderer, self)
 
-        # initialize the grid
-        self._initialize_grid()
+        # create the scheduler that paces generations and frames
+        self.scheduler = Scheduler(self.settings)
+
+        # create the detector that notices when the board stops changing
+        self.cycle_detector = CycleDetector(self.settings.cycle_history)
+
+        # create the history the board can be rewound through
+        self.history = History(self.settings.history_budget, self.settings.history_keyframe_interval)
+
+        # start following the population if asked to
+        if self.settings.statistics:
+            self._toggle_statistics()
+
+        # log every input from the start, so the session can be replayed
+        if self.settings.input_log_path:
+            self.input_log = InputLog(self.settings.input_log_path, settings_dict(self.settings))
 
 
     def _check_dimensions(self):
@@ -52,305 +131,165 @@ class Game:
             self.settings.screen_height % self.settings.square_size)
 
 
-    def _initialize_grid(self):
+    def _is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is alive."""
+        return self.engine.is_alive(row, col)
+
+
+    def _get_next_generation(self):
+        """Advances the engine to the next generation of cells."""
+        self.engine.step()
+
+
+    def _advance(self, generations):
         """
-        Initializes the grid on the main screen surface. Stores each Rect
-        object into 'self.grid' for use by the class later.
+        Advances the simulation by the given number of generations, recording
+        each one in the history and the population statistics, and watching
+        for the board settling into a cycle while cycle detection is on.
         """
-        
-        # for each row in the grid
-        for y in range(0, self.settings.screen_height, self.settings.square_size):
-            
-            # clear the 'row' and begin traversing columns
-            row = []
-            for x in range(0, self.settings.screen_width, self.settings.square_size):
-                # create a Rect object at (x, y)
-                rect = pygame.Rect(
-                    x,
-                    y,
-                    self.settings.square_size,
-                    self.settings.square_size
-                )
-                # store the Rect in a list with its color (rect, color)
-                row.append((rect, self.settings.bg_color))
-
-            # add the current row to the grid instance variable
-            self.grid.append(row)
-
-
-    def _update_vertical_borders(self):
-        """Updates the vertical borders on the screen."""  
-
-        # draws the vertical lines on the screen
-        for i in range(int(self.settings.screen_width / self.settings.square_size)):
-            pygame.draw.rect(
-                self.screen,
-                self.settings.border_color,
-                pygame.Rect(
-                    self.settings.square_size * i, 
-                    0, 
-                    1, 
-                    self.settings.screen_height
-                )
-            )
-        
-    def _update_horizontal_borders(self):
-        """Updates the horizontal borders on the screen."""
 
-        # draws the horizontal lines on the screen
-        for i in range(int(self.settings.screen_height / self.settings.square_size)):
-            pygame.draw.rect(
-                self.screen,
-                self.settings.border_color,
-                pygame.Rect(
-                    0,
-                    self.settings.square_size * i,
-                    self.settings.screen_width,
-                    1
-                )
-            )
+        # once a cycle was found there is nothing more to detect
+        detecting = self.settings.detect_cycles and self.cycle_detector.period is None
+        if not detecting and not self.history.budget and not self.population_tracker:
+            self.engine.advance(generations)
+            return
 
+        for _ in range(generations):
+            self.engine.step()
+            self.history.record(self.engine)
+            if self.population_tracker:
+                self.population_tracker.update(self.engine)
+            if detecting and self.cycle_detector.update(self.engine):
+                self._on_cycle()
+                return
 
-    def _update_borders(self):
-        """Updates the borders of the grid for each pass of the main game loop."""
 
-        self._update_vertical_borders()
-        self._update_horizontal_borders()
+    def _report(self, message):
+        """Prints a message, to stderr when recorded frames are written to stdout."""
+        print(message, file=sys.stderr if self.settings.record_path == '-' else sys.stdout)
 
 
-    def _is_alive(self, row, col):
-        """Returns True if the cell at (row, col) is alive."""
-        return self.grid[row][col][1] != self.settings.bg_color
+    def _on_cycle(self):
+        """Reports the cycle the board settled into and pauses if configured to."""
 
+        self._report(f'Stable with period {self.cycle_detector.period} '
+                     f'at generation {self.cycle_detector.generation}')
+        if self.settings.on_cycle == 'pause':
+            self.simulation_running = False
 
-    def _get_next_generation(self, current_gen):
-        """Returns a new List containing the next generation of cells."""
 
-        # variables used and returned
-        next_gen = []
-        current_row = []
-        row_count = 0
-        col_count = 0
+    def _toggle_square(self, row, col):
+        """Toggles the state of a square at row, col."""
 
-        # traverse through each cell and follow Conway's rules
-        for row in current_gen:
+        self.engine.set_state(row, col, 0 if self._is_alive(row, col) else self.paint_colour)
+        self.board_edited = True
 
-            current_row = []
-            col_count = 0
-            for tup in row:
-                
-                # if the cell is alive
-                if self._is_alive(row_count, col_count):
-                    
-                    # dies from not enough or too many surrounding cells
-                    if self._total_surround(row_count, col_count) < 2 or self._total_surround(row_count, col_count) > 3:
-                        current_row.append((tup[0], self.settings.bg_color))
-                    # lives from enough surrounding cells
-                    else:
-                        current_row.append((tup[0], self.settings.square_color))
-                
-                # if the cell is dead
-                else:
-                    
-                    # comes back to life if surrounded by exactly 3 cells
-                    if self._total_surround(row_count, col_count) == 3:
-                        current_row.append((tup[0], self.settings.square_color))
-                    # stays dead from not enough or too many surrounding cells
-                    else:
-                        current_row.append((tup[0], self.settings.bg_color))
 
-                # advance the column counter
-                col_count += 1
+    def _cell_at(self, mouse_pos):
+        """
+        Returns the (row, col) of the cell under 'mouse_pos', or None if
+        there is no single cell there to draw on.
+        """
+
+        # zoomed out, each square is a whole block of cells
+        if self.viewport.block > 1:
+            return None
+
+        row, col = self.viewport.cell_at(mouse_pos)
+        if self.engine.boundary == 'unbounded' or (0 <= row < self.engine.rows and 0 <= col < self.engine.cols):
+            return (row, col)
+        return None
 
-            # add the next generation row and advance the row counter
-            next_gen.append(current_row)
-            row_count += 1
 
-        # return the next generation of cells
-        return next_gen
+    def _change_view(self, change, *args):
+        """Applies a Viewport method to the view, then redraws the whole screen."""
 
+        change(*args)
+        self.renderer.invalidate()
 
-    def _print_next_generation(self):
+
+    def _check_mouse_click(self, mouse_pos):
         """
-        Prints the next generation to the screen. At this point, the simulation
-        is running, so no changes to the grid can be made.
+        Checks to see if a square was clicked with the mouse. The square
+        will then be toggled if it happened to be clicked on, and dragging
+        the mouse will paint the squares it passes over with the new state.
         """
 
-        # change self.grid to be the next generation, then print
-        self.grid = self._get_next_generation(self.grid)
+        cell = self._cell_at(mouse_pos)
+        if cell is None:
+            return
 
-        for row in self.grid:
-            for tup in row:
-                pygame.draw.rect(
-                    self.screen,
-                    tup[1],
-                    tup[0],
-                )
+        self._toggle_square(*cell)
+        self.paint_alive = self._is_alive(*cell)
+        self.paint_cell = cell
 
 
-    def _update_grid(self):
-        """Updates the grid each for each pass of the main game loop."""
-        
-        # if the simulation is NOT running
-        if not self.simulation_running:
-            for row in self.grid:
-                for tup in row:
-                    pygame.draw.rect(
-                        self.screen,
-                        tup[1],
-                        tup[0],
-                    )
-        # if the simulation IS running
-        else:
-            self._print_next_generation()
-            #time.sleep(self.settings.evolution_speed)
-
-
-    def _total_surround(self, row, col):
-        """Returns the total number of living cells surrounding the one at (row, col)."""
-
-        # calculates the final row and col indices based on screen dimensions & screen size
-        right_pos = int(self.settings.screen_width / self.settings.square_size) - 1
-        bottom_pos = int(self.settings.screen_height / self.settings.square_size) - 1
-        count = 0
-
-        # deal with the 4 corners
-        if row == 0 and col == 0:
-            if self._is_alive(0, 1):
-                count += 1
-            if self._is_alive(1, 1):
-                count += 1
-            if self._is_alive(1, 0):
-                count += 1
-        elif row == 0 and col == right_pos:
-            if self._is_alive(0, right_pos - 1):
-                count += 1
-            if self._is_alive(1, right_pos - 1):
-                count += 1
-            if self._is_alive(1, right_pos):
-                count += 1
-        elif row == bottom_pos and col == 0:
-            if self._is_alive(bottom_pos - 1, 0):
-                count += 1
-            if self._is_alive(bottom_pos - 1, 1):
-                count += 1
-            if self._is_alive(bottom_pos, 1):
-                count += 1            
-        elif row == bottom_pos and col == right_pos:
-            if self._is_alive(bottom_pos, right_pos - 1):
-                count += 1
-            if self._is_alive(bottom_pos - 1, right_pos - 1):
-                count += 1
-            if self._is_alive(bottom_pos - 1, right_pos):
-                count += 1
-        
-        # deal with the outer edges
-        elif row == 0:
-            if self._is_alive(0, col - 1):
-                count += 1
-            if self._is_alive(0, col + 1):
-                count += 1
-            if self._is_alive(1, col - 1):
-                count += 1
-            if self._is_alive(1, col + 1):
-                count += 1
-            if self._is_alive(1, col):
-                count += 1
-        elif row == bottom_pos:
-            if self._is_alive(bottom_pos, col - 1):
-                count += 1
-            if self._is_alive(bottom_pos, col + 1):
-                count += 1
-            if self._is_alive(bottom_pos - 1, col - 1):
-                count += 1
-            if self._is_alive(bottom_pos - 1, col + 1):
-                count += 1
-            if self._is_alive(bottom_pos - 1, col):
-                count += 1
-        elif col == 0:
-            if self._is_alive(row + 1, 0):
-                count += 1
-            if self._is_alive(row + 1, 1):
-                count += 1
-            if self._is_alive(row - 1, 0):
-                count += 1
-            if self._is_alive(row - 1, 1):
-                count += 1
-            if self._is_alive(row, 1):
-                count += 1            
-        elif col == right_pos:
-            if self._is_alive(row + 1, right_pos):
-                count += 1
-            if self._is_alive(row + 1, right_pos - 1):
-                count += 1
-            if self._is_alive(row - 1, right_pos):
-                count += 1
-            if self._is_alive(row - 1, right_pos - 1):
-                count += 1
-            if self._is_alive(row, right_pos - 1):
-                count += 1   
-    
-        # deal with the inner squares
-        else:
-            if self._is_alive(row - 1, col - 1):
-                count += 1
-            if self._is_alive(row - 1, col):
-                count += 1
-            if self._is_alive(row - 1, col + 1):
-                count += 1
-            if self._is_alive(row, col - 1):
-                count += 1
-            if self._is_alive(row, col + 1):
-                count += 1
-            if self._is_alive(row + 1, col - 1):
-                count += 1
-            if self._is_alive(row + 1, col):
-                count += 1
-            if self._is_alive(row + 1, col + 1):
-                count += 1
-
-        return count
+    def _check_mouse_motion(self, mouse_pos):
+        """Buffers the squares passed over since the last mouse position while painting."""
 
+        cell = self._cell_at(mouse_pos)
+        if self.paint_alive is None or cell is None or cell == self.paint_cell:
+            return
 
-    def _toggle_square(self, row, col):
-        """Toggles the state of a square at row, col."""
+        # step along the line between the two squares, so fast drags
+        # don't leave gaps
+        (row0, col0), (row1, col1) = self.paint_cell, cell
+        steps = max(abs(row1 - row0), abs(col1 - col0))
+        for i in range(1, steps + 1):
+            self.paint_buffer.add((
+                row0 + round((row1 - row0) * i / steps),
+                col0 + round((col1 - col0) * i / steps),
+            ))
+        self.paint_cell = cell
 
-        if not self._is_alive(row, col):
-            self.grid[row][col] = (self.grid[row][col][0], self.settings.square_color)
-        else:
-            self.grid[row][col] = (self.grid[row][col][0], self.settings.bg_color)
 
+    def _apply_paint(self):
+        """Paints all of the squares buffered this frame in one batch."""
 
-    def _check_mouse_click(self, mouse_pos):
+        if self.paint_buffer:
+            self.engine.set_state_many(self.paint_buffer, self.paint_colour if self.paint_alive else 0)
+            self.paint_buffer = set()
+            self.board_edited = True
+
+
+    def _stop_painting(self):
+        """Ends the current drag, painting anything still buffered."""
+
+        if self.paint_alive is not None:
+            self._apply_paint()
+        self.paint_alive = None
+        self.paint_cell = None
+
+
+    def _rewind_to(self, generation):
         """
-        Checks to see if a square was clicked with the mouse. The square
-        will then be toggled if it happened to be clicked on
+        Puts the board back as it was at 'generation', if the history still
+        holds it, and starts watching for cycles afresh from there.
         """
 
-        # traverse the entire list of Rect objects
-        row_count = 0
-        col_count = 0
-        
-        for row in self.grid:
-            col_count = 0
+        if self.history.restore(self.engine, generation):
+            self.cycle_detector.reset(self.engine)
+            if self.population_tracker:
+                self.population_tracker.rewind(self.engine)
+
 
-            for tup in row:
-                # if a mouse point collides with a rectangle, toggle it
-                if tup[0].collidepoint(mouse_pos):
-                    self._toggle_square(row_count, col_count)
-                    return
-                col_count += 1
+    def _rewind_by(self, generations):
+        """
+        Moves the board back by a number of generations (forward when
+        negative), stopping at the oldest or newest one the history holds.
+        """
 
-            row_count += 1
+        oldest, newest = self.history.oldest(), self.history.newest()
+        if oldest is None:
+            return
+        self._rewind_to(min(max(self.engine.generation - generations, oldest), newest))
 
 
     def _clear_all_cells(self):
-        """Resets all cells to 'dead' in self.grid."""
+        """Resets all cells to 'dead' in self.engine."""
 
-        # traverse self.grid
-        for row in range(len(self.grid)):
-            for col in range(len(self.grid[0])):
-                self.grid[row][col] = (self.grid[row][col][0], self.settings.bg_color)
+        self.engine.clear()
+        self.board_edited = True
 
 
     def _open_menu(self):
@@ -361,6 +300,11 @@ class Game:
         
         # pauses the game
         self.in_menu = True
+
+        # the menu is only built the first time it's opened, as loading its
+        # fonts is slow
+        if self.menu is None:
+            self.menu = Menu(self)
         
         # draw the menu and its elements
         self.menu.draw_menu()
@@ -368,17 +312,89 @@ class Game:
         
         while self.in_menu:
 
-            # check for events in the menu
-            for event in pygame.event.get():
+            # sleep until there is an event in the menu
+            event = self._wait_event()
                 
-                # quits the game using the red 'x' on the window
-                if event.type == pygame.QUIT:
-                    sys.exit()
+            # quits the game using the red 'x' on the window
+            if event.type == pygame.QUIT:
+                self._quit()
                 
-                # closes out of the menu
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.in_menu = False
+            # closes out of the menu
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.in_menu = False
+
+            # draws the menu again when the window needs it
+            if event.type == pygame.WINDOWEXPOSED:
+                self.menu.draw_menu()
+                pygame.display.flip()
+
+        # the menu was drawn over the grid, and no time passed behind it
+        self.renderer.invalidate()
+        self.redraw_needed = True
+        self.scheduler.resume()
+
+
+    def _quit(self):
+        """Exports any profiling samples, finishes any input log, releases the engine and exits."""
+
+        if self.input_log:
+            self.input_log.close()
+        if self.replay is not None:
+            self._report_replay()
+        if self.settings.profiling:
+            self._export_profile()
+        if self.recorder:
+            self._toggle_recording()
+        if self.population_tracker:
+            self._toggle_statistics()
+        self.engine.close()
+        sys.exit()
+
+
+    def _toggle_recording(self):
+        """Starts recording the frames drawn to record_path, or finishes the recording."""
+
+        if self.recorder is None:
+            self.recorder = FrameRecorder(self.settings.record_path, self.settings.record_queue_size)
+            self._report(f'Recording frames to {self.settings.record_path}')
+            return
+
+        self.recorder.close()
+        self._report(f'Recorded {self.recorder.frames} frames to {self.settings.record_path}'
+                     f' ({self.recorder.dropped} dropped)')
+        self.recorder = None
+
+
+    def _export_profile(self):
+        """Exports the profiling samples to profile_export_path."""
+
+        try:
+            self.profiler.export(self.settings.profile_export_path)
+        except OSError as error:
+            self._report(f'Could not export profile: {error}')
+
+
+    def _toggle_statistics(self):
+        """Starts following the population of the board, or exports what was followed and stops."""
+
+        if self.population_tracker is None:
+            self.population_tracker = PopulationTracker(self.settings.statistics_history,
+                                                        self.settings.census_interval)
+            self.population_tracker.reset(self.engine)
+            self._report(f'Following the population from generation {self.engine.generation}')
+            return
+
+        # the population is still followed if it couldn't be written, so that
+        # exporting it can be tried again
+        try:
+            self.population_tracker.export(self.settings.statistics_export_path)
+        except OSError as error:
+            self._report(f'Could not export statistics: {error}')
+            return
+        self._report(f'Exported {len(self.population_tracker.samples)} generations of statistics'
+                     f' to {self.settings.statistics_export_path}')
+        self.population_tracker = None
 
 
     def _check_keydown_events(self, event):
@@ -386,51 +402,345 @@ class Game:
         
         # enter key begins the simulation
         if event.key == pygame.K_RETURN:
-            self.grid_copy = self.grid
+            self._stop_painting()
+            # an edited board starts a new history; otherwise it carries on
+            # from the generation rewound or paused at
+            if self.board_edited or not self.history.retains(self.engine.generation):
+                self.history.reset(self.engine)
+            else:
+                self.history.mark(self.engine)
+            if self.board_edited and self.population_tracker:
+                self.population_tracker.reset(self.engine)
+            self.board_edited = False
+            self.cycle_detector.reset(self.engine)
+            self.scheduler.resume()
             self.simulation_running = True
         
-        # q key ends the simulation
+        # q key ends the simulation, going back to where it began
         if event.key == pygame.K_q:
-            self.grid = self.grid_copy
+            if self.history.marked_generation is not None:
+                self._rewind_to(self.history.marked_generation)
             self.simulation_running = False
+
+        # , and . keys step back and forward a generation through the
+        # history, and [ and ] by a keyframe's worth (when sim is not running)
+        rewinds = {
+            pygame.K_COMMA: 1,
+            pygame.K_PERIOD: -1,
+            pygame.K_LEFTBRACKET: self.settings.history_keyframe_interval,
+            pygame.K_RIGHTBRACKET: -self.settings.history_keyframe_interval,
+        }
+        if event.key in rewinds and not self.simulation_running:
+            self._rewind_by(rewinds[event.key])
         
         # escape key brings up the menu
         if event.key == pygame.K_ESCAPE:
             self._open_menu()
 
+        # t key toggles turbo mode
+        if event.key == pygame.K_t:
+            self.scheduler.toggle_turbo()
+
+        # p key toggles the profiling overlay
+        if event.key == pygame.K_p:
+            self.profiler.toggle_hud()
+            self.renderer.invalidate()
+
+        # e key exports the profiling samples
+        if event.key == pygame.K_e:
+            self._export_profile()
+
+        # v key starts or finishes recording the frames drawn
+        if event.key == pygame.K_v:
+            self._toggle_recording()
+
+        # x key starts following the population statistics, or exports them
+        if event.key == pygame.K_x:
+            self._toggle_statistics()
+
+        # s key saves a snapshot of the board
+        if event.key == pygame.K_s:
+            try:
+                snapshot.save_snapshot(self.settings.snapshot_path, self.engine)
+            except OSError as error:
+                self._report(f'Could not save snapshot: {error}')
+
+        # l key loads the saved snapshot (when sim is not running)
+        if event.key == pygame.K_l and not self.simulation_running:
+            try:
+                snapshot.load_snapshot(self.settings.snapshot_path, self.engine)
+                self.board_edited = True
+            except (OSError, ValueError) as error:
+                self._report(f'Could not load snapshot: {error}')
+
         # c key clears the board (when sim is not running)
         if event.key == pygame.K_c and not self.simulation_running:
             self._clear_all_cells()
 
+        # arrow keys pan the view by a quarter of the window
+        rows, cols = self.viewport.squares()
+        pans = {
+            pygame.K_UP: (-rows // 4, 0),
+            pygame.K_DOWN: (rows // 4, 0),
+            pygame.K_LEFT: (0, -cols // 4),
+            pygame.K_RIGHT: (0, cols // 4),
+        }
+        if event.key in pans:
+            self._change_view(self.viewport.pan, *pans[event.key])
+
+        # + and - keys zoom in and out around the middle of the window, and
+        # the h key goes back to the starting view
+        middle = (self.settings.screen_width // 2, self.settings.screen_height // 2)
+        if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self._change_view(self.viewport.zoom, 1, middle)
+        if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self._change_view(self.viewport.zoom, -1, middle)
+        if event.key == pygame.K_h:
+            self._change_view(self.viewport.home)
+
+        # number keys pick the colour painted with a multi-colour rule
+        if pygame.K_1 <= event.key <= pygame.K_9 and event.key - pygame.K_0 <= self.engine.rule.colours:
+            self.paint_colour = event.key - pygame.K_0
+
+
+    def replay_input(self, frames):
+        """
+        Takes the input of every frame from now on from the (frame,
+        generations, drawn, events) of an input log rather than from the
+        user, running and drawing the same frames as when it was logged,
+        as fast as they can go. Quits after the last frame.
+        """
+
+        self.replay = iter(frames)
+        self.replay_next = next(self.replay, None)
+
+
+    def _replay_frame(self):
+        """
+        Queues the events of the current frame of the replay. Returns the
+        generations the frame ran and whether it was drawn.
+        """
+
+        # live input is ignored, but closing the window still stops the replay
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            self._quit()
+
+        if self.replay_next is None:
+            self._quit()
+        frame, generations, drawn, events = self.replay_next
+        if frame > self.frame:
+            return 0, False
+
+        self.pending_events.extend(events)
+        self.replay_next = next(self.replay, None)
+        return generations, drawn
+
+
+    def _report_replay(self):
+        """Prints how long the frames replayed so far took."""
+
+        times = sorted(sum(sample[name] for name in Profiler.PHASES) for sample in self.profiler.samples)
+        if times:
+            self._report(f'Replayed {len(times)} frames in {sum(times):.3f}s: '
+                         f'p50 {times[len(times) // 2] * 1000:.2f} ms, '
+                         f'p99 {times[min(len(times) - 1, len(times) * 99 // 100)] * 1000:.2f} ms, '
+                         f'max {times[-1] * 1000:.2f} ms per frame; timings written to {self.settings.profile_export_path}')
+
+
+    def _wait_event(self):
+        """Returns the next event, waiting for one, or the next one of the frame being replayed."""
+
+        if self.replay is not None:
+            # a log that ends inside the menu quits from there
+            event = self.pending_events.popleft() if self.pending_events else pygame.event.Event(pygame.QUIT)
+        else:
+            event = pygame.event.wait()
+        if self.input_log:
+            self.input_log.record_event(event)
+        return event
+
 
     def run_game(self):
-        """The main game loop."""
+        """
+        The main game loop. While the simulation is paused and nothing is
+        left to draw, it sleeps until the next event rather than spinning.
+        """
         while not self.in_menu:
-            
-            # check for events
-            for event in pygame.event.get():
-                
-                # quits the game using the red 'x' on the window
-                if event.type == pygame.QUIT:
-                    sys.exit()
-                
-                # check for keydown events
-                if event.type == pygame.KEYDOWN:
-                    self._check_keydown_events(event)
-
-                # fills a cell in the grid (when sim is not running)
-                if event.type == pygame.MOUSEBUTTONUP and not self.simulation_running:
-                    if event.button == pygame.BUTTON_LEFT:
-                        mouse_pos = pygame.mouse.get_pos()
-                        self._check_mouse_click(mouse_pos)
 
-            # fill background, update grid and borders
-            self.screen.fill(self.settings.bg_color)
-            self._update_grid()
-            self._update_borders()
-            pygame.display.flip()
+            # take the frame's input from the replay, or wait for something
+            # to happen while paused
+            replayed = None
+            if self.replay is not None:
+                replayed = self._replay_frame()
+            else:
+                if not self.simulation_running and not self.redraw_needed:
+                    self.pending_events.append(pygame.event.wait())
+                    self.scheduler.resume()
+                self.pending_events.extend(pygame.event.get())
+            
+            # check for events, one at a time as the menu may take some
+            with self.profiler.phase('events'):
+                while self.pending_events:
+                    event = self.pending_events.popleft()
+                    if self.input_log:
+                        self.input_log.record_event(event)
+
+                    # anything but the mouse moving over the grid may
+                    # change what is shown
+                    if event.type != pygame.MOUSEMOTION or self.paint_alive is not None or self.panning:
+                        self.redraw_needed = True
+                    
+                    # quits the game using the red 'x' on the window
+                    if event.type == pygame.QUIT:
+                        self._quit()
+                    
+                    # check for keydown events
+                    if event.type == pygame.KEYDOWN:
+                        self._check_keydown_events(event)
+
+                    # toggles a cell in the grid and starts painting
+                    # (when sim is not running)
+                    if event.type == pygame.MOUSEBUTTONDOWN and not self.simulation_running:
+                        if event.button == pygame.BUTTON_LEFT:
+                            self._check_mouse_click(event.pos)
+
+                    # paints the cells the mouse is dragged over, or pans
+                    # the view while the right button is held
+                    if event.type == pygame.MOUSEMOTION:
+                        self._check_mouse_motion(event.pos)
+                        if self.panning:
+                            self._change_view(self.viewport.drag, event.rel)
+
+                    # stops painting
+                    if event.type == pygame.MOUSEBUTTONUP and event.button == pygame.BUTTON_LEFT:
+                        self._stop_painting()
+
+                    # the right button drags the view around
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_RIGHT:
+                        self.panning = True
+                    if event.type == pygame.MOUSEBUTTONUP and event.button == pygame.BUTTON_RIGHT:
+                        self.panning = False
+
+                    # the mouse wheel zooms around the mouse, or where it
+                    # was when a replayed event was logged
+                    if event.type == pygame.MOUSEWHEEL and event.y:
+                        pos = getattr(event, 'pos', None) or pygame.mouse.get_pos()
+                        self._change_view(self.viewport.zoom, event.y, pos)
+
+                # paint the cells dragged over this frame in one batch
+                self._apply_paint()
+
+            # advance the simulation by the generations due this frame, or
+            # as many as it ran when it was logged
+            if replayed is not None:
+                generations, drawn = replayed
+            else:
+                generations = self.scheduler.generations_due(self.simulation_running)
+            if generations:
+                with self.profiler.phase('step'):
+                    self._advance(generations)
+                self.redraw_needed = True
+
+            # draw the frame if anything changed, unless the simulation has
+            # fallen behind
+            if replayed is None:
+                drawn = self.redraw_needed and (not self.simulation_running or self.scheduler.render_due())
+            if drawn:
+                self.renderer.draw_frame()
+                if self.recorder:
+                    self.recorder.record_surface(self.screen)
+                self.profiler.draw(self.screen)
+                self.redraw_needed = False
+            self.profiler.end_frame(generations, self.engine)
+            if self.input_log:
+                self.input_log.end_frame(generations, drawn)
+            self.frame += 1
+
+            # frames are only capped while the simulation runs; paused, the
+            # loop sleeps on events instead
+            if self.simulation_running and replayed is None:
+                self.scheduler.wait()
+
+
+def replay_session(args):
+    """
+    Replays the input log named by parsed command line arguments with the
+    settings it was logged with, in a window or headless, and exports the
+    time each frame took.
+    """
+
+    # a replay without a window draws to a dummy display
+    if args.headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+    try:
+        settings, frames = read_input_log(args.replay)
+    except (OSError, ValueError) as error:
+        sys.exit(f'Could not read input log: {error}')
+
+    # settings since removed are left out, and every frame is timed
+    known = vars(Settings(None))
+    overrides = {name: value for name, value in settings.items() if name in known}
+    overrides.update(
+        profiling=True,
+        profile_export_path=args.replay_timings,
+        profile_history=frames[-1][0] + 1 if frames else 1,
+    )
+    game = Game(**overrides)
+    game.replay_input(frames)
+    game.run_game()
+
+
+def parse_args(argv=None):
+    """Parses the command line arguments of the game."""
+
+    parser = argparse.ArgumentParser(description='New Game of Life')
+    parser.add_argument('--headless', action='store_true',
+        help='run the simulation without opening a window')
+    parser.add_argument('--generations', type=int, default=1000,
+        help='number of generations to run when headless')
+    parser.add_argument('--size', type=parse_size, default='120x80',
+        help='board size in cells as WxH when headless')
+    parser.add_argument('--seed-file',
+        help='pattern (.rle, .cells, .lif) placed in the middle of the board, '
+             'or snapshot (.snap) giving the whole board')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='numpy',
+        help='step engine used when headless')
+    parser.add_argument('--rule', type=parse_rule, default='B3/S23',
+        help='rulestring followed when headless, such as B36/S23, B2/S/C3 or B3/S23;B36/S23')
+    parser.add_argument('--boundary', choices=['clipped', 'toroidal', 'unbounded'],
+        help="what lies past the edges of the board when headless, the engine's default if not given")
+    parser.add_argument('--detect-cycles', action='store_true',
+        help='when headless, skip ahead once the board settles into a cycle')
+    parser.add_argument('--workers', type=int,
+        help='worker processes of the parallel engine, one per CPU by default')
+    parser.add_argument('--output',
+        help='write the final board to this pattern or snapshot file when headless')
+    parser.add_argument('--record',
+        help='when headless, write frames as PNG files to this directory, or as raw RGB to stdout if -')
+    parser.add_argument('--record-every', type=int, default=1,
+        help='generations between recorded frames')
+    parser.add_argument('--record-scale', type=int, default=1,
+        help='pixels on a side of each cell in recorded frames')
+    parser.add_argument('--statistics',
+        help='when headless, export the population of every generation to this CSV (or JSON) file')
+    parser.add_argument('--census-every', type=int, default=0,
+        help='generations between censuses of the objects on the board in the statistics, 0 for none')
+    parser.add_argument('--record-input',
+        help='log every input of the game to this file, to be replayed with --replay')
+    parser.add_argument('--replay',
+        help='replay the input logged to this file, without a window if --headless, timing every frame')
+    parser.add_argument('--replay-timings', default='replay.csv',
+        help='file the time of every replayed frame is written to, as CSV or as JSON if it ends in .json')
+    return parser.parse_args(argv)
 
 
 if __name__ == '__main__':
-    game = Game()
-    game.run_game()
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        replay_session(args)
+    elif args.headless:
+        run_headless(args)
+    else:
+        game = Game(**({'input_log_path': args.record_input} if args.record_input else {}))
+        game.run_game()
\ No newline at end of file
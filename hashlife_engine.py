@@ -0,0 +1,372 @@
+"""Contains the HashLifeEngine class, a memoized quadtree step engine."""
+from engine import Engine
+
+class QuadNode:
+    """
+    A square of 2^level by 2^level cells, made of four quadrants of the
+    level below. Nodes are canonical: two squares with the same cells are
+    always the same QuadNode object, so they can be compared and hashed by
+    identity.
+    """
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        """Creates a node. Use HashLifeEngine._join so nodes stay canonical."""
+
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+# the two leaves every tree is built from
+DEAD = QuadNode(None, None, None, None, 0, 0)
+ALIVE = QuadNode(None, None, None, None, 0, 1)
+
+
+class HashLifeEngine(Engine):
+    """
+    Step engine implementing Gosper's HashLife. The universe is a quadtree
+    of canonical nodes whose futures are memoized, so repeating structure
+    is only ever computed once and whole powers of two of generations can
+    be skipped at a time. The universe is unbounded: the board's rows and
+    cols only select the window reported by live_cells and get_cells.
+    Supports two-state rules without B0, which would fill the unbounded
+    empty space with life.
+    """
+
+    BOUNDARIES = ('unbounded',)
+
+    def __init__(self, rows, cols, cache_size=1000000, rule=None, boundary=None):
+        """
+        Creates an empty universe viewed through a rows x cols window. Once
+        more than 'cache_size' results are memoized, the caches are flushed
+        and only the nodes of the current universe are kept.
+        """
+
+        super().__init__(rows, cols, rule, boundary)
+        self._require_two_states()
+        self._require_no_b0()
+
+        # instance variables
+        self.cache_size = cache_size
+        self._nodes = {}
+        self._results = {}
+        self._empty = [DEAD]
+
+        # the root is always centered on the origin, so it spans
+        # -2^(level-1) up to 2^(level-1) on both axes
+        self.root = self._empty_node(3)
+        while not self._contains(rows - 1, cols - 1):
+            self.root = self._expand(self.root)
+
+
+    def _join(self, nw, ne, sw, se):
+        """Returns the canonical node made of the four given quadrants."""
+
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = QuadNode(nw, ne, sw, se, nw.level + 1,
+                nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+
+    def _empty_node(self, level):
+        """Returns the canonical node of the given level with no living cells."""
+
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self._join(empty, empty, empty, empty))
+        return self._empty[level]
+
+
+    def _expand(self, node):
+        """Returns a node one level up with 'node' in its center."""
+
+        empty = self._empty_node(node.level - 1)
+        return self._join(
+            self._join(empty, empty, empty, node.nw),
+            self._join(empty, empty, node.ne, empty),
+            self._join(empty, node.sw, empty, empty),
+            self._join(node.se, empty, empty, empty)
+        )
+
+
+    def _center(self, node):
+        """Returns the node one level down at the center of 'node'."""
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+
+    def _is_padded(self, node):
+        """Returns True if all living cells lie within the inner quarter of 'node'."""
+        return self._center(self._center(node)).population == node.population
+
+
+    def _contains(self, row, col):
+        """Returns True if the cell at (row, col) lies within the root."""
+
+        half = 1 << (self.root.level - 1)
+        return -half <= row < half and -half <= col < half
+
+
+    def _base_result(self, node):
+        """Returns the center 2x2 of a 4x4 node after one generation."""
+
+        # read the 16 cells as rows of 0s and 1s
+        cells = [[0] * 4 for _ in range(4)]
+        for qy, qx, quadrant in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[qy][qx] = quadrant.nw.population
+            cells[qy][qx + 1] = quadrant.ne.population
+            cells[qy + 1][qx] = quadrant.sw.population
+            cells[qy + 1][qx + 1] = quadrant.se.population
+
+        # look the next state of each center cell up in the rule
+        table = self.rule.table
+        leaves = []
+        for y in (1, 2):
+            for x in (1, 2):
+                count = sum(cells[y + dy][x + dx]
+                    for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+                leaves.append(ALIVE if table[cells[y][x]][count] else DEAD)
+        return self._join(*leaves)
+
+
+    def _result(self, node, j):
+        """
+        Returns the node one level down at the center of 'node', advanced by
+        2^j generations. Requires j <= node.level - 2.
+        """
+
+        if node.population == 0:
+            return self._empty_node(node.level - 1)
+
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._base_result(node)
+        else:
+            # the nine overlapping sub-squares one level down
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            n00 = nw
+            n01 = self._join(nw.ne, ne.nw, nw.se, ne.sw)
+            n02 = ne
+            n10 = self._join(nw.sw, nw.se, sw.nw, sw.ne)
+            n11 = self._center(node)
+            n12 = self._join(ne.sw, ne.se, se.nw, se.ne)
+            n20 = sw
+            n21 = self._join(sw.ne, se.nw, sw.se, se.sw)
+            n22 = se
+
+            # full speed advances both halves by 2^(j-1), otherwise only the
+            # second half advances and the first just takes the centers
+            if j == node.level - 2:
+                first = lambda sub: self._result(sub, j - 1)
+                second_j = j - 1
+            else:
+                first = self._center
+                second_j = j
+
+            r00, r01, r02 = first(n00), first(n01), first(n02)
+            r10, r11, r12 = first(n10), first(n11), first(n12)
+            r20, r21, r22 = first(n20), first(n21), first(n22)
+
+            result = self._join(
+                self._result(self._join(r00, r01, r10, r11), second_j),
+                self._result(self._join(r01, r02, r11, r12), second_j),
+                self._result(self._join(r10, r11, r20, r21), second_j),
+                self._result(self._join(r11, r12, r21, r22), second_j)
+            )
+
+        self._results[key] = result
+        return result
+
+
+    def jump(self, k):
+        """Advances the universe by 2^k generations in a single call."""
+
+        # pad the root so nothing can escape it during the jump
+        while self.root.level < k + 3 or not self._is_padded(self.root):
+            self.root = self._expand(self.root)
+        self.root = self._expand(self.root)
+
+        self.root = self._result(self.root, k)
+        self.generation += 1 << k
+
+        if len(self._results) > self.cache_size:
+            self._collect()
+
+
+    def step(self):
+        """Advances the universe by a single generation."""
+        self.jump(0)
+
+
+    def advance(self, generations):
+        """Advances the universe by the given number of generations."""
+
+        # one jump for each power of two making up 'generations'
+        k = 0
+        while generations:
+            if generations & 1:
+                self.jump(k)
+            generations >>= 1
+            k += 1
+
+
+    def _collect(self):
+        """Flushes the caches, keeping only the nodes of the current universe."""
+
+        self._results = {}
+        self._nodes = {}
+        self._empty = [DEAD]
+        self.root = self._rebuild(self.root)
+
+
+    def _rebuild(self, node):
+        """Re-interns 'node' and its descendants into the node table."""
+
+        if node.level == 0:
+            return node
+        if node.population == 0:
+            return self._empty_node(node.level)
+        return self._join(self._rebuild(node.nw), self._rebuild(node.ne),
+            self._rebuild(node.sw), self._rebuild(node.se))
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is alive."""
+
+        if not self._contains(row, col):
+            return False
+
+        # descend towards the cell, halving the square each level
+        node = self.root
+        half = 1 << (node.level - 1)
+        y, x = row + half, col + half
+        while node.level > 0 and node.population:
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            y %= half
+            x %= half
+        return node.population == 1
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive or dead."""
+
+        while not self._contains(row, col):
+            self.root = self._expand(self.root)
+
+        half = 1 << (self.root.level - 1)
+        self.root = self._set(self.root, row + half, col + half, ALIVE if alive else DEAD)
+
+
+    def _set(self, node, y, x, leaf):
+        """Returns 'node' with the cell at (y, x) inside it replaced by 'leaf'."""
+
+        if node.level == 0:
+            return leaf
+
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self._set(nw, y, x, leaf)
+            else:
+                ne = self._set(ne, y, x - half, leaf)
+        else:
+            if x < half:
+                sw = self._set(sw, y - half, x, leaf)
+            else:
+                se = self._set(se, y - half, x - half, leaf)
+        return self._join(nw, ne, sw, se)
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+        self.root = self._empty_node(self.root.level)
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every living cell in the window."""
+
+        for row, col, _ in self.live_states_in(0, 0, self.rows, self.cols):
+            yield (row, col)
+
+
+    def universe_states(self):
+        """Yields the (row, col, state) of every living cell in the universe, on the board or off it."""
+
+        half = 1 << (self.root.level - 1)
+        return self.live_states_in(-half, -half, 2 * half, 2 * half)
+
+
+    def live_states_in(self, top, left, height, width):
+        """
+        Yields the (row, col, state) of every living cell in the 'height' x
+        'width' window whose top left cell is (top, left), which may lie
+        anywhere in the universe.
+        """
+
+        half = 1 << (self.root.level - 1)
+        window = (top, left, top + height, left + width)
+        for row, col, _ in self._walk(self.root, -half, -half, window, 0):
+            yield (row, col, 1)
+
+
+    def block_populations(self, top, left, height, width, block):
+        """
+        Yields (row, col, population) for every 'block' x 'block' square of
+        cells overlapping the window of live_states_in that holds living
+        cells. Squares are aligned to multiples of 'block', which must be a
+        power of two, and (row, col) is the top left cell of each. Every
+        square is a node of the quadtree, so its population is known without
+        visiting its cells.
+        """
+
+        # the root is never smaller than a square, so squares are whole nodes
+        level = block.bit_length() - 1
+        while self.root.level <= level:
+            self.root = self._expand(self.root)
+
+        half = 1 << (self.root.level - 1)
+        window = (top, left, top + height, left + width)
+        return self._walk(self.root, -half, -half, window, level)
+
+
+    def _walk(self, node, top, left, window, level):
+        """
+        Yields (row, col, population) for the non-empty nodes of 'level'
+        within 'node', whose corner is at (top, left), that overlap 'window'
+        given as (top, left, bottom, right).
+        """
+
+        if node.population == 0:
+            return
+
+        # skip the parts of the universe that lie outside the window
+        size = 1 << node.level
+        first_row, first_col, last_row, last_col = window
+        if top >= last_row or left >= last_col or top + size <= first_row or left + size <= first_col:
+            return
+
+        if node.level == level:
+            yield (top, left, node.population)
+            return
+
+        half = size >> 1
+        yield from self._walk(node.nw, top, left, window, level)
+        yield from self._walk(node.ne, top, left + half, window, level)
+        yield from self._walk(node.sw, top + half, left, window, level)
+        yield from self._walk(node.se, top + half, left + half, window, level)
@@ -0,0 +1,197 @@
+"""Runs the Game of Life rules without opening a pygame display."""
+import sys, time
+from engines import create_engine
+from cycle_detector import CycleDetector
+from recorder import FrameRecorder, board_image
+from population_tracker import PopulationTracker
+from renderer import state_colors
+from settings import Settings
+import patterns, snapshot
+
+class HeadlessRunner:
+    """Advances an engine for a fixed number of generations and times it."""
+
+    def __init__(self, engine_name, rows, cols, seed_file=None, **options):
+        """
+        Creates the engine, passing it any keyword 'options', and seeds it
+        from 'seed_file' when given. Pattern files are centered on the board,
+        while snapshots must match its size.
+        """
+
+        # instance variables
+        self.engine = create_engine(engine_name, rows, cols, **options)
+        self.elapsed = 0.0
+
+        # load the seed onto the board, releasing the engine if it can't be
+        try:
+            if seed_file and seed_file.endswith(snapshot.EXTENSION):
+                snapshot.load_snapshot(seed_file, self.engine)
+            elif seed_file:
+                patterns.load_pattern(seed_file, self.engine)
+        except BaseException:
+            self.engine.close()
+            raise
+
+
+    def run(self, generations, detect_cycles=False, record=None, record_every=1, tracker=None):
+        """
+        Advances the board by 'generations' and returns a summary dict. With
+        'detect_cycles', the board is watched for repeating itself, and once
+        it does the remaining generations are skipped arithmetically. When
+        given, 'record' is called with the engine at the start and after
+        every 'record_every' generations, and a PopulationTracker 'tracker'
+        is updated every generation; a cycle is then still reported but not
+        skipped, so that nothing is missed.
+        """
+
+        start = time.perf_counter()
+        detector = None
+        if tracker:
+            tracker.reset(self.engine)
+        if detect_cycles:
+            detector = self._run_detecting(generations, record, record_every, tracker)
+        elif record or tracker:
+            self._run_recording(generations, record, record_every, tracker)
+        else:
+            self.engine.advance(generations)
+        self.elapsed = time.perf_counter() - start
+
+        summary = {
+            'engine': type(self.engine).__name__,
+            'rule': str(self.engine.rule),
+            'boundary': self.engine.boundary,
+            'size': f'{self.engine.cols}x{self.engine.rows}',
+            'generations': generations,
+            'seconds': self.elapsed,
+            'generations_per_second': generations / self.elapsed if self.elapsed else float('inf'),
+            'population': self.engine.population(),
+        }
+        if detector and detector.period is not None:
+            summary['cycle_period'] = detector.period
+            summary['cycle_generation'] = detector.generation
+        return summary
+
+
+    def _run_recording(self, generations, record, record_every, tracker=None):
+        """
+        Advances the board 'record_every' generations at a time, recording
+        each, or one at a time when there is a tracker to update.
+        """
+
+        start = self.engine.generation
+        target = start + generations
+        if record:
+            record(self.engine)
+        while self.engine.generation < target:
+            if tracker:
+                self.engine.step()
+                tracker.update(self.engine)
+            else:
+                self.engine.advance(min(record_every, target - self.engine.generation))
+            if record and ((self.engine.generation - start) % record_every == 0 or self.engine.generation == target):
+                record(self.engine)
+
+
+    def _run_detecting(self, generations, record=None, record_every=1, tracker=None):
+        """Advances the board one generation at a time until it cycles, then skips ahead."""
+
+        start = self.engine.generation
+        target = start + generations
+        detector = CycleDetector()
+        detector.reset(self.engine)
+        if record:
+            record(self.engine)
+        while self.engine.generation < target:
+            self.engine.step()
+            if tracker:
+                tracker.update(self.engine)
+            if detector.period is None and detector.update(self.engine) and not (record or tracker):
+                detector.fast_forward(self.engine, target)
+            if record and (self.engine.generation - start) % record_every == 0:
+                record(self.engine)
+        return detector
+
+
+def parse_size(text):
+    """Turns a 'WxH' string into a (width, height) tuple of cells."""
+
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise ValueError(f'Invalid size {text!r}, expected WxH') from None
+    if width < 2 or height < 2:
+        raise ValueError(f'Invalid size {text!r}, the board must be at least 2x2')
+    return width, height
+
+
+def run_headless(args):
+    """
+    Runs a headless simulation from parsed command line arguments, exiting
+    with a message if a file can't be read or written or the engine can't
+    run the rule or boundary asked for.
+    """
+
+    width, height = args.size
+    options = {'rule': args.rule, 'boundary': args.boundary}
+    if args.engine == 'parallel':
+        options['workers'] = args.workers
+
+    # a snapshot seed sets the size of the board
+    try:
+        if args.seed_file and args.seed_file.endswith(snapshot.EXTENSION):
+            height, width, _ = snapshot.read_header(args.seed_file)
+        runner = HeadlessRunner(args.engine, height, width, args.seed_file, **options)
+    except (OSError, ValueError) as error:
+        sys.exit(f'Could not start the run: {error}')
+
+    try:
+        return _run(runner, args)
+    except (OSError, ValueError) as error:
+        sys.exit(f'Could not finish the run: {error}')
+    finally:
+        runner.engine.close()
+
+
+def _run(runner, args):
+    """Runs the simulation of run_headless on the runner's engine and reports on it."""
+
+    # frames are drawn in the game's colours, and the recorder waits rather
+    # than drop frames, as nothing is shown live
+    recorder = record_frame = None
+    if args.record:
+        recorder = FrameRecorder(args.record, block=True)
+        colors = state_colors(runner.engine.rule, Settings(None))
+
+        def draw_frame(engine):
+            recorder.record(*board_image(engine, colors, args.record_scale))
+        record_frame = draw_frame
+    tracker = None
+    if args.statistics:
+        tracker = PopulationTracker(args.generations + 1, args.census_every)
+    try:
+        summary = runner.run(args.generations, args.detect_cycles, record_frame, args.record_every, tracker)
+    finally:
+        if recorder:
+            recorder.close()
+        if tracker:
+            tracker.export(args.statistics)
+
+    # report the throughput and final state, away from any frames on stdout
+    out = sys.stderr if args.record == '-' else sys.stdout
+    print(f"{summary['engine']} on {summary['size']} under {summary['rule']}: "
+          f"{summary['generations']} generations in {summary['seconds']:.3f}s "
+          f"({summary['generations_per_second']:.1f} gen/s), "
+          f"final population {summary['population']}", file=out)
+    if 'cycle_period' in summary:
+        print(f"Stable with period {summary['cycle_period']} at generation {summary['cycle_generation']}", file=out)
+    if recorder:
+        print(f'Recorded {recorder.frames} frames to {args.record}', file=out)
+    if tracker:
+        print(f'Exported {len(tracker.samples)} generations of statistics to {args.statistics}', file=out)
+
+    if args.output and args.output.endswith(snapshot.EXTENSION):
+        snapshot.save_snapshot(args.output, runner.engine)
+    elif args.output:
+        patterns.save_pattern(args.output, runner.engine)
+
+    return summary
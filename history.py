@@ -0,0 +1,217 @@
+"""Contains the History class that lets the board be rewound to earlier generations."""
+import collections, zlib
+
+class History:
+    """
+    Remembers recent generations of a board so that they can be restored.
+    Every 'keyframe_interval' generations the whole board is stored as a
+    keyframe; in between, each generation is stored as a delta, the bytes
+    of the board XORed with those of the generation before, where only the
+    changed cells are set. Both are compressed, so the zeros of an unchanged
+    or empty board take almost nothing, unless most of their bytes are set,
+    as on a busy board, when compressing them would save little and cost
+    more than stepping the board does. Any retained generation is restored
+    from the keyframe before it and at most keyframe_interval - 1 deltas.
+    Once the history takes up more than 'budget' bytes, the oldest keyframe
+    and its deltas are dropped. A budget of 0 records nothing but the marked
+    generation. On an unbounded universe, only the cells on the board are
+    remembered.
+    """
+
+    def __init__(self, budget, keyframe_interval=100):
+        """Creates an empty History that keeps within 'budget' bytes."""
+
+        # instance variables
+        self.budget = budget
+        self.keyframe_interval = keyframe_interval
+        self.size = 0
+
+        # each segment is [generation, keyframe, deltas], covering its
+        # keyframe's generation and one more for each delta
+        self.segments = collections.deque()
+
+        # the generation and keyframe kept whatever the budget, to go back to
+        self.marked_generation = None
+        self.marked_keyframe = None
+
+        # the generation last recorded or restored, and its uncompressed bytes
+        self._last = (None, None)
+
+
+    @staticmethod
+    def _encode(engine):
+        """
+        Returns the board as bytes: packed rows with two states, or a byte
+        per cell with more.
+        """
+
+        if engine.rule.states == 2:
+            return engine.packed_board()
+        return engine.get_state_array().tobytes()
+
+
+    @staticmethod
+    def _decode(engine, data):
+        """Replaces the board with one encoded by _encode."""
+
+        if engine.rule.states == 2:
+            engine.load_packed(data)
+            return
+
+        import numpy as np
+        states = np.frombuffer(data, dtype=np.uint8).reshape(engine.rows, engine.cols)
+        engine.clear()
+        for state in np.unique(states[states != 0]).tolist():
+            rows, cols = np.nonzero(states == state)
+            engine.set_state_many(zip(rows.tolist(), cols.tolist()), state)
+
+
+    @staticmethod
+    def _compress(data):
+        """
+        Returns a keyframe or delta as a zlib stream: run-length coded, which
+        is fastest on the runs of zeros of a quiet board, or stored as it is
+        when fewer than half its bytes are zero.
+        """
+
+        # every 16th byte is enough to tell a quiet board from a busy one
+        sample = data[::16]
+        if sample.count(0) * 2 < len(sample):
+            return zlib.compress(data, 0)
+        compressor = zlib.compressobj(1, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_RLE)
+        return compressor.compress(data) + compressor.flush()
+
+
+    @staticmethod
+    def _xor(data, other):
+        """Returns two equally long byte strings XORed together."""
+
+        return (int.from_bytes(data, 'little') ^ int.from_bytes(other, 'little')).to_bytes(len(data), 'little')
+
+
+    def oldest(self):
+        """Returns the oldest generation that can be restored, or None."""
+
+        if self.segments:
+            return self.segments[0][0]
+        return self.marked_generation
+
+
+    def newest(self):
+        """Returns the newest generation that can be restored, or None."""
+
+        if self.segments:
+            generation, _, deltas = self.segments[-1]
+            return generation + len(deltas)
+        return self.marked_generation
+
+
+    def _segment_of(self, generation):
+        """Returns the segment covering 'generation', or None."""
+
+        for segment in reversed(self.segments):
+            if segment[0] <= generation <= segment[0] + len(segment[2]):
+                return segment
+        return None
+
+
+    def retains(self, generation):
+        """Returns True if 'generation' can be restored."""
+        return generation == self.marked_generation or self._segment_of(generation) is not None
+
+
+    def reset(self, engine):
+        """Forgets everything, then marks and records the board as it is now."""
+
+        self.segments = collections.deque()
+        self.size = 0
+        self.mark(engine)
+        if self.budget:
+            self._add_segment(engine.generation, self.marked_keyframe)
+
+
+    def mark(self, engine):
+        """Keeps the board as it is now, to be restored whatever the budget."""
+
+        data = self._encode(engine)
+        self.marked_generation = engine.generation
+        self.marked_keyframe = self._compress(data)
+        self._last = (engine.generation, data)
+
+
+    def _add_segment(self, generation, keyframe):
+        """Starts a new segment at 'generation' with the given compressed keyframe."""
+
+        self.segments.append([generation, keyframe, []])
+        self.size += len(keyframe)
+
+
+    def record(self, engine):
+        """
+        Records the generation the engine has just stepped to. Anything
+        recorded after the generation before it, from before the board was
+        rewound, is forgotten.
+        """
+
+        if not self.budget:
+            return
+
+        generation = engine.generation
+        self._truncate(generation - 1)
+        data = self._encode(engine)
+
+        # a keyframe starts a new segment when the last is full, or when the
+        # generation before isn't the one last seen
+        last = self.segments[-1] if self.segments else None
+        if (last is None or self._last[0] != generation - 1 or last[0] + len(last[2]) != generation - 1
+                or len(last[2]) + 1 >= self.keyframe_interval):
+            self._add_segment(generation, self._compress(data))
+        else:
+            delta = self._compress(self._xor(data, self._last[1]))
+            last[2].append(delta)
+            self.size += len(delta)
+        self._last = (generation, data)
+
+        # drop the oldest segments until the history fits its budget
+        while self.size > self.budget and len(self.segments) > 1:
+            _, keyframe, deltas = self.segments.popleft()
+            self.size -= len(keyframe) + sum(map(len, deltas))
+
+
+    def _truncate(self, generation):
+        """Forgets every generation recorded after 'generation'."""
+
+        while self.segments and self.segments[-1][0] > generation:
+            _, keyframe, deltas = self.segments.pop()
+            self.size -= len(keyframe) + sum(map(len, deltas))
+
+        if self.segments:
+            first, _, deltas = self.segments[-1]
+            while first + len(deltas) > generation:
+                self.size -= len(deltas.pop())
+
+
+    def restore(self, engine, generation):
+        """
+        Puts the board back as it was at 'generation'. Returns False, leaving
+        the board alone, if that generation isn't retained.
+        """
+
+        segment = self._segment_of(generation)
+        if segment is None:
+            if generation != self.marked_generation:
+                return False
+            data = zlib.decompress(self.marked_keyframe)
+        else:
+            # XOR every delta into the keyframe as one big integer
+            first, keyframe, deltas = segment
+            data = zlib.decompress(keyframe)
+            bits = int.from_bytes(data, 'little')
+            for delta in deltas[:generation - first]:
+                bits ^= int.from_bytes(zlib.decompress(delta), 'little')
+            data = bits.to_bytes(len(data), 'little')
+
+        self._decode(engine, data)
+        engine.generation = generation
+        self._last = (generation, data)
+        return True
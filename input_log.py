@@ -0,0 +1,116 @@
+"""Contains the InputLog class that records the input of a session so that it can be replayed."""
+import gzip, json
+import pygame, pygame.event, pygame.mouse
+
+# the version of the log format, checked when a log is read
+VERSION = 1
+
+# the events a game reacts to, by the name of their pygame constant, and
+# the attributes of each that are kept
+LOGGED_EVENTS = {
+    'QUIT': (),
+    'WINDOWEXPOSED': (),
+    'KEYDOWN': ('key',),
+    'MOUSEBUTTONDOWN': ('pos', 'button'),
+    'MOUSEBUTTONUP': ('pos', 'button'),
+    'MOUSEMOTION': ('pos', 'rel'),
+    'MOUSEWHEEL': ('y', 'pos'),
+}
+
+
+class InputLog:
+    """
+    Writes the events a game takes in to a gzip-compressed file of JSON
+    lines, along with the frame each was taken in, how many generations
+    that frame ran and whether it was drawn. Replaying the log with the
+    same 'settings' goes through exactly the same frames, whatever the
+    speed of the machine. Frames in which nothing happened are left out.
+    """
+
+    def __init__(self, path, settings):
+        """Starts a log at 'path' of a game run with 'settings', a dict of Settings attributes."""
+
+        # instance variables
+        self.path = path
+        self.frame = 0
+        self.events = []
+        self.types = {getattr(pygame, name): name for name in LOGGED_EVENTS}
+        self.file = gzip.open(path, 'wt', compresslevel=6)
+        self.file.write(json.dumps({'version': VERSION, 'settings': settings}) + '\n')
+
+
+    def record_event(self, event):
+        """Logs an event taken in during the current frame, if it is one the game reacts to."""
+
+        name = self.types.get(event.type)
+        if name is None:
+            return
+
+        # a wheel event doesn't say where the mouse was, which the zoom is
+        # centred on
+        values = [getattr(event, attribute, None) for attribute in LOGGED_EVENTS[name]]
+        if name == 'MOUSEWHEEL' and values[1] is None:
+            values[1] = pygame.mouse.get_pos()
+        self.events.append([name, *values])
+
+
+    def end_frame(self, generations, drawn):
+        """Logs the frame that just ended, which ran 'generations' and was drawn if 'drawn'."""
+
+        if self.events or generations or drawn:
+            self.file.write(json.dumps([self.frame, generations, int(drawn), self.events], separators=(',', ':')) + '\n')
+            self.events = []
+        self.frame += 1
+
+
+    def close(self):
+        """Logs any events of the unfinished frame, such as the one that quit, and closes the file."""
+
+        if self.events:
+            self.end_frame(0, False)
+        self.file.close()
+
+
+def settings_dict(settings):
+    """Returns the attributes of a Settings object that can be logged, as a dict."""
+
+    logged = {}
+    for name, value in vars(settings).items():
+        if name in ('game', 'input_log_path'):
+            continue
+        try:
+            json.dumps(value)
+        except TypeError:
+            continue
+        logged[name] = value
+    return logged
+
+
+def read_input_log(path):
+    """
+    Reads the log at 'path' written by an InputLog. Returns the settings it
+    was recorded with, and a list of (frame, generations, drawn, events)
+    for every frame logged, with events as pygame Events.
+    """
+
+    with gzip.open(path, 'rt') as file:
+        header = json.loads(file.readline())
+        if header.get('version') != VERSION:
+            raise ValueError(f'{path} is an input log of version {header.get("version")}, expected {VERSION}')
+
+        frames = []
+        for line in file:
+            frame, generations, drawn, events = json.loads(line)
+            frames.append((frame, generations, bool(drawn), [_decode_event(event) for event in events]))
+    return header['settings'], frames
+
+
+def _decode_event(record):
+    """Returns the pygame Event logged as 'record' by InputLog.record_event."""
+
+    name, *values = record
+    attributes = {
+        attribute: tuple(value) if isinstance(value, list) else value
+        for attribute, value in zip(LOGGED_EVENTS[name], values)
+    }
+    return pygame.event.Event(getattr(pygame, name), attributes)
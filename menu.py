@@ -54,7 +54,6 @@ class Menu:
         self.element_title = MenuElement(
             game=self.game, 
             text='MENU', 
-            font=self.settings.font,
             font_size=int(
                 (self.settings.screen_width * self.settings.screen_height) / 12500),
             color=(0, 0, 0), 
@@ -64,7 +63,6 @@ class Menu:
         self.element_controls = MenuElement(
             game=self.game,
             text='Controls:',
-            font=self.settings.font,
             font_size=int(
                 (self.settings.screen_width * self.settings.screen_height) / 25000),
             color=(0, 0, 0),
@@ -76,7 +74,6 @@ class Menu:
         self.element_control1 = MenuElement(
             game=self.game,
             text='\'Enter\' - begin simulation',
-            font=self.settings.font,
             font_size=int(
                 (self.settings.screen_width * self.settings.screen_height) / 40000),
             color=(0, 0, 0),
@@ -1,10 +1,10 @@
 """Allows for the creation of different menu elements."""
-import pygame, pygame.font
+from fonts import load_font
 
 class MenuElement:
     """Instance of a single element in the menu."""
 
-    def __init__(self, game, text, font, font_size, color, position, anchor, deltax=0, deltay=0, bold=False):
+    def __init__(self, game, text, font_size, color, position, anchor, deltax=0, deltay=0, bold=False):
         """Creates a new MenuElement from the given parameters."""
 
         # instance variables
@@ -16,7 +16,7 @@ class MenuElement:
         self.anchor = anchor
         self.deltax = deltax
         self.deltay = deltay
-        self.font = pygame.font.SysFont(font, font_size, bold=self.bold)
+        self.font = load_font(game.settings, font_size, bold=self.bold)
         self.rect = None
         self.text_image = None
         
@@ -0,0 +1,114 @@
+"""Contains the NumpyEngine class, a vectorized step engine built on NumPy."""
+import numpy as np
+from array_engine import ArrayEngine, matches, split_counts
+
+class NumpyEngine(ArrayEngine):
+    """
+    Step engine that stores the board as a NumPy array and counts the
+    neighbours of every cell at once with shifted-array sums. The next
+    state of every cell is then gathered from the rule's lookup table.
+    Supports every kind of rule, on a clipped or a toroidal board.
+    """
+
+    BOUNDARIES = ('clipped', 'toroidal')
+
+    def __init__(self, rows, cols, rule=None, boundary=None):
+        """Creates an empty board with the given number of rows and columns."""
+
+        super().__init__(rows, cols, rule, boundary)
+
+        # one byte per cell holding its state, 0 meaning dead
+        self.cells = np.zeros((rows, cols), dtype=np.uint8)
+        self.previous = None
+
+        # the rule's lookup tables, flattened so a cell's entry is at
+        # state * 9 + neighbours
+        self._table = np.array(self.rule.table, dtype=np.uint8).ravel()
+        if self.rule.colours > 1:
+            self._births = np.array(self.rule.births, dtype=np.uint8).ravel()
+
+        # a two-state rule's table only holds the counts that give birth
+        # and survival, which are cheaper to compare against than to gather
+        if self.rule.states == 2:
+            self._either_counts, self._birth_counts, self._survival_counts = split_counts(self.rule.table)
+
+        # scratch buffers reused by every step; the padding ring stays dead,
+        # which gives the same clipped edges as the reference engine, unless
+        # the board is toroidal and it holds the opposite edges instead
+        self._padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self._counts = np.zeros((rows, cols), dtype=np.uint8)
+
+
+    def _count(self, alive, counts):
+        """Writes the number of living neighbours of each cell of a 0/1 board into 'counts'."""
+
+        padded = self._padded
+        padded[1:-1, 1:-1] = alive
+        if self.boundary == 'toroidal':
+            padded[0, 1:-1] = padded[-2, 1:-1]
+            padded[-1, 1:-1] = padded[1, 1:-1]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+
+        # sum the 8 shifted copies of the board
+        np.add(padded[:-2, :-2], padded[:-2, 1:-1], out=counts)
+        counts += padded[:-2, 2:]
+        counts += padded[1:-1, :-2]
+        counts += padded[1:-1, 2:]
+        counts += padded[2:, :-2]
+        counts += padded[2:, 1:-1]
+        counts += padded[2:, 2:]
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        # only living cells count as neighbours: in a two-state rule the
+        # board is already 0/1, with colours every cell that isn't dead
+        # counts, and in a Generations rule only state 1 does
+        counts = self._counts
+        if self.rule.states == 2:
+            self._count(self.cells, counts)
+        elif self.rule.colours > 1:
+            self._count(self.cells != 0, counts)
+        else:
+            self._count(self.cells == 1, counts)
+
+        # look the next state of every cell up in the rule
+        if self.rule.states == 2:
+            next_gen = self._two_state_lookup(counts)
+        else:
+            next_gen = np.take(self._table, self.cells * np.uint16(9) + counts)
+        if self.rule.colours > 1:
+            births = np.take(self._births, self._majority_colours() * 9 + counts)
+            next_gen = np.where(self.cells == 0, births, next_gen)
+
+        self.previous = self.cells
+        self.cells = next_gen
+        self.generation += 1
+
+
+    def _two_state_lookup(self, counts):
+        """Returns the next generation of a two-state rule from the neighbour counts."""
+
+        alive = self.cells.view(bool)
+        next_gen = matches(counts, self._either_counts)
+        if self._birth_counts:
+            next_gen |= matches(counts, self._birth_counts) & ~alive
+        if self._survival_counts:
+            next_gen |= matches(counts, self._survival_counts) & alive
+        return next_gen.view(np.uint8)
+
+
+    def _majority_colours(self):
+        """Returns the most common colour around each cell, the lowest on a tie."""
+
+        colour_counts = np.empty((self.rule.colours, self.rows, self.cols), dtype=np.uint8)
+        for colour in range(self.rule.colours):
+            self._count(self.cells == colour + 1, colour_counts[colour])
+        return colour_counts.argmax(axis=0) + 1
+
+
+    def _previous(self):
+        """Returns the array of the previous generation, or None before the first step."""
+        return self.previous
@@ -0,0 +1,161 @@
+"""Contains the ParallelEngine class, a step engine spread over a process pool."""
+import multiprocessing, weakref
+from multiprocessing import shared_memory
+import numpy as np
+from array_engine import ArrayEngine, matches, split_counts
+
+# the shared boards of the worker process and the rule's flattened lookup
+# table, where a cell's entry is at state * 9 + neighbours; both are set
+# once by _attach_boards
+_worker_boards = []
+_worker_rule = {}
+
+
+def _attach_boards(names, shape, table):
+    """Attaches a worker process to the shared double buffers and its rule."""
+
+    for name in names:
+        memory = shared_memory.SharedMemory(name=name)
+        _worker_boards.append((memory, np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)))
+
+    _worker_rule['table'] = np.array(table, dtype=np.uint8).ravel()
+    _worker_rule['states'] = len(table)
+
+    # a two-state rule is cheaper to compare against: the counts that leave
+    # any cell alive, and those that only give birth or only keep alive
+    if len(table) == 2:
+        _worker_rule['either'], _worker_rule['birth'], _worker_rule['survival'] = split_counts(table)
+
+
+def _step_band(source, start, stop):
+    """
+    Writes the next generation of board rows start to stop from the
+    'source' buffer into the other buffer. The rows just above and below
+    the band are read from the neighbouring bands as its halo.
+    """
+
+    padded = _worker_boards[source][1]
+    target = _worker_boards[1 - source][1]
+
+    # padded rows start + 1 to stop hold the band, with a halo row either
+    # side; in a Generations rule only cells in state 1 count as neighbours
+    block = padded[start:stop + 2]
+    cells = block[1:-1, 1:-1]
+    if _worker_rule['states'] > 2:
+        block = (block == 1).view(np.uint8)
+    counts = block[:-2, :-2] + block[:-2, 1:-1]
+    counts += block[:-2, 2:]
+    counts += block[1:-1, :-2]
+    counts += block[1:-1, 2:]
+    counts += block[2:, :-2]
+    counts += block[2:, 1:-1]
+    counts += block[2:, 2:]
+
+    # look the next state of every cell up in the rule
+    if _worker_rule['states'] > 2:
+        target[start + 1:stop + 1, 1:-1] = np.take(_worker_rule['table'], cells * np.uint16(9) + counts)
+    else:
+        alive = cells.view(bool)
+        next_gen = matches(counts, _worker_rule['either'])
+        if _worker_rule['birth']:
+            next_gen |= matches(counts, _worker_rule['birth']) & ~alive
+        if _worker_rule['survival']:
+            next_gen |= matches(counts, _worker_rule['survival']) & alive
+        target[start + 1:stop + 1, 1:-1] = next_gen
+
+
+def _release(pool, memories):
+    """Shuts down the worker pool and frees the shared buffers."""
+
+    pool.terminate()
+    for memory in memories:
+        memory.close()
+        memory.unlink()
+
+
+class ParallelEngine(ArrayEngine):
+    """
+    Step engine that splits the board into horizontal bands and steps them
+    in parallel on a pool of worker processes. The board lives in two
+    shared-memory buffers with a ring of dead cells around it: each step
+    reads one and writes the other, and the workers read the one-row halo
+    of their band straight from their neighbours' rows. Supports Life-like
+    and Generations rules, on a clipped or a toroidal board.
+    """
+
+    BOUNDARIES = ('clipped', 'toroidal')
+
+    def __init__(self, rows, cols, workers=None, rule=None, boundary=None):
+        """
+        Creates an empty board with the given number of rows and columns,
+        stepped by 'workers' processes (one per CPU when None).
+        """
+
+        super().__init__(rows, cols, rule, boundary)
+        if self.rule.colours > 1:
+            raise ValueError(f'ParallelEngine does not support colour rules like {self.rule}')
+
+        # instance variables
+        self.workers = min(workers or multiprocessing.cpu_count(), rows)
+        self.shape = (rows + 2, cols + 2)
+        self.current = 0
+
+        # the double buffers, shared with every worker
+        size = self.shape[0] * self.shape[1]
+        self.memories = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self.boards = [np.ndarray(self.shape, dtype=np.uint8, buffer=memory.buf) for memory in self.memories]
+        for board in self.boards:
+            board.fill(0)
+
+        # split the rows into one band per worker
+        bounds = [rows * i // self.workers for i in range(self.workers + 1)]
+        self.bands = list(zip(bounds[:-1], bounds[1:]))
+
+        self.pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_attach_boards,
+            initargs=([memory.name for memory in self.memories], self.shape, self.rule.table)
+        )
+        self._finalizer = weakref.finalize(self, _release, self.pool, self.memories)
+
+
+    @property
+    def cells(self):
+        """The current generation, without the ring of dead cells."""
+        return self.boards[self.current][1:-1, 1:-1]
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        # on a toroidal board the ring holds the opposite edges instead of dead cells
+        if self.boundary == 'toroidal':
+            board = self.boards[self.current]
+            board[0, 1:-1] = board[-2, 1:-1]
+            board[-1, 1:-1] = board[1, 1:-1]
+            board[:, 0] = board[:, -2]
+            board[:, -1] = board[:, 1]
+
+        # every band must finish before the buffers can be swapped
+        self.pool.starmap(_step_band, [(self.current, start, stop) for start, stop in self.bands])
+        self.current = 1 - self.current
+        self.generation += 1
+
+
+    def _previous(self):
+        """Returns the array of the previous generation, or None before the first step."""
+
+        # the other buffer still holds the previous generation
+        if self.generation == 0:
+            return None
+        return self.boards[1 - self.current][1:-1, 1:-1]
+
+
+    def close(self):
+        """Shuts down the worker pool and frees the shared buffers."""
+        self._finalizer()
+
+
+    def get_state_array(self):
+        """Returns the state of every cell as a rows x cols NumPy array of uint8."""
+        return self.cells.copy()
@@ -0,0 +1,310 @@
+"""
+Reads and writes seed patterns for the board, and holds a few standard ones.
+Patterns are streamed: readers yield the living cells as they parse the
+file and writers emit the board one row at a time, so neither ever holds
+a whole pattern file in memory.
+"""
+import itertools, os, random, re
+
+# characters read from pattern files at a time
+CHUNK_SIZE = 1 << 16
+
+# living cells handed to the engine at a time
+BATCH_SIZE = 4096
+
+# a run count and its tag in the body of an RLE file
+RLE_TOKEN = re.compile(r'(\d*)([^\d\s])')
+
+# RLE lines are kept to this length, as the format recommends
+RLE_LINE_LENGTH = 70
+
+# standard seeds in the plaintext format
+GLIDER = """
+.O.
+..O
+OOO
+"""
+
+R_PENTOMINO = """
+.OO
+OO.
+.O.
+"""
+
+GOSPER_GLIDER_GUN = """
+........................O...........
+......................O.O...........
+............OO......OO............OO
+...........O...O....OO............OO
+OO........O.....O...OO..............
+OO........O...O.OO....O.O...........
+..........O.....O.......O...........
+...........O...O....................
+............OO......................
+"""
+
+
+def iter_plaintext(lines):
+    """
+    Yields the (row, col) position of each living cell from lines in the
+    plaintext ('.cells') format. Lines starting with '!' are comments, 'O'
+    or '*' marks a living cell and anything else is dead.
+    """
+
+    row = 0
+    for line in lines:
+        if line.startswith('!'):
+            continue
+        for col, char in enumerate(line.rstrip('\n')):
+            if char in 'O*':
+                yield (row, col)
+        row += 1
+
+
+def parse_plaintext(lines):
+    """Returns a list of the living cells in plaintext lines, see iter_plaintext."""
+    return list(iter_plaintext(lines))
+
+
+def iter_rle(file):
+    """
+    Yields the (row, col) position of each living cell from a file in the
+    run length encoded ('.rle') format. The body is read in chunks, so
+    patterns with very long lines are still read in bounded memory.
+    """
+
+    # skip the comments, and the header line giving the size and rule
+    line = file.readline()
+    while line.startswith('#') or (line and not line.strip()):
+        line = file.readline()
+    pending = '' if line.lstrip().startswith('x') else line
+
+    row = col = 0
+    while True:
+        data = file.read(CHUNK_SIZE)
+        chunk = pending + data
+        pending = ''
+
+        # a run count split across chunks is kept for the next one
+        digits = re.search(r'\d+$', chunk)
+        if data and digits:
+            pending = digits.group()
+            chunk = chunk[:digits.start()]
+
+        for match in RLE_TOKEN.finditer(chunk):
+            count = int(match.group(1) or 1)
+            tag = match.group(2)
+            if tag == '!':
+                return
+            if tag == '$':
+                row += count
+                col = 0
+            elif tag in 'b.':
+                col += count
+            else:
+                for _ in range(count):
+                    yield (row, col)
+                    col += 1
+
+        if not data:
+            return
+
+
+def iter_life106(lines):
+    """
+    Yields the (row, col) position of each living cell from lines in the
+    Life 1.06 ('.lif') format, where each line holds the 'x y' position of
+    a living cell and lines starting with '#' are headers or comments.
+    """
+
+    for line in lines:
+        if line.startswith('#') or not line.strip():
+            continue
+        x, y = line.split()
+        yield (int(y), int(x))
+
+
+# file extension -> reader of an open text file
+READERS = {
+    '.cells': iter_plaintext,
+    '.txt': iter_plaintext,
+    '.rle': iter_rle,
+    '.lif': iter_life106,
+    '.life': iter_life106,
+}
+
+
+def iter_pattern(path):
+    """Yields the living cells of the pattern file at 'path', read by its extension."""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f'Unknown pattern format {extension!r}, expected one of {sorted(READERS)}')
+
+    with open(path) as file:
+        yield from READERS[extension](file)
+
+
+def _bounds(cells):
+    """Returns the (top, left, bottom, right) bounding box of the given cells, or None."""
+
+    top = left = bottom = right = None
+    for row, col in cells:
+        if top is None:
+            top = bottom = row
+            left = right = col
+        else:
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, col), max(right, col)
+    return None if top is None else (top, left, bottom, right)
+
+
+def _center_offset(engine, bounds):
+    """Returns the (row, col) offset centering a bounding box on the board."""
+
+    top, left, bottom, right = bounds
+    return (
+        (engine.rows - (bottom - top + 1)) // 2 - top,
+        (engine.cols - (right - left + 1)) // 2 - left,
+    )
+
+
+def _place(engine, cells, row_offset, col_offset):
+    """Sets the offset cells alive in batches, dropping any that fall outside the board."""
+
+    batch = []
+    for row, col in cells:
+        row += row_offset
+        col += col_offset
+        if 0 <= row < engine.rows and 0 <= col < engine.cols:
+            batch.append((row, col))
+            if len(batch) == BATCH_SIZE:
+                engine.set_alive_many(batch, True)
+                batch = []
+    if batch:
+        engine.set_alive_many(batch, True)
+
+
+def place_cells(engine, cells, center=True):
+    """
+    Sets the given (row, col) positions alive on the board held by 'engine'.
+    The pattern is centered on the board unless 'center' is False. Cells
+    falling outside of the board are dropped.
+    """
+
+    bounds = _bounds(cells)
+    if bounds is None:
+        return
+    _place(engine, cells, *(_center_offset(engine, bounds) if center else (0, 0)))
+
+
+def load_pattern(path, engine, center=True):
+    """
+    Loads the pattern file at 'path' onto the board held by 'engine',
+    centered unless 'center' is False. Centering reads the file twice,
+    once for its bounding box and once for its cells, rather than keeping
+    every cell in memory.
+    """
+
+    offset = (0, 0)
+    if center:
+        bounds = _bounds(iter_pattern(path))
+        if bounds is None:
+            return
+        offset = _center_offset(engine, bounds)
+    _place(engine, iter_pattern(path), *offset)
+
+
+def builtin(name):
+    """Returns the living cells of one of the standard seeds above."""
+    return parse_plaintext(globals()[name.upper()].strip('\n').splitlines())
+
+
+def random_soup(rows, cols, density, seed=0):
+    """Returns the living cells of a random rows x cols soup of the given density."""
+
+    rng = random.Random(seed)
+    return [
+        (row, col)
+        for row in range(rows)
+        for col in range(cols)
+        if rng.random() < density
+    ]
+
+
+def _row_text(row, cols):
+    """Returns a packed row as a string of '0' and '1', one per column."""
+    return format(int.from_bytes(row, 'little'), f'0{cols}b')[::-1]
+
+
+def write_plaintext(file, engine):
+    """Writes the board held by 'engine' to an open text file in the plaintext format."""
+
+    table = str.maketrans('01', '.O')
+    for row in engine.packed_rows():
+        file.write(_row_text(row, engine.cols).translate(table) + '\n')
+
+
+def write_rle(file, engine):
+    """Writes the board held by 'engine' to an open text file in the RLE format."""
+
+    file.write(f'x = {engine.cols}, y = {engine.rows}, rule = {engine.rule}\n')
+    line = ''
+    blank_rows = 0
+
+    def emit(token):
+        """Appends a token to the current line, wrapping it when it gets too long."""
+
+        nonlocal line
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            file.write(line + '\n')
+            line = ''
+        line += token
+
+    for index, row in enumerate(engine.packed_rows()):
+        text = _row_text(row, engine.cols).rstrip('0')
+
+        # rows are separated by '$', with runs of empty rows counted
+        if index:
+            blank_rows += 1
+        if not text:
+            continue
+        if blank_rows:
+            emit(f'{blank_rows if blank_rows > 1 else ""}$')
+            blank_rows = 0
+
+        for char, run in itertools.groupby(text):
+            count = len(list(run))
+            emit(f'{count if count > 1 else ""}{"o" if char == "1" else "b"}')
+
+    emit('!')
+    file.write(line + '\n')
+
+
+def write_life106(file, engine):
+    """Writes the board held by 'engine' to an open text file in the Life 1.06 format."""
+
+    file.write('#Life 1.06\n')
+    for row, col in engine.live_cells():
+        file.write(f'{col} {row}\n')
+
+
+# file extension -> writer to an open text file
+WRITERS = {
+    '.cells': write_plaintext,
+    '.txt': write_plaintext,
+    '.rle': write_rle,
+    '.lif': write_life106,
+    '.life': write_life106,
+}
+
+
+def save_pattern(path, engine):
+    """Writes the board held by 'engine' to 'path' in the format of its extension."""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f'Unknown pattern format {extension!r}, expected one of {sorted(WRITERS)}')
+
+    with open(path, 'w') as file:
+        WRITERS[extension](file, engine)
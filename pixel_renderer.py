@@ -0,0 +1,119 @@
+"""Contains the PixelRenderer class that draws the board through a pixel buffer."""
+import numpy as np
+import pygame, pygame.display, pygame.draw, pygame.rect, pygame.surfarray, pygame.transform
+from renderer import Renderer
+
+class PixelRenderer(Renderer):
+    """
+    Draws the board by writing the state of every cell in view into a
+    surface with one pixel per square, scaling it up to the screen and
+    blitting a cached overlay of the grid lines on top. Zoomed out to
+    blocks of cells, each pixel holds its block's density level instead.
+    Each frame is a handful of blits, no matter how many cells there are.
+    """
+
+    def __init__(self, game):
+        """Creates a PixelRenderer drawing the board of a Game instance."""
+
+        super().__init__(game)
+
+        # surfaces rebuilt whenever the settings they depend on change
+        self.cache_key = None
+        self.cell_surface = None
+        self.scaled_surface = None
+        self.border_overlay = None
+
+
+    def _settings_key(self):
+        """Returns the settings the cached surfaces were built from."""
+        return (
+            self.settings.screen_width,
+            self.settings.screen_height,
+            self.viewport.square_size,
+            self.viewport.block,
+            self.settings.bg_color,
+            self.settings.border_color,
+            tuple(self._palette()),
+        )
+
+
+    def _palette(self):
+        """Returns the colours the values of the cell buffer stand for."""
+
+        if self.viewport.block > 1:
+            return self.density_colors()
+        return self.state_colors()
+
+
+    def _build_surfaces(self):
+        """Builds the cell buffer, its scaled copy and the border overlay."""
+
+        screen_size = (self.settings.screen_width, self.settings.screen_height)
+        rows, cols = self.viewport.squares()
+        size = self.viewport.square_size
+
+        # an 8-bit surface with a pixel per square whose palette maps each
+        # cell state, or density level, to its colour; the squares may run
+        # past the edge of the screen
+        colors = self._palette()
+        self.cell_surface = pygame.Surface((cols, rows), depth=8)
+        self.cell_surface.set_palette(colors)
+        self.scaled_surface = pygame.Surface((cols * size, rows * size), depth=8)
+        self.scaled_surface.set_palette(colors)
+
+        # the grid lines, drawn once over a transparent background
+        self.border_overlay = pygame.Surface(screen_size)
+        transparent = (255, 0, 255) if self.settings.border_color != (255, 0, 255) else (0, 255, 0)
+        self.border_overlay.fill(transparent)
+        self.border_overlay.set_colorkey(transparent)
+        screen = self.screen
+        self.screen = self.border_overlay
+        super().draw_borders()
+        self.screen = screen
+
+        self.cache_key = self._settings_key()
+
+
+    def draw_frame(self):
+        """Draws the current generation and pushes it to the display."""
+
+        with self.profiler.phase('cells'):
+            self.draw_cells()
+        with self.profiler.phase('borders'):
+            self.draw_borders()
+        with self.profiler.phase('flip'):
+            pygame.display.flip()
+
+
+    def draw_cells(self):
+        """Draws every cell of the grid to the screen through the pixel buffer."""
+
+        if self.cache_key != self._settings_key():
+            self._build_surfaces()
+
+        # surfarray indexes surfaces as (x, y), so the view is transposed
+        pygame.surfarray.blit_array(self.cell_surface, self._view_array().T)
+        pygame.transform.scale(self.cell_surface, self.scaled_surface.get_size(), self.scaled_surface)
+        self.screen.blit(self.scaled_surface, (0, 0))
+
+
+    def _view_array(self):
+        """Returns the value of every square in view, as a rows x cols NumPy array of uint8."""
+
+        if self.viewport.block == 1:
+            return self.game.engine.get_state_array_in(*self.viewport.visible_region())
+
+        # the density level of each block, rounded up so no living cell is lost
+        block = self.viewport.block
+        populations = self.game.engine.get_block_array(*self.viewport.visible_region(), block)
+        area = block * block
+        return ((populations * self.settings.density_levels + area - 1) // area).astype(np.uint8)
+
+
+    def draw_borders(self):
+        """Draws the grid lines between the cells from the cached overlay."""
+
+        if self.cache_key != self._settings_key():
+            self._build_surfaces()
+        if self.viewport.show_borders():
+            self.screen.blit(self.border_overlay, (0, 0))
@@ -0,0 +1,360 @@
+"""Contains the PopulationTracker class that follows the population of the board as it evolves."""
+import collections, csv, itertools, json, operator
+from rules import LIFE
+from sparse_engine import NEIGHBOURS
+
+# the longest period a census looks for, and the most cells an object may
+# have to be run in isolation
+CENSUS_PERIOD = 30
+CENSUS_MAX_CELLS = 40
+
+# the most shapes whose kind is remembered between censuses
+CENSUS_CACHE_SIZE = 100000
+
+
+class PopulationTracker:
+    """
+    Keeps the population of the board, the births and deaths of each
+    generation and the bounding box of the cells that aren't dead, updated
+    from the cells each step changed rather than by counting the board
+    again. Every 'census_interval' generations (never if 0) the objects on
+    the board are also counted by kind, under a two-state rule; under any
+    other no census is taken. The last 'history_size' generations are kept
+    as a time series for export.
+    """
+
+    def __init__(self, history_size=100000, census_interval=0):
+        """Creates a PopulationTracker that knows nothing of the board until reset."""
+
+        # instance variables
+        self.census_interval = census_interval
+        self.population = 0
+        self.births = 0
+        self.deaths = 0
+        self.samples = collections.deque(maxlen=history_size)
+        self.censuses = collections.deque(maxlen=history_size)
+
+        # the number of cells that aren't dead in each row and column, and
+        # the edges of the bounding box around them
+        self.row_counts = collections.Counter()
+        self.col_counts = collections.Counter()
+        self.top = self.bottom = self.left = self.right = None
+
+        # the cells that aren't dead, only kept for engines that can't tell
+        # which cells changed
+        self._cells = None
+
+
+    def reset(self, engine):
+        """Counts the board held by 'engine' from scratch, forgetting the time series."""
+
+        cells = list(engine.live_cells())
+        self.population = len(cells)
+        self.births = 0
+        self.deaths = 0
+        self.row_counts = collections.Counter(row for row, _ in cells)
+        self.col_counts = collections.Counter(col for _, col in cells)
+        self._find_edges()
+        self._cells = set(cells) if engine.changed_cells() is None else None
+        self.samples.clear()
+        self.censuses.clear()
+        self._record(engine)
+
+
+    def rewind(self, engine):
+        """
+        Counts the board held by 'engine' from scratch after it was put back
+        to an earlier generation, keeping the time series before it.
+        """
+
+        samples = [sample for sample in self.samples if sample['generation'] < engine.generation]
+        censuses = [census for census in self.censuses if census['generation'] < engine.generation]
+        self.reset(engine)
+        self.samples.extendleft(reversed(samples))
+        self.censuses.extendleft(reversed(censuses))
+
+
+    def _find_edges(self):
+        """Finds the bounding box from the row and column counts."""
+
+        if self.population:
+            self.top, self.bottom = min(self.row_counts), max(self.row_counts)
+            self.left, self.right = min(self.col_counts), max(self.col_counts)
+        else:
+            self.top = self.bottom = self.left = self.right = None
+
+
+    def bounding_box(self):
+        """Returns the (top, left, height, width) of the cells that aren't dead, or None if there are none."""
+
+        if not self.population:
+            return None
+        return (self.top, self.left, self.bottom - self.top + 1, self.right - self.left + 1)
+
+
+    def update(self, engine):
+        """Updates the counts after the engine has stepped one generation."""
+
+        changes = engine.changed_states()
+        if changes is None:
+            changes = self._diff_cells(engine)
+
+        rows, cols, states = changes
+
+        # only cells coming to or leaving the dead state change the
+        # population; a changed cell that isn't dead was born, unless it is
+        # in a dying state of a Generations rule
+        rule = engine.rule
+        born = states if rule.states == 2 or rule.colours > 1 else list(map((1).__eq__, states))
+        died = list(map(operator.not_, states))
+
+        # count the births and deaths in each row and column, so that only
+        # the rows and columns touched are visited one by one
+        born_rows = collections.Counter(itertools.compress(rows, born))
+        born_cols = collections.Counter(itertools.compress(cols, born))
+        died_rows = collections.Counter(itertools.compress(rows, died))
+        died_cols = collections.Counter(itertools.compress(cols, died))
+
+        self.births = sum(born_rows.values())
+        self.deaths = sum(died_rows.values())
+        self.population += self.births - self.deaths
+
+        self.row_counts.update(born_rows)
+        self.col_counts.update(born_cols)
+        self._remove(self.row_counts, died_rows)
+        self._remove(self.col_counts, died_cols)
+
+        # births can only grow the bounding box, and deaths only shrink it
+        if born_rows:
+            if self.top is None:
+                self.top, self.bottom = min(born_rows), max(born_rows)
+                self.left, self.right = min(born_cols), max(born_cols)
+            else:
+                self.top, self.bottom = min(self.top, min(born_rows)), max(self.bottom, max(born_rows))
+                self.left, self.right = min(self.left, min(born_cols)), max(self.right, max(born_cols))
+        if died_rows:
+            self._shrink_edges()
+        self._record(engine)
+
+
+    @staticmethod
+    def _remove(counts, removed):
+        """Takes the 'removed' counts off 'counts', forgetting any that reach zero."""
+
+        for key, count in removed.items():
+            left = counts[key] - count
+            if left:
+                counts[key] = left
+            else:
+                del counts[key]
+
+
+    def _diff_cells(self, engine):
+        """Returns the changes since the last generation by comparing the cells, for engines that can't say."""
+
+        cells = set(engine.live_cells())
+        born = list(cells - self._cells)
+        died = list(self._cells - cells)
+        self._cells = cells
+        changes = born + died
+        return ([row for row, _ in changes], [col for _, col in changes], [1] * len(born) + [0] * len(died))
+
+
+    def _shrink_edges(self):
+        """Moves each edge of the bounding box in past rows and columns that emptied."""
+
+        if not self.population:
+            self.top = self.bottom = self.left = self.right = None
+            return
+
+        row_counts, col_counts = self.row_counts, self.col_counts
+        while self.top not in row_counts:
+            self.top += 1
+        while self.bottom not in row_counts:
+            self.bottom -= 1
+        while self.left not in col_counts:
+            self.left += 1
+        while self.right not in col_counts:
+            self.right -= 1
+
+
+    def _record(self, engine):
+        """Adds the current generation to the time series, and takes a census when one is due."""
+
+        self.samples.append({
+            'generation': engine.generation,
+            'population': self.population,
+            'births': self.births,
+            'deaths': self.deaths,
+            'top': self.top,
+            'left': self.left,
+            'bottom': self.bottom,
+            'right': self.right,
+        })
+        # a census can only name the objects of a two-state rule
+        due = self.census_interval and engine.generation % self.census_interval == 0
+        if due and engine.rule.states == 2:
+            self.censuses.append({'generation': engine.generation, 'objects': dict(census(engine))})
+
+
+    def export(self, path):
+        """Writes the time series to 'path', as JSON along with the censuses if it ends in .json and CSV otherwise."""
+
+        with open(path, 'w', newline='') as file:
+            if path.endswith('.json'):
+                json.dump({'samples': list(self.samples), 'censuses': list(self.censuses)}, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, fieldnames=['generation', 'population', 'births', 'deaths',
+                                                          'top', 'left', 'bottom', 'right'])
+                writer.writeheader()
+                writer.writerows(self.samples)
+
+
+def census(engine):
+    """
+    Returns a Counter of the objects on the board by kind. Each group of
+    touching living cells is run on its own for up to CENSUS_PERIOD
+    generations and named after what it does: a common still life,
+    oscillator or spaceship by name, otherwise 'still life', 'oscillator
+    pN', 'spaceship pN' or, for anything larger than CENSUS_MAX_CELLS or
+    that never repeats, 'other'. Only two-state rules are supported.
+    """
+
+    if engine.rule.states != 2:
+        raise ValueError(f'A census only supports two-state rules, not {engine.rule}')
+    counts = collections.Counter()
+    for cells in _components(set(engine.live_cells())):
+        counts[_classify(cells, engine.rule)] += 1
+    return counts
+
+
+def _components(cells):
+    """Yields each group of cells connected through their eight neighbours, as a frozenset."""
+
+    unseen = set(cells)
+    while unseen:
+        stack = [unseen.pop()]
+        component = set(stack)
+        while stack:
+            row, col = stack.pop()
+            for row_offset, col_offset in NEIGHBOURS:
+                neighbour = (row + row_offset, col + col_offset)
+                if neighbour in unseen:
+                    unseen.discard(neighbour)
+                    component.add(neighbour)
+                    stack.append(neighbour)
+        yield frozenset(component)
+
+
+def _step_cells(cells, rule):
+    """Returns the cells alive a generation after 'cells', on an unbounded board."""
+
+    counts = collections.Counter(
+        (row + row_offset, col + col_offset)
+        for row, col in cells for row_offset, col_offset in NEIGHBOURS
+    )
+    born, survives = rule.table[0], rule.table[1]
+    return frozenset(
+        cell for cell, count in counts.items()
+        if (survives[count] if cell in cells else born[count])
+    )
+
+
+def _normalize(cells):
+    """Returns the shape of 'cells' moved to the origin and, of its eight rotations and reflections, the least."""
+
+    shapes = []
+    for transform in (
+        lambda r, c: (r, c), lambda r, c: (c, -r), lambda r, c: (-r, -c), lambda r, c: (-c, r),
+        lambda r, c: (r, -c), lambda r, c: (-c, -r), lambda r, c: (-r, c), lambda r, c: (c, r),
+    ):
+        moved = [transform(row, col) for row, col in cells]
+        top = min(row for row, _ in moved)
+        left = min(col for _, col in moved)
+        shapes.append(tuple(sorted((row - top, col - left) for row, col in moved)))
+    return min(shapes)
+
+
+def _offset(cells, other):
+    """Returns the (rows, cols) 'other' is moved from 'cells' if it is the same shape, unturned, or None."""
+
+    if len(cells) != len(other):
+        return None
+    top, left = min(cells)
+    other_top, other_left = min(other)
+    rows, cols = other_top - top, other_left - left
+    if all((row + rows, col + cols) in other for row, col in cells):
+        return (rows, cols)
+    return None
+
+
+def _classify(cells, rule):
+    """Returns the kind of object a group of cells is, run on its own under 'rule'."""
+
+    if len(cells) > CENSUS_MAX_CELLS:
+        return 'other'
+
+    # the same shape anywhere on the board is the same kind of object
+    top = min(row for row, _ in cells)
+    left = min(col for _, col in cells)
+    key = (str(rule), frozenset((row - top, col - left) for row, col in cells))
+    if key not in _classified:
+        if len(_classified) >= CENSUS_CACHE_SIZE:
+            _classified.clear()
+        _classified[key] = _run_alone(key[1], rule)
+    return _classified[key]
+
+
+def _run_alone(cells, rule):
+    """Returns the kind of object a group of cells is, by running it for up to CENSUS_PERIOD generations."""
+
+    name = NAMED_OBJECTS.get(_normalize(cells)) if str(rule) == str(LIFE) else None
+    current = cells
+    for period in range(1, CENSUS_PERIOD + 1):
+        current = _step_cells(current, rule)
+        offset = _offset(cells, current)
+        if offset is None:
+            continue
+        if name:
+            return name
+        if period == 1 and offset == (0, 0):
+            return 'still life'
+        if offset == (0, 0):
+            return f'oscillator p{period}'
+        return f'spaceship p{period}'
+    return 'other'
+
+
+# the kind of each shape of cells classified so far, by (rule, shape)
+_classified = {}
+
+# the common objects of Conway's Life, each drawn in one phase
+COMMON_OBJECTS = {
+    'block': ['OO', 'OO'],
+    'beehive': ['.OO.', 'O..O', '.OO.'],
+    'loaf': ['.OO.', 'O..O', '.O.O', '..O.'],
+    'boat': ['OO.', 'O.O', '.O.'],
+    'tub': ['.O.', 'O.O', '.O.'],
+    'pond': ['.OO.', 'O..O', 'O..O', '.OO.'],
+    'ship': ['OO.', 'O.O', '.OO'],
+    'blinker': ['OOO'],
+    'toad': ['.OOO', 'OOO.'],
+    'beacon': ['OO..', 'OO..', '..OO', '..OO'],
+    'glider': ['.O.', '..O', 'OOO'],
+    'lwss': ['.O..O', 'O....', 'O...O', 'OOOO.'],
+}
+
+
+def _named_objects():
+    """Returns the name of each common object by the normalized shape of every one of its phases."""
+
+    named = {}
+    for name, lines in COMMON_OBJECTS.items():
+        cells = frozenset((row, col) for row, line in enumerate(lines) for col, char in enumerate(line) if char == 'O')
+        for _ in range(4):
+            named[_normalize(cells)] = name
+            cells = _step_cells(cells, LIFE)
+    return named
+
+
+NAMED_OBJECTS = _named_objects()
@@ -0,0 +1,147 @@
+"""Contains the Profiler class that times each phase of the main game loop."""
+import collections, contextlib, csv, json, time
+import pygame, pygame.display, pygame.draw, pygame.font, pygame.rect
+from fonts import load_font
+
+class Profiler:
+    """
+    Times the phases of every frame of the main game loop and keeps a
+    rolling window of samples for each. The rolling p50/p99 of each phase,
+    the generations per second and the live-cell count can be shown in an
+    on-screen overlay, and every frame's samples can be exported to CSV or
+    JSON for offline analysis.
+    """
+
+    # the phases of a frame, in the order they happen
+    PHASES = ('events', 'step', 'cells', 'borders', 'flip')
+
+    def __init__(self, settings):
+        """Creates a Profiler configured by the given Settings."""
+
+        # instance variables
+        self.settings = settings
+        self.enabled = settings.profiling
+        self.hud_visible = False
+        self.font = None
+        self.frame = 0
+        self.current = {}
+        self.windows = {name: collections.deque(maxlen=settings.profile_window) for name in self.PHASES}
+        self.generation_times = collections.deque(maxlen=settings.profile_window)
+        self.population = 0
+        self.samples = collections.deque(maxlen=settings.profile_history)
+
+
+    def toggle_hud(self):
+        """Shows or hides the overlay. Samples are recorded while it is shown."""
+
+        self.hud_visible = not self.hud_visible
+        self.enabled = self.hud_visible or self.settings.profiling
+
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Context manager timing the code inside it as the phase 'name'."""
+
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + time.perf_counter() - start
+
+
+    def end_frame(self, generations, engine):
+        """Records the phases timed during the frame that just ended."""
+
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.population = engine.population()
+        for name in self.PHASES:
+            self.windows[name].append(self.current.get(name, 0.0))
+        self.generation_times.append((now, generations))
+
+        sample = {'frame': self.frame, 'time': now, 'generations': generations, 'population': self.population}
+        sample.update((name, self.current.get(name, 0.0)) for name in self.PHASES)
+        self.samples.append(sample)
+
+        self.current = {}
+        self.frame += 1
+
+
+    def percentile(self, name, percent):
+        """Returns the given percentile, in seconds, of the rolling window of a phase."""
+
+        window = sorted(self.windows[name])
+        if not window:
+            return 0.0
+        return window[min(len(window) - 1, int(len(window) * percent / 100))]
+
+
+    def generations_per_second(self):
+        """Returns the generations per second over the rolling window."""
+
+        if len(self.generation_times) < 2:
+            return 0.0
+        elapsed = self.generation_times[-1][0] - self.generation_times[0][0]
+        generations = sum(count for _, count in list(self.generation_times)[1:])
+        return generations / elapsed if elapsed else 0.0
+
+
+    def summary(self):
+        """Returns the rolling statistics as a dict."""
+
+        return {
+            'phases': {
+                name: {'p50': self.percentile(name, 50), 'p99': self.percentile(name, 99)}
+                for name in self.PHASES
+            },
+            'generations_per_second': self.generations_per_second(),
+            'population': self.population,
+        }
+
+
+    def draw(self, screen):
+        """Draws the overlay onto 'screen' and pushes it to the display."""
+
+        if not self.hud_visible:
+            return
+
+        if self.font is None:
+            self.font = load_font(self.settings, self.settings.profile_font_size)
+
+        lines = ['phase      p50 ms   p99 ms']
+        for name in self.PHASES:
+            lines.append(f'{name:8} {self.percentile(name, 50) * 1000:8.2f} {self.percentile(name, 99) * 1000:8.2f}')
+        lines.append(f'gen/s    {self.generations_per_second():8.1f}')
+        lines.append(f'alive    {self.population:8d}')
+
+        # render the lines over a box in the top left corner
+        images = [self.font.render(line, True, self.settings.profile_text_color) for line in lines]
+        height = sum(image.get_height() for image in images) + 8
+        width = max(image.get_width() for image in images) + 8
+        box = pygame.Rect(0, 0, width, height)
+        pygame.draw.rect(screen, self.settings.profile_bg_color, box)
+
+        y = 4
+        for image in images:
+            screen.blit(image, (4, y))
+            y += image.get_height()
+        pygame.display.update(box)
+
+
+    def export(self, path):
+        """Writes every recorded frame to 'path', as JSON if it ends in .json and CSV otherwise."""
+
+        fields = ['frame', 'time', 'generations', 'population', *self.PHASES]
+        with open(path, 'w', newline='') as file:
+            if path.endswith('.json'):
+                json.dump({'summary': self.summary(), 'samples': list(self.samples)}, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(self.samples)
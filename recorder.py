@@ -0,0 +1,127 @@
+"""Contains the FrameRecorder class that writes frames out in the background."""
+import os, queue, struct, sys, threading, zlib
+import pygame, pygame.image
+
+class FrameRecorder:
+    """
+    Writes frames to 'target' on a background thread, either as a numbered
+    sequence of PNG files in the directory 'target', or as raw RGB to stdout
+    when 'target' is '-', to be piped into an encoder such as ffmpeg. Frames
+    wait in a queue holding at most 'queue_size'. When it is full, a frame
+    is dropped rather than holding up the simulation, unless 'block' is set,
+    in which case the caller waits for the worker to catch up.
+    """
+
+    def __init__(self, target, queue_size=64, block=False):
+        """Creates a FrameRecorder and starts its worker."""
+
+        # instance variables
+        self.target = target
+        self.block = block
+        self.frames = 0
+        self.dropped = 0
+        self.size = None
+        self.error = None
+        self.queue = queue.Queue(queue_size)
+
+        if target != '-':
+            os.makedirs(target, exist_ok=True)
+
+        self.worker = threading.Thread(target=self._write_frames, daemon=True)
+        self.worker.start()
+
+
+    def record(self, data, size):
+        """Queues a frame of RGB bytes, 'size' being its (width, height) in pixels."""
+
+        # a raw stream has no header, so every frame must be the same size
+        if self.size is None:
+            self.size = size
+        elif size != self.size:
+            raise ValueError(f'Frame is {size[0]}x{size[1]}, but the recording is {self.size[0]}x{self.size[1]}')
+
+        try:
+            self.queue.put((self.frames, data, size), block=self.block)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.frames += 1
+
+
+    def record_surface(self, surface):
+        """Queues a copy of what is drawn on a pygame Surface."""
+        self.record(pygame.image.tobytes(surface, 'RGB'), surface.get_size())
+
+
+    def close(self):
+        """Waits for the queued frames to be written, then stops the worker."""
+
+        self.queue.put(None)
+        self.worker.join()
+        if self.error is not None:
+            print(f'Could not record frames: {self.error}', file=sys.stderr)
+
+
+    def _write_frames(self):
+        """Writes each queued frame out until the queue is closed."""
+
+        stream = sys.stdout.buffer if self.target == '-' else None
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                break
+
+            # after an error, keep taking frames so that nothing waits on a
+            # full queue, but don't write them
+            if self.error is not None:
+                continue
+
+            index, data, size = frame
+            try:
+                if stream:
+                    stream.write(data)
+                else:
+                    write_png(os.path.join(self.target, f'frame_{index:06d}.png'), data, size)
+            except OSError as error:
+                self.error = error
+
+        if stream:
+            try:
+                stream.flush()
+            except OSError as error:
+                self.error = error
+
+
+def write_png(path, data, size):
+    """
+    Writes RGB bytes of the given (width, height) to 'path' as a PNG file.
+    The compression is done by zlib, which lets other threads run meanwhile,
+    unlike pygame.image.save.
+    """
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    # each row starts with the type of filter applied to it, here none
+    width, height = size
+    stride = width * 3
+    rows = b''.join(b'\x00' + data[y * stride:(y + 1) * stride] for y in range(height))
+
+    with open(path, 'wb') as file:
+        file.write(b'\x89PNG\r\n\x1a\n')
+        file.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        file.write(chunk(b'IDAT', zlib.compress(rows, 1)))
+        file.write(chunk(b'IEND', b''))
+
+
+def board_image(engine, colors, scale=1):
+    """
+    Returns the board as RGB bytes with a 'scale' x 'scale' square of pixels
+    per cell coloured by its state, and the (width, height) of the image.
+    """
+
+    import numpy as np
+    pixels = np.array(colors, dtype=np.uint8)[engine.get_state_array()]
+    if scale > 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+    return pixels.tobytes(), (engine.cols * scale, engine.rows * scale)
@@ -0,0 +1,258 @@
+"""Contains the ReferenceEngine class, the original cell-by-cell step engine."""
+from engine import Engine
+
+class ReferenceEngine(Engine):
+    """
+    Step engine that follows its rule one cell at a time. It is slow, but
+    it is the engine every other engine is checked against, and it supports
+    every kind of rule, on a clipped or a toroidal board.
+    """
+
+    BOUNDARIES = ('clipped', 'toroidal')
+
+    def __init__(self, rows, cols, rule=None, boundary=None):
+        """Creates an empty board with the given number of rows and columns."""
+        
+        super().__init__(rows, cols, rule, boundary)
+
+        # each cell is stored as its state, 0 meaning dead
+        self.cells = [[0] * cols for _ in range(rows)]
+        self.previous = None
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is in any state but dead."""
+        return self.cells[row][col] != 0
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive (state 1) or dead."""
+        self.cells[row][col] = 1 if alive else 0
+
+
+    def state(self, row, col):
+        """Returns the state of the cell at (row, col), 0 being dead."""
+        return self.cells[row][col]
+
+
+    def set_state(self, row, col, state):
+        """Sets the state of the cell at (row, col), 0 being dead."""
+        self.cells[row][col] = state
+
+
+    def live_states(self):
+        """Yields the (row, col, state) of every cell that isn't dead."""
+
+        for row, states in enumerate(self.cells):
+            for col, state in enumerate(states):
+                if state:
+                    yield (row, col, state)
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every cell that isn't dead."""
+
+        for row, col, _ in self.live_states():
+            yield (row, col)
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        self.previous = self.cells
+        self.cells = self._get_next_generation()
+        self.generation += 1
+
+
+    def changed_cells(self):
+        """Returns the (row, col) positions of the cells the last step changed."""
+
+        if self.previous is None:
+            return []
+        return [
+            (row, col)
+            for row, (old, new) in enumerate(zip(self.previous, self.cells))
+            for col in range(self.cols)
+            if old[col] != new[col]
+        ]
+
+
+    def _get_next_generation(self):
+        """Returns a new List containing the next generation of cells."""
+
+        # variables used and returned
+        next_gen = []
+        table = self.rule.table
+        if self.boundary == 'toroidal':
+            total_surround = self._total_surround_toroidal
+        else:
+            total_surround = self._total_surround
+
+        # traverse through each cell and look its next state up in the rule
+        for row_count in range(self.rows):
+
+            current_row = []
+            for col_count in range(self.cols):
+
+                state = self.cells[row_count][col_count]
+                surround = total_surround(row_count, col_count)
+
+                # a dead cell with multi-coloured neighbours is born with
+                # the rule of the colour most of them have
+                if state == 0 and self.rule.colours > 1:
+                    colour = self._majority_colour(row_count, col_count)
+                    current_row.append(self.rule.births[colour][surround])
+                else:
+                    current_row.append(table[state][surround])
+
+            # add the next generation row
+            next_gen.append(current_row)
+
+        # return the next generation of cells
+        return next_gen
+
+
+    def _is_alive(self, row, col):
+        """Returns True if the cell at (row, col) counts as a living neighbour."""
+
+        # cells of every colour count, but dying cells do not
+        if self.rule.colours > 1:
+            return self.cells[row][col] != 0
+        return self.cells[row][col] == 1
+
+
+    def _majority_colour(self, row, col):
+        """Returns the most common colour around (row, col), the lowest on a tie."""
+
+        counts = [0] * self.rule.states
+        for neighbour_row, neighbour_col in self._neighbours(row, col):
+            counts[self.cells[neighbour_row][neighbour_col]] += 1
+        counts[0] = -1
+        return counts.index(max(counts))
+
+
+    def _neighbours(self, row, col):
+        """Yields the positions of the cells surrounding the one at (row, col)."""
+
+        for row_offset in (-1, 0, 1):
+            for col_offset in (-1, 0, 1):
+                if row_offset or col_offset:
+                    neighbour_row = row + row_offset
+                    neighbour_col = col + col_offset
+
+                    # off the edge of a toroidal board is the opposite edge
+                    if self.boundary == 'toroidal':
+                        yield (neighbour_row % self.rows, neighbour_col % self.cols)
+                    elif 0 <= neighbour_row < self.rows and 0 <= neighbour_col < self.cols:
+                        yield (neighbour_row, neighbour_col)
+
+
+    def _total_surround_toroidal(self, row, col):
+        """Returns the total number of living cells surrounding the one at (row, col), wrapping at the edges."""
+        return sum(1 for position in self._neighbours(row, col) if self._is_alive(*position))
+
+
+    def _total_surround(self, row, col):
+        """Returns the total number of living cells surrounding the one at (row, col)."""
+
+        # the final row and col indices of the board
+        right_pos = self.cols - 1
+        bottom_pos = self.rows - 1
+        count = 0
+
+        # deal with the 4 corners
+        if row == 0 and col == 0:
+            if self._is_alive(0, 1):
+                count += 1
+            if self._is_alive(1, 1):
+                count += 1
+            if self._is_alive(1, 0):
+                count += 1
+        elif row == 0 and col == right_pos:
+            if self._is_alive(0, right_pos - 1):
+                count += 1
+            if self._is_alive(1, right_pos - 1):
+                count += 1
+            if self._is_alive(1, right_pos):
+                count += 1
+        elif row == bottom_pos and col == 0:
+            if self._is_alive(bottom_pos - 1, 0):
+                count += 1
+            if self._is_alive(bottom_pos - 1, 1):
+                count += 1
+            if self._is_alive(bottom_pos, 1):
+                count += 1            
+        elif row == bottom_pos and col == right_pos:
+            if self._is_alive(bottom_pos, right_pos - 1):
+                count += 1
+            if self._is_alive(bottom_pos - 1, right_pos - 1):
+                count += 1
+            if self._is_alive(bottom_pos - 1, right_pos):
+                count += 1
+        
+        # deal with the outer edges
+        elif row == 0:
+            if self._is_alive(0, col - 1):
+                count += 1
+            if self._is_alive(0, col + 1):
+                count += 1
+            if self._is_alive(1, col - 1):
+                count += 1
+            if self._is_alive(1, col + 1):
+                count += 1
+            if self._is_alive(1, col):
+                count += 1
+        elif row == bottom_pos:
+            if self._is_alive(bottom_pos, col - 1):
+                count += 1
+            if self._is_alive(bottom_pos, col + 1):
+                count += 1
+            if self._is_alive(bottom_pos - 1, col - 1):
+                count += 1
+            if self._is_alive(bottom_pos - 1, col + 1):
+                count += 1
+            if self._is_alive(bottom_pos - 1, col):
+                count += 1
+        elif col == 0:
+            if self._is_alive(row + 1, 0):
+                count += 1
+            if self._is_alive(row + 1, 1):
+                count += 1
+            if self._is_alive(row - 1, 0):
+                count += 1
+            if self._is_alive(row - 1, 1):
+                count += 1
+            if self._is_alive(row, 1):
+                count += 1            
+        elif col == right_pos:
+            if self._is_alive(row + 1, right_pos):
+                count += 1
+            if self._is_alive(row + 1, right_pos - 1):
+                count += 1
+            if self._is_alive(row - 1, right_pos):
+                count += 1
+            if self._is_alive(row - 1, right_pos - 1):
+                count += 1
+            if self._is_alive(row, right_pos - 1):
+                count += 1   
+    
+        # deal with the inner squares
+        else:
+            if self._is_alive(row - 1, col - 1):
+                count += 1
+            if self._is_alive(row - 1, col):
+                count += 1
+            if self._is_alive(row - 1, col + 1):
+                count += 1
+            if self._is_alive(row, col - 1):
+                count += 1
+            if self._is_alive(row, col + 1):
+                count += 1
+            if self._is_alive(row + 1, col - 1):
+                count += 1
+            if self._is_alive(row + 1, col):
+                count += 1
+            if self._is_alive(row + 1, col + 1):
+                count += 1
+
+        return count
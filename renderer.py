@@ -0,0 +1,151 @@
+"""Contains the Renderer class that draws the board to the screen."""
+import pygame, pygame.display, pygame.draw, pygame.rect
+
+class Renderer:
+    """
+    Draws the cells in the game's viewport by redrawing every living cell
+    and grid line in view each frame. Zoomed out to blocks of cells, each
+    block is shaded by how many of its cells are alive instead.
+    """
+
+    def __init__(self, game):
+        """Creates a Renderer drawing the board of a Game instance."""
+
+        # instance variables
+        self.game = game
+        self.settings = game.settings
+        self.screen = game.screen
+        self.profiler = game.profiler
+        self.viewport = game.viewport
+
+
+    def invalidate(self):
+        """Marks the whole screen as needing to be redrawn on the next frame."""
+        pass
+
+
+    def state_colors(self):
+        """Returns the colour of each cell state, indexed by state."""
+        return state_colors(self.game.engine.rule, self.settings)
+
+
+    def density_colors(self):
+        """Returns the colour of each density level of a block, from empty to full."""
+
+        levels = self.settings.density_levels
+        return [
+            tuple(round(dead + (alive - dead) * level / levels)
+                  for alive, dead in zip(self.settings.square_color, self.settings.bg_color))
+            for level in range(levels + 1)
+        ]
+
+
+    def density_level(self, population):
+        """Returns the density level of a block holding 'population' living cells, at least 1 when not empty."""
+
+        area = self.viewport.block * self.viewport.block
+        return -(-population * self.settings.density_levels // area)
+
+
+    def draw_frame(self):
+        """Draws the current generation and pushes it to the display."""
+
+        # fill background, then draw cells and borders on top of it
+        with self.profiler.phase('cells'):
+            self.screen.fill(self.settings.bg_color)
+            self.draw_cells()
+        with self.profiler.phase('borders'):
+            self.draw_borders()
+        with self.profiler.phase('flip'):
+            pygame.display.flip()
+
+
+    def draw_cells(self):
+        """Draws every cell in view that isn't dead to the screen."""
+
+        if self.viewport.block > 1:
+            self.draw_blocks()
+            return
+
+        colors = self.state_colors()
+        for row, col, state in self.game.engine.live_states_in(*self.viewport.visible_region()):
+            pygame.draw.rect(
+                self.screen,
+                colors[state],
+                self.viewport.square_rect(row, col),
+            )
+
+
+    def draw_blocks(self):
+        """Draws every block of cells in view that isn't empty, shaded by its density."""
+
+        colors = self.density_colors()
+        blocks = self.game.engine.block_populations(*self.viewport.visible_region(), self.viewport.block)
+        for row, col, population in blocks:
+            pygame.draw.rect(
+                self.screen,
+                colors[self.density_level(population)],
+                self.viewport.square_rect(row, col),
+            )
+
+
+    def draw_borders(self):
+        """Draws the grid lines between the cells, when they are big enough to have them."""
+
+        if self.viewport.show_borders():
+            self._draw_vertical_borders()
+            self._draw_horizontal_borders()
+
+
+    def _draw_vertical_borders(self):
+        """Draws the vertical borders on the screen."""  
+
+        # draws the vertical lines on the screen
+        for i in range(self.viewport.squares()[1]):
+            pygame.draw.rect(
+                self.screen,
+                self.settings.border_color,
+                pygame.Rect(
+                    self.viewport.square_size * i, 
+                    0, 
+                    1, 
+                    self.settings.screen_height
+                )
+            )
+
+
+    def _draw_horizontal_borders(self):
+        """Draws the horizontal borders on the screen."""
+
+        # draws the horizontal lines on the screen
+        for i in range(self.viewport.squares()[0]):
+            pygame.draw.rect(
+                self.screen,
+                self.settings.border_color,
+                pygame.Rect(
+                    0,
+                    self.viewport.square_size * i,
+                    self.settings.screen_width,
+                    1
+                )
+            )
+
+
+def state_colors(rule, settings):
+    """Returns the colour of each cell state of 'rule', indexed by state, as set in a Settings instance."""
+
+    bg_color = settings.bg_color
+
+    # each colour of a multi-colour rule has its own colour
+    if rule.colours > 1:
+        colors = settings.colour_rule_colors
+        return [bg_color] + [colors[i % len(colors)] for i in range(rule.colours)]
+
+    # the dying states of a Generations rule fade into the background
+    square_color = settings.square_color
+    fades = [
+        tuple(round(alive + (dead - alive) * (state - 1) / (rule.states - 1))
+              for alive, dead in zip(square_color, bg_color))
+        for state in range(2, rule.states)
+    ]
+    return [bg_color, square_color] + fades
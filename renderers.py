@@ -0,0 +1,20 @@
+"""Contains the registry of renderers that a Game can draw its board with."""
+import importlib
+
+# renderer name -> (module, class), imported only when the renderer is requested
+RENDERERS = {
+    'full': ('renderer', 'Renderer'),
+    'dirty': ('dirty_renderer', 'DirtyRenderer'),
+    'pixel': ('pixel_renderer', 'PixelRenderer'),
+}
+
+
+def create_renderer(name, game):
+    """Creates the renderer registered under 'name' for a Game instance."""
+
+    if name not in RENDERERS:
+        raise ValueError(f'Unknown renderer {name!r}, expected one of {sorted(RENDERERS)}')
+
+    module_name, class_name = RENDERERS[name]
+    renderer_class = getattr(importlib.import_module(module_name), class_name)
+    return renderer_class(game)
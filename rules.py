@@ -0,0 +1,131 @@
+"""
+Contains the rules cells follow from one generation to the next. Every
+rule is compiled into lookup tables indexed by a cell's state and its
+number of living neighbours, which the step engines use in place of
+branching on the rule.
+"""
+import re
+
+# a Life-like or Generations rulestring, in B/S/C or the numeric S/B/C form
+LETTER_RULE = re.compile(r'^B(\d*)/S(\d*)(?:/C?(\d+))?$', re.IGNORECASE)
+SWAPPED_LETTER_RULE = re.compile(r'^S(\d*)/B(\d*)(?:/C?(\d+))?$', re.IGNORECASE)
+NUMERIC_RULE = re.compile(r'^(\d*)/(\d*)(?:/(\d+))?$')
+
+
+class Rule:
+    """
+    A Life-like rule, or a Generations rule when it has more than two
+    states. State 0 is dead and state 1 is alive; in a Generations rule a
+    living cell that doesn't survive passes through the dying states 2 and
+    up before it is dead. Only cells in state 1 count as neighbours.
+    """
+
+    # a single colour of living cells
+    colours = 1
+
+    def __init__(self, birth, survival, states=2):
+        """Creates a rule from the neighbour counts that give birth and survival."""
+
+        # instance variables
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        self.states = states
+        if states < 2 or not self.birth.union(self.survival) <= set(range(9)):
+            raise ValueError(f'Invalid rule {self}')
+
+        # table[state][live neighbours] -> next state
+        self.table = [self._next_state(state) for state in range(states)]
+
+
+    def _next_state(self, state):
+        """Returns the row of the lookup table for cells in 'state'."""
+
+        if state == 0:
+            return [1 if count in self.birth else 0 for count in range(9)]
+        if state == 1:
+            dying = 2 if self.states > 2 else 0
+            return [1 if count in self.survival else dying for count in range(9)]
+
+        # dying cells age regardless of their neighbours
+        return [(state + 1) % self.states] * 9
+
+
+    def __str__(self):
+        """Returns the rule as a B/S (or B/S/C) rulestring."""
+
+        text = 'B{}/S{}'.format(''.join(map(str, sorted(self.birth))), ''.join(map(str, sorted(self.survival))))
+        if self.states > 2:
+            text += f'/C{self.states}'
+        return text
+
+
+class ColourRule:
+    """
+    A rule for living cells of several colours, each following its own
+    Life-like rule. State 0 is dead and state c is alive with colour c.
+    Every living neighbour counts, whatever its colour. A living cell
+    survives by the rule of its own colour, and a dead cell is born by the
+    rule of the most common colour among its neighbours, taking that colour.
+    """
+
+    def __init__(self, rules):
+        """Creates a rule from a list of Life-like rules, one per colour."""
+
+        if any(rule.states != 2 for rule in rules):
+            raise ValueError('Every colour must follow a two-state rule')
+
+        # instance variables
+        self.rules = list(rules)
+        self.colours = len(self.rules)
+        self.states = self.colours + 1
+
+        # table[colour][neighbours] -> next state of a living cell, and
+        # births[colour][neighbours] -> next state of a dead cell whose
+        # neighbours are mostly of that colour
+        self.table = [[0] * 9] + [
+            [colour if count in rule.survival else 0 for count in range(9)]
+            for colour, rule in enumerate(self.rules, start=1)
+        ]
+        self.births = [[0] * 9] + [
+            [colour if count in rule.birth else 0 for count in range(9)]
+            for colour, rule in enumerate(self.rules, start=1)
+        ]
+
+        # rules without B0 leave empty space empty, which some engines need
+        self.birth = frozenset().union(*(rule.birth for rule in self.rules))
+
+
+    def __str__(self):
+        """Returns the rule as rulestrings separated by ';'."""
+        return ';'.join(str(rule) for rule in self.rules)
+
+
+def parse_rule(text):
+    """
+    Parses a rulestring: Life-like ('B36/S23', or '23/36'), Generations
+    ('B2/S/C3', or '/2/3') or one Life-like rule per colour separated by
+    ';' ('B3/S23;B36/S23'). Raises ValueError if it isn't valid.
+    """
+
+    text = text.strip()
+    if ';' in text:
+        return ColourRule([parse_rule(part) for part in text.split(';')])
+
+    match = LETTER_RULE.match(text)
+    if match:
+        birth, survival, states = match.groups()
+    else:
+        match = SWAPPED_LETTER_RULE.match(text) or NUMERIC_RULE.match(text)
+        if not match:
+            raise ValueError(f'Invalid rule {text!r}')
+        survival, birth, states = match.groups()
+
+    return Rule(
+        (int(digit) for digit in birth),
+        (int(digit) for digit in survival),
+        int(states) if states else 2
+    )
+
+
+# Conway's Game of Life
+LIFE = parse_rule('B3/S23')
@@ -0,0 +1,104 @@
+"""Contains the Scheduler class that paces the main game loop."""
+import time
+
+class Scheduler:
+    """
+    Decides how many generations to run and whether to render on each pass
+    of the main game loop. Generations are run on a fixed timestep of
+    'evolution_speed' seconds, independent of the frame rate, and while the
+    simulation runs frames are capped at 'target_fps'. When the simulation
+    falls behind, frames are skipped rather than slowing it down. In turbo
+    mode generations run uncapped and only every 'turbo_render_every'th one
+    is rendered.
+    """
+
+    def __init__(self, settings):
+        """Creates a Scheduler paced by the given Settings."""
+
+        # instance variables
+        self.settings = settings
+        self.turbo = False
+        self.accumulator = 0.0
+        self.skipped_frames = 0
+        self.last_time = time.perf_counter()
+        self.frame_deadline = self.last_time + self._frame_time()
+
+
+    def _frame_time(self):
+        """Returns the number of seconds each frame may take."""
+        return 1 / self.settings.target_fps
+
+
+    def resume(self):
+        """Starts timing afresh, after the loop has been paused or asleep."""
+
+        self.accumulator = 0.0
+        self.skipped_frames = 0
+        self.last_time = time.perf_counter()
+        self.frame_deadline = self.last_time + self._frame_time()
+
+
+    def toggle_turbo(self):
+        """Switches turbo mode on or off."""
+
+        self.turbo = not self.turbo
+        self.accumulator = 0.0
+
+
+    def generations_due(self, running):
+        """Returns the number of generations to run on this pass of the loop."""
+
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+
+        # nothing builds up while the simulation is paused
+        if not running:
+            self.accumulator = 0.0
+            return 0
+
+        if self.turbo:
+            return self.settings.turbo_render_every
+
+        # run every whole timestep that has passed since the last pass
+        self.accumulator += elapsed
+        generations = int(self.accumulator / self.settings.evolution_speed)
+        if generations > self.settings.max_generations_per_frame:
+            # too far behind to catch up, so drop the backlog
+            generations = self.settings.max_generations_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= generations * self.settings.evolution_speed
+        return generations
+
+
+    def render_due(self):
+        """Returns True if this pass of the loop should render a frame."""
+
+        # skip the frame if its deadline has already passed, but never
+        # skip so many in a row that the display freezes
+        if (time.perf_counter() > self.frame_deadline and not self.turbo and
+                self.skipped_frames < self.settings.max_frame_skip):
+            self.skipped_frames += 1
+            return False
+
+        self.skipped_frames = 0
+        return True
+
+
+    def wait(self):
+        """Waits out the rest of the current frame."""
+
+        now = time.perf_counter()
+
+        # turbo mode never waits
+        if self.turbo:
+            self.frame_deadline = now + self._frame_time()
+            return
+
+        if self.frame_deadline > now:
+            time.sleep(self.frame_deadline - now)
+            self.frame_deadline += self._frame_time()
+        else:
+            # late, so start timing again from now
+            self.frame_deadline = now + self._frame_time()
@@ -1,11 +1,14 @@
 """Contains the Settings class to manage game settings."""
-import pygame, pygame.font
 
 COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0)
 COLOR_GRAY = (200, 200, 200)
 COLOR_DGRAY = (155, 155, 155)
 COLOR_ORANGE = (255, 164, 32)
+COLOR_BLUE = (32, 120, 255)
+COLOR_GREEN = (40, 180, 80)
+COLOR_RED = (220, 40, 40)
+COLOR_PURPLE = (150, 60, 200)
 
 class Settings:
     """Instance of the Settings class to manage game settings."""
@@ -22,19 +25,111 @@ class Settings:
         self.screen_height = 800
         self.bg_color = COLOR_WHITE
         self.border_color = COLOR_GRAY
+
+        # rendering settings
+        # name of the renderer, see renderers.RENDERERS
+        self.renderer = 'full'
+        # number of cells that may change, as a fraction of the living cells
+        # in view, before the dirty renderer redraws the whole frame instead
+        self.dirty_rect_limit = 0.25
         
         # square settings
         self.square_color = COLOR_ORANGE
         self.square_size = 10
+        # colours of the living cells of a multi-colour rule, in order
+        self.colour_rule_colors = [COLOR_ORANGE, COLOR_BLUE, COLOR_GREEN, COLOR_RED, COLOR_PURPLE]
+
+        # viewport settings
+        # square sizes in pixels zoomed between, along with square_size
+        self.zoom_square_sizes = [1, 2, 5, 10, 20, 40]
+        # most cells on a side shown as one square when zoomed out past the
+        # smallest square size, shaded in one of 'density_levels' by how
+        # many of them are alive
+        self.max_block = 64
+        self.density_levels = 8
 
         # game speed settings
-        self.evolution_speed = .001
+        # seconds between generations while the simulation runs
+        self.evolution_speed = .02
+        # frames drawn per second at most while the simulation runs
+        self.target_fps = 60
+        # most generations run in one frame before the backlog is dropped
+        self.max_generations_per_frame = 8
+        # watch for the board repeating itself, then 'pause' or just 'report'
+        self.detect_cycles = True
+        self.on_cycle = 'pause'
+        # generations remembered, which is the longest period that is found
+        self.cycle_history = 1000
+        # bytes of past generations kept to rewind through, 0 for none
+        self.history_budget = 64 * 1024 * 1024
+        # generations between whole boards stored in the history
+        self.history_keyframe_interval = 100
+        # most frames skipped in a row when the simulation falls behind
+        self.max_frame_skip = 5
+        # generations run per rendered frame in turbo mode
+        self.turbo_render_every = 10
+
+        # simulation settings
+        # rulestring the cells follow, see rules.parse_rule
+        self.rule = 'B3/S23'
+        # 'clipped', 'toroidal' or 'unbounded', None for the engine's default
+        self.boundary = None
+        # (cols, rows) of the universe, None to fit the window at square_size
+        self.universe_size = None
+        # name of the step engine, see engines.ENGINES
+        self.engine = 'numpy'
+        # fraction of the board active before the frontier engine sweeps it all
+        self.frontier_sweep_fraction = 0.25
+        # results memoized by the hashlife engine before its caches are flushed
+        self.hashlife_cache_size = 1000000
+        # worker processes of the parallel engine, None for one per CPU
+        self.workers = None
+        # where the tile engine keeps the transition table of each rule
+        # between runs, None to build it every run
+        self.tile_table_dir = '.tile_tables'
+
+        # file the board is saved to and loaded from with 's' and 'l'
+        self.snapshot_path = 'board.snap'
+
+        # recording settings
+        # directory the frames recorded with 'v' are written to as PNG
+        # files, or '-' to write them to stdout as raw RGB
+        self.record_path = 'frames'
+        # most frames waiting to be written before new ones are dropped
+        self.record_queue_size = 64
+
+        # input settings
+        # file every input is logged to from the start, to be replayed with
+        # --replay, None for none
+        self.input_log_path = None
+
+        # statistics settings
+        # follow the population from the start, and export it on exit
+        self.statistics = False
+        # file the population statistics are exported to with 'x', as JSON
+        # along with the censuses if it ends in .json and CSV otherwise
+        self.statistics_export_path = 'statistics.csv'
+        # generations kept for export
+        self.statistics_history = 100000
+        # generations between censuses of the objects on the board, 0 for none
+        self.census_interval = 0
+
+        # profiling settings
+        # record samples from the start, and export them on exit
+        self.profiling = False
+        self.profile_export_path = 'profile.csv'
+        # frames in the rolling window of the overlay, and frames kept for export
+        self.profile_window = 300
+        self.profile_history = 100000
+        self.profile_font_size = 16
+        self.profile_text_color = COLOR_WHITE
+        self.profile_bg_color = COLOR_BLACK
 
         # menu settings
         self.menu_size = 5/6
         self.menu_color = COLOR_DGRAY
+        # falls back to pygame's own font when it isn't installed
         self.font = 'optima'
-
-        # test for the font
-        if self.font not in pygame.font.get_fonts():
-            self.font = None
\ No newline at end of file
+        # where the file found for the font is kept between runs, None to
+        # search the system fonts every run
+        self.font_cache_path = '.font_cache.json'
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Saves and loads binary snapshots of the board. A snapshot is a fixed
+header followed by the rows of the board packed one bit per cell, and is
+memory-mapped when loaded so the rows go straight into the engine.
+"""
+import mmap, struct
+
+# magic, rows, cols, generation
+HEADER = struct.Struct('<8sIIQ')
+MAGIC = b'GOLSNAP1'
+EXTENSION = '.snap'
+
+
+def save_snapshot(path, engine):
+    """Writes the board held by 'engine' to a snapshot file at 'path'."""
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, engine.rows, engine.cols, engine.generation))
+        for row in engine.packed_rows():
+            file.write(row)
+
+
+def read_header(path):
+    """Returns the (rows, cols, generation) stored in the snapshot file at 'path'."""
+
+    with open(path, 'rb') as file:
+        data = file.read(HEADER.size)
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{path} is not a snapshot file')
+    return HEADER.unpack(data)[1:]
+
+
+def load_snapshot(path, engine):
+    """
+    Loads the snapshot file at 'path' into the board held by 'engine',
+    which must have the same number of rows and columns.
+    """
+
+    rows, cols, generation = read_header(path)
+    if (rows, cols) != (engine.rows, engine.cols):
+        raise ValueError(f'{path} holds a {cols}x{rows} board, not {engine.cols}x{engine.rows}')
+
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if len(mapped) < HEADER.size + rows * ((cols + 7) // 8):
+            raise ValueError(f'{path} is truncated')
+        with memoryview(mapped) as view, view[HEADER.size:] as rows_view:
+            engine.load_packed(rows_view)
+    engine.generation = generation
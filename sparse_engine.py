@@ -0,0 +1,166 @@
+"""Contains the SparseEngine class, a step engine that only holds living cells."""
+import collections
+from engine import Engine
+
+# the offsets of the eight neighbours of a cell
+NEIGHBOURS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class SparseEngine(Engine):
+    """
+    Step engine that holds only the set of living cells and counts the
+    neighbours around them, so its cost follows the population rather than
+    the size of the board. By default the universe is unbounded and the
+    board is only a window onto it; on a clipped or a toroidal board, cells
+    past the edges are dropped or wrapped around instead. Supports
+    two-state rules without B0.
+    """
+
+    BOUNDARIES = ('unbounded', 'clipped', 'toroidal')
+
+    def __init__(self, rows, cols, rule=None, boundary=None):
+        """Creates an empty board with the given number of rows and columns."""
+
+        super().__init__(rows, cols, rule, boundary)
+        self._require_two_states()
+        self._require_no_b0()
+
+        # the (row, col) of every living cell
+        self.cells = set()
+        self.previous = None
+
+        # whether a dead or a living cell is alive next, by neighbour count
+        self._born = tuple(self.rule.table[0])
+        self._survives = tuple(self.rule.table[1])
+
+
+    def _in_window(self, row, col):
+        """Returns True if (row, col) lies on the board."""
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+
+    def is_alive(self, row, col):
+        """Returns True if the cell at (row, col) is alive."""
+        return (row, col) in self.cells
+
+
+    def set_alive(self, row, col, alive):
+        """Sets the cell at (row, col) to be alive or dead."""
+
+        if alive:
+            self.cells.add((row, col))
+        else:
+            self.cells.discard((row, col))
+
+
+    def set_alive_many(self, positions, alive):
+        """Sets every cell in an iterable of (row, col) positions to be alive or dead."""
+
+        if alive:
+            self.cells.update(positions)
+        else:
+            self.cells.difference_update(positions)
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        cells = self.cells
+
+        # count the living neighbours of every cell next to a living one
+        if self.boundary == 'toroidal':
+            rows, cols = self.rows, self.cols
+            counts = collections.Counter(
+                ((row + row_offset) % rows, (col + col_offset) % cols)
+                for row, col in cells for row_offset, col_offset in NEIGHBOURS
+            )
+        else:
+            counts = collections.Counter(
+                (row + row_offset, col + col_offset)
+                for row, col in cells for row_offset, col_offset in NEIGHBOURS
+            )
+
+        # look the next state of each counted cell up in the rule; living
+        # cells with no living neighbours were never counted
+        born = self._born
+        survives = self._survives
+        next_cells = {
+            cell for cell, count in counts.items()
+            if (survives[count] if cell in cells else born[count])
+        }
+        if survives[0]:
+            next_cells.update(cell for cell in cells if cell not in counts)
+
+        # nothing lives past the edges of a clipped board
+        if self.boundary == 'clipped':
+            next_cells = {cell for cell in next_cells if self._in_window(*cell)}
+
+        self.previous = cells
+        self.cells = next_cells
+        self.generation += 1
+
+
+    def changed_cells(self):
+        """Returns the (row, col) positions of the cells on the board that the last step changed."""
+
+        if self.previous is None:
+            return []
+        return [cell for cell in self.previous ^ self.cells if self._in_window(*cell)]
+
+
+    def changed_states(self):
+        """
+        Returns the rows, the cols and the new states of the cells on the
+        board that the last step changed, as three lists.
+        """
+
+        if self.previous is None:
+            return ([], [], [])
+        born = [cell for cell in self.cells - self.previous if self._in_window(*cell)]
+        died = [cell for cell in self.previous - self.cells if self._in_window(*cell)]
+        cells = born + died
+        return ([row for row, _ in cells], [col for _, col in cells], [1] * len(born) + [0] * len(died))
+
+
+    def clear(self):
+        """Resets all cells to 'dead'."""
+        self.cells = set()
+
+
+    def universe_states(self):
+        """Yields the (row, col, state) of every living cell, on the board or off it."""
+        return ((row, col, 1) for row, col in self.cells)
+
+
+    def live_cells(self):
+        """Yields the (row, col) position of every living cell on the board."""
+        return (cell for cell in self.cells if self._in_window(*cell))
+
+
+    def live_states_in(self, top, left, height, width):
+        """
+        Yields the (row, col, state) of every living cell in the 'height' x
+        'width' window whose top left cell is (top, left), which may lie
+        anywhere in an unbounded universe.
+        """
+
+        # look at each cell of a window smaller than the population, or
+        # filter every living cell
+        cells = self.cells
+        if height * width < len(cells):
+            for row in range(top, top + height):
+                for col in range(left, left + width):
+                    if (row, col) in cells:
+                        yield (row, col, 1)
+        else:
+            for row, col in cells:
+                if top <= row < top + height and left <= col < left + width:
+                    yield (row, col, 1)
+
+
+    def population(self):
+        """Returns the number of living cells on the board."""
+
+        if self.boundary == 'unbounded':
+            return sum(1 for _ in self.live_cells())
+        return len(self.cells)
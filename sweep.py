@@ -0,0 +1,232 @@
+"""
+Runs random soups over every combination of the board sizes, densities,
+seeds and rules in a JSON sweep spec, spread over a pool of processes, and
+streams the outcome of each run to a JSONL or CSV file as it finishes.
+
+    python sweep.py spec.json --output results.jsonl
+    python sweep.py spec.json --output results.csv --workers 8
+
+A spec names lists of values to sweep, any of which may be left out:
+
+    {
+        "sizes": ["64x64", "128x128"],
+        "densities": [0.2, 0.35, 0.5],
+        "seeds": 100,
+        "rules": ["B3/S23", "B36/S23"],
+        "boundaries": ["clipped", "toroidal"],
+        "engine": "numpy",
+        "max_generations": 5000,
+        "cycle_history": 1000
+    }
+
+"seeds" is either a list of seeds, or a number n standing for 0 to n - 1.
+Every run is seeded from its own seed alone, so any row of the results is
+reproduced by running its parameters again.
+"""
+import argparse, csv, itertools, json, multiprocessing, os, sys, time
+
+# keep pygame's greeting, imported along with parse_size, off stdout
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from engines import ENGINES, create_engine
+from cycle_detector import CycleDetector
+from headless import parse_size
+from rules import parse_rule
+import patterns
+
+# spec key -> default value
+SPEC_DEFAULTS = {
+    'sizes': ['120x80'],
+    'densities': [0.35],
+    'seeds': 10,
+    'rules': ['B3/S23'],
+    'boundaries': [None],
+    'engine': 'numpy',
+    'max_generations': 5000,
+    'cycle_history': 1000,
+}
+
+# the columns of the results, in order
+FIELDS = [
+    'size', 'density', 'seed', 'rule', 'boundary', 'engine', 'generations',
+    'final_population', 'peak_population', 'stabilized_at', 'period', 'seconds',
+]
+
+
+def load_spec(path):
+    """Returns the sweep spec in the JSON file at 'path', with the defaults filled in."""
+
+    with open(path) as file:
+        spec = json.load(file)
+
+    unknown = set(spec) - set(SPEC_DEFAULTS)
+    if unknown:
+        raise ValueError(f'Unknown sweep spec keys {sorted(unknown)}, expected some of {sorted(SPEC_DEFAULTS)}')
+    if spec.get('engine', SPEC_DEFAULTS['engine']) not in ENGINES:
+        raise ValueError(f"Unknown engine {spec['engine']!r}, expected one of {sorted(ENGINES)}")
+    return {**SPEC_DEFAULTS, **spec}
+
+
+def expand_runs(spec):
+    """Returns the parameters of every run in a sweep spec, as a list of dicts."""
+
+    seeds = spec['seeds']
+    if isinstance(seeds, int):
+        seeds = range(seeds)
+
+    # check every size and rule before anything is run
+    for size in spec['sizes']:
+        parse_size(size)
+    for rule in spec['rules']:
+        parse_rule(rule)
+
+    return [
+        {
+            'size': size,
+            'density': density,
+            'seed': seed,
+            'rule': rule,
+            'boundary': boundary,
+            'engine': spec['engine'],
+            'max_generations': spec['max_generations'],
+            'cycle_history': spec['cycle_history'],
+        }
+        for size, density, rule, boundary, seed in itertools.product(
+            spec['sizes'], spec['densities'], spec['rules'], spec['boundaries'], seeds)
+    ]
+
+
+def run_soup(run):
+    """
+    Runs one random soup until it settles into a cycle or reaches
+    max_generations, and returns the parameters of the run together with
+    its outcome.
+    """
+
+    start = time.perf_counter()
+    cols, rows = parse_size(run['size'])
+    engine = create_engine(run['engine'], rows, cols, rule=parse_rule(run['rule']), boundary=run['boundary'])
+    try:
+        engine.set_alive_many(patterns.random_soup(rows, cols, run['density'], seed=run['seed']), True)
+
+        detector = CycleDetector(run['cycle_history'])
+        detector.reset(engine)
+        peak = engine.population()
+        while engine.generation < run['max_generations']:
+            engine.step()
+            peak = max(peak, engine.population())
+            if detector.update(engine):
+                if _confirm_cycle(engine, detector.period):
+                    break
+                # the hashes of two different boards met, which says
+                # nothing about the board cycling
+                detector.reset(engine)
+
+        return {
+            'size': run['size'],
+            'density': run['density'],
+            'seed': run['seed'],
+            'rule': run['rule'],
+            'boundary': engine.boundary,
+            'engine': run['engine'],
+            'generations': engine.generation,
+            'final_population': engine.population(),
+            'peak_population': peak,
+            'stabilized_at': detector.generation,
+            'period': detector.period,
+            'seconds': time.perf_counter() - start,
+        }
+    finally:
+        engine.close()
+
+
+def _confirm_cycle(engine, period):
+    """
+    Steps a board the cycle detector found to be cycling through one more
+    period, and returns True if its whole universe came back as it was.
+    """
+
+    before = set(engine.universe_states())
+    engine.advance(period)
+    return set(engine.universe_states()) == before
+
+
+class _Sink:
+    """Writes results to a file as they arrive, as CSV if its name ends in .csv and JSONL otherwise."""
+
+    def __init__(self, path):
+        """Opens the file at 'path', or stdout if it is '-'."""
+
+        # instance variables
+        self.file = sys.stdout if path == '-' else open(path, 'w', newline='')
+        self.writer = None
+        if path.endswith('.csv'):
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.writer.writeheader()
+
+
+    def write(self, result):
+        """Writes one result, flushed so that it can be read while the sweep goes on."""
+
+        if self.writer:
+            self.writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + '\n')
+        self.file.flush()
+
+
+    def close(self):
+        """Closes the file unless it is stdout."""
+
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def run_sweep(runs, output, workers=None):
+    """
+    Runs every run over a pool of 'workers' processes (one per CPU by
+    default), writing each result to 'output' as it finishes. Returns the
+    number of runs.
+    """
+
+    sink = _Sink(output)
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for done, result in enumerate(pool.imap_unordered(run_soup, runs), 1):
+                sink.write(result)
+                print(f'\r{done}/{len(runs)} runs', end='', file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+    finally:
+        sink.close()
+    return len(runs)
+
+
+def parse_args(argv=None):
+    """Parses the command line arguments of the sweep."""
+
+    parser = argparse.ArgumentParser(description='Sweep random soups of the New Game of Life')
+    parser.add_argument('spec',
+        help='JSON file giving the sizes, densities, seeds and rules to sweep')
+    parser.add_argument('--output', default='sweep.jsonl',
+        help='file the results are streamed to, as CSV if it ends in .csv and JSONL otherwise, - for stdout')
+    parser.add_argument('--workers', type=int,
+        help='worker processes, one per CPU by default')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the sweep described by the command line."""
+
+    args = parse_args(argv)
+    try:
+        runs = expand_runs(load_spec(args.spec))
+    except (OSError, ValueError) as error:
+        sys.exit(f'Invalid sweep spec: {error}')
+    start = time.perf_counter()
+    run_sweep(runs, args.output, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f'{len(runs)} runs in {elapsed:.1f}s ({len(runs) / elapsed * 3600:.0f} runs/hour)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
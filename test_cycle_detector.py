@@ -0,0 +1,97 @@
+"""Contains the tests of the CycleDetector class."""
+import numpy as np
+import pytest
+import patterns
+from cycle_detector import CycleDetector, zobrist_key, zobrist_keys
+from engines import create_engine
+
+# a glider heading up and to the left, towards negative rows and columns
+NORTH_WEST_GLIDER = [(0, 0), (0, 1), (0, 2), (1, 0), (2, 1)]
+BLINKER = [(5, 4), (5, 5), (5, 6)]
+BLOCK = [(2, 2), (2, 3), (3, 2), (3, 3)]
+
+
+def run_detector(engine, cells, generations):
+    """Steps a board seeded with 'cells', returning the (period, generation) of the first cycle found, or None."""
+
+    engine.set_alive_many(cells, True)
+    detector = CycleDetector()
+    detector.reset(engine)
+    for _ in range(generations):
+        engine.step()
+        if detector.update(engine):
+            return detector.period, detector.generation
+    return None
+
+
+def test_keys_differ_at_negative_coordinates():
+    """Cells off the top left of the board all have keys of their own."""
+
+    positions = [(row, col) for row in range(-3, 3) for col in range(-3, 3)]
+    keys = {zobrist_key(row, col) for row, col in positions}
+    keys.update(zobrist_key(row, col, 2) for row, col in positions)
+    assert len(keys) == 2 * len(positions)
+
+
+def test_array_keys_match_cell_keys():
+    """The keys computed in NumPy are those of zobrist_key, negative coordinates included."""
+
+    rows, cols = np.indices((6, 6)) - 3
+    states = np.arange(36).reshape(6, 6) % 3 + 1
+    expected = [zobrist_key(row, col, state) for row, col, state in zip(rows.ravel().tolist(), cols.ravel().tolist(), states.ravel().tolist())]
+    assert zobrist_keys(rows, cols, states).ravel().tolist() == expected
+
+
+@pytest.mark.parametrize('name', ['numpy', 'parallel', 'bit'])
+def test_hash_follows_the_board(name):
+    """The hash kept up to date from each step's changes is the hash of the whole board."""
+
+    engine = create_engine(name, 24, 32, boundary='toroidal')
+    try:
+        engine.set_alive_many(patterns.random_soup(24, 32, 0.4, seed=7), True)
+        detector = CycleDetector()
+        detector.reset(engine)
+        for _ in range(10):
+            engine.step()
+            detector.update(engine)
+
+        board_hash = 0
+        for row, col, state in engine.universe_states():
+            board_hash ^= zobrist_key(row, col, state)
+        assert detector.hash == board_hash
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('name', ['sparse', 'hashlife'])
+def test_glider_crossing_negative_coordinates_never_cycles(name):
+    """A glider flying off the board of an unbounded universe never repeats."""
+
+    engine = create_engine(name, 20, 20, boundary='unbounded')
+    try:
+        offset = [(row + 10, col + 10) for row, col in NORTH_WEST_GLIDER]
+        assert run_detector(engine, offset, 200) is None
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('name', ['numpy', 'bit', 'sparse', 'hashlife'])
+@pytest.mark.parametrize('cells, period', [(BLOCK, 1), (BLINKER, 2)])
+def test_oscillators_are_found(name, cells, period):
+    """Still lifes and oscillators are found with their period from the first generation."""
+
+    engine = create_engine(name, 12, 12)
+    try:
+        assert run_detector(engine, cells, 10) == (period, 0)
+    finally:
+        engine.close()
+
+
+def test_glider_on_toroidal_board_cycles():
+    """A glider wraps round a toroidal board back to where it started."""
+
+    engine = create_engine('numpy', 8, 8, boundary='toroidal')
+    try:
+        assert run_detector(engine, NORTH_WEST_GLIDER, 100) == (32, 0)
+    finally:
+        engine.close()
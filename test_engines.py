@@ -0,0 +1,171 @@
+"""Contains the tests that check every step engine against the reference engine."""
+import random
+import pytest
+import patterns, snapshot
+from engines import ENGINES, create_engine
+from history import History
+from reference_engine import ReferenceEngine
+from rules import parse_rule
+
+# rules of every kind an engine may support: Life-like, with B0,
+# Generations and multi-colour
+RULES = ['B3/S23', 'B36/S23', 'B0/S8', 'B2/S/C3', 'B3/S23;B36/S23']
+
+# board sizes, odd and even, down to the smallest the reference engine steps
+SIZES = [(2, 2), (7, 11), (16, 24)]
+
+GENERATIONS = 8
+
+
+def make_engine(name, rows, cols, tmp_path, rule=None, boundary=None):
+    """Creates the engine 'name', skipping the test if it doesn't support the rule or the boundary."""
+
+    options = {'table_dir': str(tmp_path)} if name == 'tile' else {}
+    try:
+        return create_engine(name, rows, cols, rule=rule, boundary=boundary, **options)
+    except ValueError as error:
+        pytest.skip(str(error))
+
+
+def seed(engines, rows, cols, rule, seed_value, density=0.4, offset=(0, 0)):
+    """Sets the same random states on the boards of every engine in 'engines'."""
+
+    rng = random.Random(seed_value)
+    by_state = {}
+    for row in range(rows):
+        for col in range(cols):
+            if rng.random() < density:
+                position = (row + offset[0], col + offset[1])
+                by_state.setdefault(rng.randrange(1, rule.states), []).append(position)
+
+    for engine in engines:
+        for state, positions in by_state.items():
+            engine.set_state_many(positions, state)
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('rule_text', RULES)
+@pytest.mark.parametrize('boundary', ['clipped', 'toroidal'])
+@pytest.mark.parametrize('name', sorted(set(ENGINES) - {'reference'}))
+def test_engine_matches_reference(name, boundary, rule_text, size, tmp_path):
+    """Every engine steps a random board to the same states as the reference engine."""
+
+    rows, cols = size
+    rule = parse_rule(rule_text)
+    engine = make_engine(name, rows, cols, tmp_path, rule, boundary)
+    try:
+        reference = ReferenceEngine(rows, cols, rule, boundary)
+        seed([engine, reference], rows, cols, rule, f'{rule_text} {rows}x{cols}')
+
+        for _ in range(GENERATIONS):
+            engine.step()
+            reference.step()
+            assert sorted(engine.live_states()) == sorted(reference.live_states())
+            assert engine.generation == reference.generation
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('name', sorted(set(ENGINES) - {'reference'}))
+def test_unbounded_engine_matches_reference(name, tmp_path):
+    """
+    An unbounded engine grows a random patch past the edges of its board as
+    the reference engine does on a board too big for the patch to reach.
+    """
+
+    rule = parse_rule('B3/S23')
+    margin = GENERATIONS + 2
+    engine = make_engine(name, 6, 6, tmp_path, rule, 'unbounded')
+    try:
+        reference = ReferenceEngine(6 + 2 * margin, 6 + 2 * margin, rule)
+        seed([engine], 6, 6, rule, 1)
+        seed([reference], 6, 6, rule, 1, offset=(margin, margin))
+
+        for _ in range(GENERATIONS):
+            engine.step()
+            reference.step()
+            shifted = sorted((row + margin, col + margin, state) for row, col, state in engine.universe_states())
+            assert shifted == sorted(reference.live_states())
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_packed_board(name, tmp_path):
+    """Every engine packs its board into the same bytes as the reference engine, row by row or at once."""
+
+    rule = parse_rule('B3/S23')
+    engine = make_engine(name, 7, 11, tmp_path, rule, 'toroidal')
+    try:
+        reference = ReferenceEngine(7, 11, rule, 'toroidal')
+        seed([engine, reference], 7, 11, rule, 'packed')
+        expected = b''.join(reference.packed_rows())
+        assert b''.join(engine.packed_rows()) == engine.packed_board() == expected
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('extension', ['.cells', '.rle', '.lif'])
+def test_pattern_round_trip(extension, tmp_path):
+    """A board saved as a pattern loads back with the same living cells."""
+
+    engine = ReferenceEngine(9, 14)
+    patterns.place_cells(engine, patterns.random_soup(9, 14, 0.3, seed=3), center=False)
+    path = str(tmp_path / f'board{extension}')
+    patterns.save_pattern(path, engine)
+
+    loaded = ReferenceEngine(9, 14)
+    patterns.load_pattern(path, loaded, center=False)
+    assert sorted(loaded.live_cells()) == sorted(engine.live_cells())
+
+
+@pytest.mark.parametrize('name', ['reference', 'numpy', 'bit', 'sparse'])
+def test_snapshot_round_trip(name, tmp_path):
+    """A board saved as a snapshot loads back into any engine with the same cells and generation."""
+
+    engine = make_engine(name, 11, 13, tmp_path)
+    try:
+        patterns.place_cells(engine, patterns.random_soup(11, 13, 0.3, seed=4), center=False)
+        engine.step()
+        path = str(tmp_path / 'board.snap')
+        snapshot.save_snapshot(path, engine)
+
+        loaded = ReferenceEngine(11, 13)
+        snapshot.load_snapshot(path, loaded)
+        assert sorted(loaded.live_cells()) == sorted(engine.live_cells())
+        assert loaded.generation == engine.generation
+
+        with pytest.raises(ValueError):
+            snapshot.load_snapshot(path, ReferenceEngine(13, 11))
+    finally:
+        engine.close()
+
+
+@pytest.mark.parametrize('rule_text', ['B3/S23', 'B2/S/C3'])
+def test_history_restore(rule_text, tmp_path):
+    """Every generation the history retains is restored exactly, across keyframes and deltas."""
+
+    rule = parse_rule(rule_text)
+    engine = make_engine('numpy', 12, 12, tmp_path, rule)
+    seed([engine], 12, 12, rule, 5)
+    history = History(budget=1 << 20, keyframe_interval=4)
+    history.reset(engine)
+
+    boards = {engine.generation: sorted(engine.live_states())}
+    for _ in range(3 * GENERATIONS):
+        engine.step()
+        history.record(engine)
+        boards[engine.generation] = sorted(engine.live_states())
+
+    for generation in random.Random(6).sample(sorted(boards), len(boards)):
+        assert history.restore(engine, generation)
+        assert engine.generation == generation
+        assert sorted(engine.live_states()) == boards[generation]
+
+    # going back then stepping on forgets the generations after it
+    history.restore(engine, 5)
+    engine.step()
+    history.record(engine)
+    assert history.retains(6)
+    assert not history.retains(7)
+    assert not history.restore(engine, 7)
@@ -0,0 +1,38 @@
+"""Contains the tests of the PopulationTracker class."""
+import pytest
+from engines import create_engine
+from population_tracker import PopulationTracker
+from rules import parse_rule
+
+BLINKER = [(1, 1), (1, 2), (1, 3)]
+BLOCK = [(6, 6), (6, 7), (7, 6), (7, 7)]
+
+
+def track(rule_text, cells, generations, census_interval):
+    """Steps a numpy board seeded with 'cells' under a rule, returning the tracker that followed it."""
+
+    engine = create_engine('numpy', 10, 10, rule=parse_rule(rule_text))
+    engine.set_alive_many(cells, True)
+    tracker = PopulationTracker(census_interval=census_interval)
+    tracker.reset(engine)
+    for _ in range(generations):
+        engine.step()
+        tracker.update(engine)
+    return tracker
+
+
+def test_census_names_objects():
+    """A census under Conway's rule counts each object by its name."""
+
+    tracker = track('B3/S23', BLINKER + BLOCK, 4, 2)
+    assert [census['generation'] for census in tracker.censuses] == [0, 2, 4]
+    assert all(census['objects'] == {'blinker': 1, 'block': 1} for census in tracker.censuses)
+
+
+@pytest.mark.parametrize('rule_text', ['B2/S/C3', 'B3/S23;B36/S23'])
+def test_census_skipped_for_more_states(rule_text):
+    """Under a rule with more than two states the population is followed, but no census is taken."""
+
+    tracker = track(rule_text, BLINKER + BLOCK, 4, 2)
+    assert not tracker.censuses
+    assert [sample['generation'] for sample in tracker.samples] == [0, 1, 2, 3, 4]
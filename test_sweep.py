@@ -0,0 +1,54 @@
+"""Contains the tests of the sweep runner."""
+import pytest
+import sweep
+from engines import create_engine
+from rules import parse_rule
+
+
+def make_run(**overrides):
+    """Returns the parameters of a single sweep run, with 'overrides' replacing the defaults."""
+
+    run = {
+        'size': '32x32', 'density': 0.35, 'seed': 0, 'rule': 'B3/S23', 'boundary': None,
+        'engine': 'numpy', 'max_generations': 1000, 'cycle_history': 1000,
+    }
+    run.update(overrides)
+    return run
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'sparse'])
+def test_block_is_a_still_life(engine):
+    """A full 2x2 board is a block, which is stable from the start."""
+
+    result = sweep.run_soup(make_run(size='2x2', density=1.0, engine=engine))
+    assert (result['stabilized_at'], result['period']) == (0, 1)
+    assert result['final_population'] == result['peak_population'] == 4
+
+
+def test_blinker_oscillates_past_the_board(monkeypatch):
+    """A blinker along the top of the board of an unbounded universe has its other phase partly off it."""
+
+    monkeypatch.setattr(sweep.patterns, 'random_soup', lambda rows, cols, density, seed=0: [(0, 0), (0, 1), (0, 2)])
+    result = sweep.run_soup(make_run(size='3x2', engine='sparse', boundary='unbounded'))
+    assert (result['stabilized_at'], result['period']) == (0, 2)
+
+
+@pytest.mark.parametrize('engine, boundary', [('sparse', 'unbounded'), ('hashlife', 'unbounded'), ('numpy', 'toroidal')])
+@pytest.mark.parametrize('seed', [0, 2, 4])
+def test_reported_cycles_repeat(engine, boundary, seed):
+    """The universe at the generation a run settled at comes back one period later."""
+
+    # soups of these seeds settle without sending gliders off
+    run = make_run(size='16x16', seed=seed, engine=engine, boundary=boundary)
+    result = sweep.run_soup(run)
+    assert result['period'] is not None
+
+    board = create_engine(engine, 16, 16, rule=parse_rule(run['rule']), boundary=boundary)
+    try:
+        board.set_alive_many(sweep.patterns.random_soup(16, 16, run['density'], seed=seed), True)
+        board.advance(result['stabilized_at'])
+        settled = set(board.universe_states())
+        board.advance(result['period'])
+        assert set(board.universe_states()) == settled
+    finally:
+        board.close()
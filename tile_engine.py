@@ -0,0 +1,259 @@
+"""Contains the TileEngine class, a step engine that looks whole tiles of cells up in a table."""
+import mmap, os, sys
+from bit_engine import BitEngine
+
+# directory the transition tables are kept in between runs
+TABLE_DIR = '.tile_tables'
+
+# the number of entries in a table, one per 4x4 block of cells, where the
+# cell at (row, col) of the block is bit row * 4 + col of its index
+TABLE_SIZE = 1 << 16
+
+# the (row, col) in the block of each cell of its 2x2 centre, in the order
+# of the bits of a table entry
+CENTRE_CELLS = ((1, 1), (1, 2), (2, 1), (2, 2))
+
+# byte translations that spread the 4 pairs of cells in a byte out to a
+# byte each, and that split a table entry into the top and bottom row of
+# its tile
+SPREAD_TABLES = [bytes((byte >> (2 * pair)) & 3 for byte in range(256)) for pair in range(4)]
+TOP_TABLE = bytes(entry & 3 for entry in range(256))
+BOTTOM_TABLE = bytes((entry >> 2) & 3 for entry in range(256))
+
+# rows of tiles with fewer than 1 living cell around every SPARSE_RATIO
+# tiles are looked up one tile at a time rather than all at once
+SPARSE_RATIO = 8
+
+# the offsets of the low and high byte within a native 16 bit word
+INDEX_OFFSETS = (0, 1) if sys.byteorder == 'little' else (1, 0)
+
+
+class TileEngine(BitEngine):
+    """
+    Step engine that splits the board into 2x2 tiles and finds the next
+    generation of each tile at once, by looking the 4x4 block of cells
+    around it up in a table of every possible block. Rows are packed into
+    integers as by the BitEngine. The tiles of a busy row are looked up all
+    at once, their blocks cut out by byte translations, and those of a
+    quiet row one at a time, jumping over the tiles with no living cell
+    around them, so that empty stretches of the board cost next to nothing.
+    The table is built once per rule and kept in
+    'table_dir' (if given), from which later runs memory-map it rather than
+    build it again. Supports two-state rules, on a clipped or a toroidal
+    board.
+    """
+
+    def __init__(self, rows, cols, table_dir=TABLE_DIR, rule=None, boundary=None):
+        """Creates an empty board with the given number of rows and columns."""
+
+        super().__init__(rows, cols, rule, boundary)
+        self.table_dir = table_dir
+        self._tiles = load_table(self.rule, table_dir)
+
+        # rows are widened by a column on either side, which holds a dead
+        # cell or, on a toroidal board, the opposite edge, as does the column
+        # padding out an odd number of columns to whole tiles
+        self._width = cols + cols % 2
+        self._tile_cols = self._width // 2
+        self._wide_mask = (1 << (self._width + 2)) - 1
+        self._wide_bytes = (self._width + 2 + 7) // 8
+
+        # the 4 rows of the blocks around each row of tiles, where the rows
+        # beyond the edges are the opposite edge on a toroidal board, and
+        # otherwise a dead row kept after the last
+        self._around = [
+            [row % rows if self.boundary == 'toroidal' else (row if 0 <= row < rows else rows)
+             for row in range(top - 1, top + 3)]
+            for top in range(0, rows, 2)
+        ]
+
+        # under a B0 rule, tiles with no living cell around them come to
+        # life too, so none can be skipped
+        self._unskipped = self._wide_mask if self._tiles[0] else 0
+
+
+    def _widen(self, bits):
+        """Returns a row with the columns on either side of it, so that column c is bit c + 1."""
+
+        if self.boundary == 'toroidal':
+            return ((bits << 1) | (bits >> (self.cols - 1)) | (bits << (self.cols + 1))) & self._wide_mask
+        return bits << 1
+
+
+    def _nibbles(self, wide):
+        """
+        Returns a widened row as an integer holding, in byte j, the 4 cells
+        across the block around the tile in column j: the tile's own 2
+        cells and the cell on either side.
+        """
+
+        # spread the row out to a byte for each 2 cells, then add the next
+        # 2 cells on top of each
+        packed = wide.to_bytes(self._wide_bytes, 'little')
+        spread = bytearray(4 * len(packed))
+        for offset, table in enumerate(SPREAD_TABLES):
+            spread[offset::4] = packed.translate(table)
+        pairs = int.from_bytes(spread, 'little')
+        return pairs | (pairs >> 8) << 2
+
+
+    def step(self):
+        """Advances the board by a single generation."""
+
+        rows, unskipped = self.rows, self._unskipped
+        cells = self.cells + [0]
+        nibbles = [None] * rows + [0]
+        next_gen = [0] * rows
+
+        for top, around in zip(range(0, rows, 2), self._around):
+            up, first, second, down = around
+            occupied = cells[up] | cells[first] | cells[second] | cells[down]
+            if not occupied and not unskipped:
+                continue
+            occupied = self._widen(occupied) | unskipped
+
+            # the tiles from the first to the last block holding a living
+            # cell are looked up one by one if few of them are, otherwise
+            # all at once
+            start = max(((occupied & -occupied).bit_length() - 3) >> 1, 0)
+            count = min((occupied.bit_length() - 1) >> 1, self._tile_cols - 1) - start + 1
+            if occupied.bit_count() * SPARSE_RATIO < count:
+                blocks = [self._widen(cells[row]) for row in around]
+                upper, lower = self._step_sparse(occupied, blocks)
+            else:
+                for row in around:
+                    if nibbles[row] is None:
+                        nibbles[row] = self._nibbles(self._widen(cells[row]))
+                upper, lower = self._step_dense(start, count, [nibbles[row] for row in around])
+
+            next_gen[top] = upper & self.mask
+            if top + 1 < rows:
+                next_gen[top + 1] = lower & self.mask
+
+        self.previous = self.cells
+        self.cells = next_gen
+        self.generation += 1
+
+
+    def _step_sparse(self, occupied, blocks):
+        """
+        Returns the top and bottom rows of the next generation of a row of
+        tiles, from the 4 widened rows of 'blocks' around it and the cells
+        'occupied' in any of them, jumping over the tiles with no living
+        cell around them.
+        """
+
+        up, first, second, down = blocks
+        upper = lower = 0
+        shift = 0
+        while True:
+            rest = occupied >> shift
+            if not rest:
+                break
+
+            # jump to the first block that holds the next living cell,
+            # which is 2 columns apart from the next block
+            if not rest & 15:
+                shift += ((rest & -rest).bit_length() - 3) & ~1
+                continue
+
+            index = ((up >> shift & 15) | (first >> shift & 15) << 4
+                     | (second >> shift & 15) << 8 | (down >> shift & 15) << 12)
+            entry = self._tiles[index]
+            if entry:
+                upper |= (entry & 3) << shift
+                lower |= (entry >> 2) << shift
+            shift += 2
+        return upper, lower
+
+
+    def _step_dense(self, start, count, quarters):
+        """
+        Returns the top and bottom rows of the next generation of a row of
+        tiles, from 'count' tiles on from column 'start', with the 4 rows of
+        the blocks around them as returned by _nibbles in 'quarters'.
+        """
+
+        # the index of each block, its top 2 rows in one byte and its bottom
+        # 2 rows in the next, in the order of a native 16 bit word
+        count_mask = (1 << (8 * count)) - 1
+        up, first, second, down = ((quarter >> (8 * start)) & count_mask for quarter in quarters)
+        index = bytearray(2 * count)
+        index[INDEX_OFFSETS[0]::2] = (up | first << 4).to_bytes(count, 'little')
+        index[INDEX_OFFSETS[1]::2] = (second | down << 4).to_bytes(count, 'little')
+
+        entries = bytes(map(self._tiles.__getitem__, memoryview(index).cast('H').tolist()))
+        upper = _pack(entries.translate(TOP_TABLE)) << (2 * start)
+        lower = _pack(entries.translate(BOTTOM_TABLE)) << (2 * start)
+        return upper, lower
+
+
+def _pack(pairs):
+    """Returns the row of cells held 2 to a byte in 'pairs', packed into an integer."""
+
+    bits = 0
+    for offset in range(4):
+        bits |= int.from_bytes(pairs[offset::4], 'little') << (2 * offset)
+    return bits
+
+
+def build_table(rule):
+    """
+    Returns the next generation of the 2x2 centre of every 4x4 block of
+    cells under a two-state 'rule', as bytes indexed by the block's index.
+    Bits 0 and 1 of an entry are the top row of the centre, and bits 2 and
+    3 its bottom row.
+    """
+
+    # the masks of the neighbours and of the cell itself, for each cell of
+    # the centre
+    masks = []
+    for row, col in CENTRE_CELLS:
+        cell = 1 << (row * 4 + col)
+        block = sum(1 << (r * 4 + c) for r in range(row - 1, row + 2) for c in range(col - 1, col + 2))
+        masks.append((block ^ cell, cell))
+
+    born, survives = rule.table
+    table = bytearray(TABLE_SIZE)
+    for index in range(TABLE_SIZE):
+        entry = 0
+        for bit, (neighbours, cell) in enumerate(masks):
+            counts = survives if index & cell else born
+            if counts[(index & neighbours).bit_count()]:
+                entry |= 1 << bit
+        table[index] = entry
+    return bytes(table)
+
+
+def load_table(rule, table_dir):
+    """
+    Returns the table of build_table for 'rule', memory-mapped from
+    'table_dir' if it was kept there, otherwise built and then kept there
+    for later runs. Without a 'table_dir', the table is always built.
+    """
+
+    if table_dir is None:
+        return build_table(rule)
+
+    birth = ''.join(map(str, sorted(rule.birth)))
+    survival = ''.join(map(str, sorted(rule.survival)))
+    path = os.path.join(table_dir, f'b{birth}s{survival}.tiles')
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == TABLE_SIZE:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        pass
+
+    # write to a file of this process's own first, so that processes
+    # building the same table at once never read half of one
+    table = build_table(rule)
+    try:
+        os.makedirs(table_dir, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(table)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+    return table
@@ -0,0 +1,145 @@
+"""Contains the Viewport class, the camera the universe is seen through."""
+
+class Viewport:
+    """
+    The part of the universe shown in the window. Cells are drawn as squares
+    of 'square_size' pixels, with the cell at (top, left) in the top left
+    corner of the window. Zoomed out past the smallest square size, each
+    square stands for a 'block' x 'block' square of cells instead, where
+    'block' is a power of two and the view is aligned to whole blocks.
+    """
+
+    def __init__(self, settings):
+        """Creates a Viewport over the window described by a Settings instance."""
+
+        # instance variables
+        self.settings = settings
+        self.top = 0
+        self.left = 0
+        self.square_size = settings.square_size
+        self.block = 1
+
+        # the square sizes zoomed between, which include the starting one
+        self.square_sizes = sorted(set(settings.zoom_square_sizes) | {settings.square_size})
+
+        # pixels dragged that don't yet add up to a whole square
+        self._dragged = [0, 0]
+
+
+    def key(self):
+        """Returns the position and zoom, which change whenever the view does."""
+        return (self.top, self.left, self.square_size, self.block)
+
+
+    def squares(self):
+        """Returns the number of (rows, cols) of squares that cover the window."""
+
+        return (
+            -(-self.settings.screen_height // self.square_size),
+            -(-self.settings.screen_width // self.square_size),
+        )
+
+
+    def visible_region(self):
+        """Returns the (top, left, height, width) of the cells in view."""
+
+        rows, cols = self.squares()
+        return (self.top, self.left, rows * self.block, cols * self.block)
+
+
+    def show_borders(self):
+        """Returns True if the squares are big enough, and are single cells, to draw grid lines between."""
+        return self.block == 1 and self.square_size > 1
+
+
+    def square_rect(self, row, col):
+        """Returns the (x, y, width, height) on the screen of the square holding the cell at (row, col)."""
+
+        size = self.square_size
+        return (
+            (col - self.left) // self.block * size,
+            (row - self.top) // self.block * size,
+            size,
+            size,
+        )
+
+
+    def cell_at(self, pos):
+        """Returns the (row, col) of the cell under the screen position 'pos', the top left one of a block."""
+
+        return (
+            self.top + pos[1] // self.square_size * self.block,
+            self.left + pos[0] // self.square_size * self.block,
+        )
+
+
+    def pan(self, rows, cols):
+        """Moves the view by a number of rows and cols of squares."""
+
+        self.top += rows * self.block
+        self.left += cols * self.block
+
+
+    def drag(self, rel):
+        """Moves the view along with a mouse dragged by 'rel' pixels."""
+
+        # the universe follows the mouse, so the view moves the other way
+        self._dragged[0] -= rel[1]
+        self._dragged[1] -= rel[0]
+        rows = int(self._dragged[0] / self.square_size)
+        cols = int(self._dragged[1] / self.square_size)
+        self._dragged[0] -= rows * self.square_size
+        self._dragged[1] -= cols * self.square_size
+        self.pan(rows, cols)
+
+
+    def zoom(self, steps, anchor):
+        """
+        Zooms in by 'steps' (out when negative), keeping the cell under the
+        screen position 'anchor' where it is.
+        """
+
+        row, col = self.cell_at(anchor)
+        for _ in range(abs(steps)):
+            if steps > 0:
+                self._zoom_in()
+            else:
+                self._zoom_out()
+
+        # put the anchor cell back under the anchor, on whole blocks
+        top = row - anchor[1] // self.square_size * self.block
+        left = col - anchor[0] // self.square_size * self.block
+        self.top = top // self.block * self.block
+        self.left = left // self.block * self.block
+        self._dragged = [0, 0]
+
+
+    def _zoom_in(self):
+        """Halves the block, or moves up to the next square size."""
+
+        if self.block > 1:
+            self.block //= 2
+        else:
+            larger = [size for size in self.square_sizes if size > self.square_size]
+            if larger:
+                self.square_size = larger[0]
+
+
+    def _zoom_out(self):
+        """Moves down to the next square size, or doubles the block once at the smallest."""
+
+        smaller = [size for size in self.square_sizes if size < self.square_size]
+        if smaller:
+            self.square_size = smaller[-1]
+        elif self.block < self.settings.max_block:
+            self.block *= 2
+
+
+    def home(self):
+        """Goes back to the starting position and zoom."""
+
+        self.top = 0
+        self.left = 0
+        self.square_size = self.settings.square_size
+        self.block = 1
+        self._dragged = [0, 0]